@@ -0,0 +1,94 @@
+"""
+Retained memory of a cohort's progress maps and plans, as nested dicts versus the ProgressMaps and PlanMaps records
+run_cohort holds them in. Run from the repository root:
+
+    python -m benchmarks.memory_benchmark
+    python -m benchmarks.memory_benchmark --profiles medium,large
+
+The dict form is rebuilt through a JSON round trip, so every course code is its own string object as it is when read
+by the parsers.
+"""
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from typing import Callable
+
+from benchmarks.run_benchmarks import PROFILES
+from benchmarks.synthetic import SyntheticCatalog, TERMS, generate_catalog, generate_progress_maps
+from class_planning_tool.course_planner.course_table import CourseTable, PlanMaps, ProgressMaps
+
+
+def retained_bytes(build: Callable[[], object]) -> tuple[object, int]:
+    """
+    Returns:
+        the built object and the bytes still allocated once build returns
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result: object = build()
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, size
+
+
+def sequential_plan(progress: dict[str, dict[str, str]], catalog: SyntheticCatalog, per_term: int=4) -> dict[str, list[dict[str, str]]]:
+    """
+    Cheap stand-in for a planner result with the same shape: the remaining courses in level order, per_term at a time.
+    """
+    remaining: list[str] = sorted((code for code, entry in progress.items() if entry["status"] != "complete"), key=catalog.levels.get)
+    return {
+        TERMS[index // per_term]: [{"code": code, "title": catalog.titles[code]} for code in remaining[index:index + per_term]]
+        for index in range(0, len(remaining), per_term)
+    }
+
+
+def measure_profile(profile: dict[str, int | float], seed: int=0) -> dict[str, int]:
+    """
+    Returns:
+        dict[str, int]: retained bytes of the cohort as dicts and as records, and of the course table itself
+    """
+    catalog = generate_catalog(
+        course_count=int(profile["course_count"]), depth=int(profile["depth"]), or_density=profile["or_density"],
+        offering_sparsity=profile["offering_sparsity"], seed=seed
+    )
+    students = generate_progress_maps(catalog, student_count=int(profile["students"]), seed=seed)
+    cohort_json: str = json.dumps({f"student{index}": [progress, sequential_plan(progress, catalog)] for index, (progress, _) in enumerate(students)})
+
+    _, dict_bytes = retained_bytes(lambda: json.loads(cohort_json))
+
+    table, table_bytes = retained_bytes(lambda: CourseTable.from_catalog(catalog.prerequisites, catalog.titles, catalog.offerings))
+
+    def encode() -> tuple[ProgressMaps, PlanMaps]:
+        progress_maps: ProgressMaps = ProgressMaps(table)
+        plans: PlanMaps = PlanMaps(table)
+        for name, (progress, plan) in json.loads(cohort_json).items():
+            progress_maps[name] = progress
+            plans[name] = plan
+        return progress_maps, plans
+
+    _, record_bytes = retained_bytes(encode)
+    return {"dict_bytes": dict_bytes, "record_bytes": record_bytes, "table_bytes": table_bytes}
+
+
+def main(argv: list[str] | None=None) -> int:
+    parser = argparse.ArgumentParser(description="Cohort memory, dicts versus course table records")
+    parser.add_argument("--profiles", default="small,medium", help=f"comma separated, from {', '.join(PROFILES)}")
+    args = parser.parse_args(argv)
+
+    sys.stdout.write(f"{'profile':<8} {'dicts':>12} {'records':>12} {'table':>12} {'saving':>8}\n")
+    for name in args.profiles.split(","):
+        sizes: dict[str, int] = measure_profile(PROFILES[name])
+        saving: float = 1 - (sizes["record_bytes"] + sizes["table_bytes"]) / sizes["dict_bytes"]
+        sys.stdout.write(
+            f"{name:<8} {sizes['dict_bytes']:>12,} {sizes['record_bytes']:>12,} {sizes['table_bytes']:>12,} {saving:>7.0%}\n"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
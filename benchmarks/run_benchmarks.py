@@ -0,0 +1,140 @@
+"""
+End-to-end stage benchmarks over synthetic corpora. Run from the repository root:
+
+    python -m benchmarks.run_benchmarks                   # compare against benchmarks/baselines.json
+    python -m benchmarks.run_benchmarks --record          # overwrite the baselines with this machine's numbers
+    python -m benchmarks.run_benchmarks --profiles large
+
+Each stage is timed as the best of --repeat runs. A stage regresses when it takes more than --tolerance times its
+recorded baseline, in which case the exit code is 1. Baselines are machine specific, so record them on the machine
+that runs the comparison.
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from benchmarks.synthetic import generate_catalog, generate_progress_maps, write_catalog_html, write_schedule_workbook
+
+BASELINE_PATH: Path = Path(__file__).parent / "baselines.json"
+
+PROFILES: dict[str, dict[str, int | float]] = {
+    "small": {"course_count": 50, "depth": 4, "or_density": 0.3, "offering_sparsity": 0.5, "students": 20},
+    "medium": {"course_count": 300, "depth": 6, "or_density": 0.3, "offering_sparsity": 0.5, "students": 200},
+    "large": {"course_count": 1500, "depth": 10, "or_density": 0.4, "offering_sparsity": 0.6, "students": 1000},
+}
+
+
+def best_of(repeat: int, func: Callable[[], object]) -> float:
+    timings: list[float] = []
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_profile(profile: dict[str, int | float], repeat: int=3, seed: int=0) -> dict[str, float]:
+    """
+    Generate a corpus for one profile and time each pipeline stage over it.
+
+    Returns:
+        dict[str, float]: best seconds per stage
+    """
+    from openpyxl import load_workbook
+
+    from class_planning_tool.course_planner.planner import Planner
+    from class_planning_tool.input_data.excel_inputs import extract_sheet_data
+    from class_planning_tool.input_data.prereq_scraper import Scraper
+    from class_planning_tool.output_generation.class_plan_writer import write_plan_workbook
+
+    catalog = generate_catalog(
+        course_count=int(profile["course_count"]), depth=int(profile["depth"]), or_density=profile["or_density"],
+        offering_sparsity=profile["offering_sparsity"], seed=seed
+    )
+    students = generate_progress_maps(catalog, student_count=int(profile["students"]), seed=seed)
+    results: dict[str, float] = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        schedule_path: Path = Path(tmp) / "schedule.xlsx"
+        catalog_path: Path = Path(tmp) / "catalog.html"
+        plan_path: Path = Path(tmp) / "plan.xlsx"
+        write_schedule_workbook(catalog, str(schedule_path))
+        write_catalog_html(catalog, str(catalog_path))
+
+        sheet = load_workbook(schedule_path, data_only=True).active
+        results["schedule_parse"] = best_of(repeat, lambda: extract_sheet_data(sheet))
+        offerings = extract_sheet_data(sheet)
+
+        results["catalog_parse"] = best_of(repeat, lambda: Scraper(str(catalog_path)))
+        scraper = Scraper(str(catalog_path))
+        prerequisites, titles = scraper.get_prerequisites(), scraper.title_map
+
+        def plan_all() -> list:
+            return [Planner(progress, electives, offerings, prerequisites, titles).find_best_schedule() for progress, electives in students]
+
+        results["plan"] = best_of(repeat, plan_all)
+        plans = plan_all()
+
+        def export_all() -> None:
+            for plan in plans:
+                try:
+                    write_plan_workbook(plan, str(plan_path))
+                except ValueError:
+                    rejected.add(id(plan))
+
+        # plans the writer refuses (not whole academic years) are still timed up to the point of rejection and counted
+        rejected: set[int] = set()
+        results["export"] = best_of(repeat, export_all)
+        if rejected:
+            sys.stderr.write(f"{len(rejected)} of {len(plans)} plans were rejected by the workbook writer\n")
+    return results
+
+
+def compare(results: dict[str, dict[str, float]], baselines: dict[str, dict[str, float]], tolerance: float) -> list[str]:
+    """
+    Returns:
+        list[str]: descriptions of every stage slower than tolerance times its baseline
+    """
+    regressions: list[str] = []
+    for profile, stages in results.items():
+        for stage, seconds in stages.items():
+            baseline: float | None = baselines.get(profile, {}).get(stage)
+            if baseline and seconds > baseline * tolerance:
+                regressions.append(f"{profile}/{stage}: {seconds:.4f}s vs baseline {baseline:.4f}s")
+    return regressions
+
+
+def main(argv: list[str] | None=None) -> int:
+    parser = argparse.ArgumentParser(description="Stage benchmarks over synthetic corpora")
+    parser.add_argument("--profiles", default="small,medium", help=f"comma separated, from {', '.join(PROFILES)}")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage, the best is kept")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed slowdown factor before flagging a regression")
+    parser.add_argument("--record", action="store_true", help="write the results as the new baselines")
+    args = parser.parse_args(argv)
+
+    baselines: dict[str, dict[str, float]] = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    results: dict[str, dict[str, float]] = {}
+    for name in args.profiles.split(","):
+        results[name] = run_profile(PROFILES[name], repeat=args.repeat)
+        for stage, seconds in results[name].items():
+            baseline: float | None = baselines.get(name, {}).get(stage)
+            ratio: str = f"{seconds / baseline:6.2f}x" if baseline else "   new"
+            sys.stdout.write(f"{name:<8} {stage:<16} {seconds * 1000:10.2f} ms {ratio}\n")
+
+    if args.record:
+        baselines.update(results)
+        BASELINE_PATH.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        return 0
+
+    regressions: list[str] = compare(results, baselines, args.tolerance)
+    for regression in regressions:
+        sys.stdout.write(f"REGRESSION {regression}\n")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,188 @@
+"""
+Synthetic catalog and student corpus generator for benchmarks. Everything is derived from a seeded random.Random so
+the same parameters always produce the same corpus.
+"""
+import json
+import random
+from dataclasses import dataclass, field
+from html import escape
+from pathlib import Path
+
+# same term range the planner schedules over
+TERMS: tuple[str, ...] = (
+    "FA24", "SP25", "SU25", "FA25", "SP26", "SU26",
+    "FA26", "SP27", "SU27", "FA27", "SP28", "SU28",
+    "FA28", "SP29", "SU29", "FA29"
+)
+
+_PREFIXES: tuple[str, ...] = ("CPSC", "CYBR", "MATH", "DATA", "ITDS", "STAT")
+
+# cell values seen in the real schedule workbook; blanks are written for terms a course is not offered
+_OFFERED_CELLS: tuple[str, ...] = ("F", "O", "D", "N", "D,N", "N, O", "D,N,O", "O??", "D(May)", "N (May)")
+_BLANK_CELLS: tuple[str | None, ...] = (None, ".", "??")
+
+
+@dataclass
+class SyntheticCatalog:
+    """
+    Generated catalog in the same shapes the input parsers produce.
+    """
+    prerequisites: dict[str, list[list[str]]] = field(default_factory=dict)
+    titles: dict[str, str] = field(default_factory=dict)
+    offerings: dict[str, list[str]] = field(default_factory=dict)
+    cells: dict[str, dict[str, str | None]] = field(default_factory=dict)
+    levels: dict[str, int] = field(default_factory=dict)
+
+
+def course_code(index: int) -> str:
+    return f"{_PREFIXES[index % len(_PREFIXES)]} {1000 + index // len(_PREFIXES)}"
+
+
+def generate_catalog(course_count: int=100, depth: int=5, or_density: float=0.3, offering_sparsity: float=0.5, max_groups: int=2, seed: int=0) -> SyntheticCatalog:
+    """
+    Generate a catalog whose prerequisite graph is a DAG with the requested number of levels.
+
+    Args:
+        course_count (int): number of courses
+        depth (int): number of prerequisite levels; level 0 courses have no prerequisites
+        or_density (float): probability that a prerequisite group offers alternatives rather than one course
+        offering_sparsity (float): probability that a course is not offered in a given term
+        max_groups (int): maximum number of AND-ed prerequisite groups per course
+        seed (int): random seed
+
+    Returns:
+        SyntheticCatalog: generated catalog
+    """
+    rng: random.Random = random.Random(seed)
+    catalog: SyntheticCatalog = SyntheticCatalog()
+    by_level: list[list[str]] = [[] for _ in range(depth)]
+
+    for index in range(course_count):
+        code: str = course_code(index)
+        level: int = index % depth
+        by_level[level].append(code)
+        catalog.levels[code] = level
+        catalog.titles[code] = f"Synthetic Course {index}"
+
+        groups: list[list[str]] = []
+        candidates: list[str] = [course for lower in by_level[:level] for course in lower]
+        for _ in range(rng.randint(1, max_groups) if candidates else 0):
+            size: int = rng.randint(2, 3) if rng.random() < or_density else 1
+            group: list[str] = rng.sample(candidates, min(size, len(candidates)))
+            if group not in groups:
+                groups.append(group)
+        catalog.prerequisites[code] = groups
+
+        row: dict[str, str | None] = {}
+        for term in TERMS:
+            row[term] = rng.choice(_BLANK_CELLS) if rng.random() < offering_sparsity else rng.choice(_OFFERED_CELLS)
+        if all(value in _BLANK_CELLS for value in row.values()):
+            row[rng.choice(TERMS)] = rng.choice(_OFFERED_CELLS)
+        catalog.cells[code] = row
+        catalog.offerings[code] = [term for term in TERMS if row[term] not in _BLANK_CELLS]
+
+    return catalog
+
+
+def write_schedule_workbook(catalog: SyntheticCatalog, path: str) -> None:
+    """
+    Write the catalog offerings as a 4-year schedule workbook in the department's layout.
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["Four-Year Schedule"])
+    ws.append(["F - Fixed date and time O-Online D- Day Time N-Night Time"])
+    ws.append(["Course", "Course Title", *TERMS])
+    for code, row in catalog.cells.items():
+        ws.append([code, catalog.titles[code], *(row[term] for term in TERMS)])
+    wb.save(path)
+
+
+def render_catalog_html(catalog: SyntheticCatalog) -> str:
+    """
+    Render the catalog as a course descriptions page with the courseblock markup the scraper expects.
+    """
+    blocks: list[str] = []
+    for code, groups in catalog.prerequisites.items():
+        extras: str = '<div class="courseblockextra noindent">Synthetic course description.</div>'
+        if groups:
+            clauses: str = " and ".join(
+                " or ".join(f"{prereq} with a minimum grade of C" for prereq in group) for group in groups
+            )
+            extras += f'<div class="courseblockextra noindent"><strong>Prerequisite(s): </strong>{clauses}</div>'
+        blocks.append(
+            '<div class="courseblock"><div class="cols noindent">'
+            f'<span class="text col-3 detail-code"><strong>{code}</strong></span> '
+            f'<span class="text col-3 detail-title"><strong>{escape(catalog.titles[code])}</strong></span>'
+            f'</div><div class="noindent">{extras}</div></div>'
+        )
+    return "<html><body><div class=\"sc_sccoursedescs\">\n" + "\n".join(blocks) + "\n</div></body></html>"
+
+
+def write_catalog_html(catalog: SyntheticCatalog, path: str) -> None:
+    Path(path).write_text(render_catalog_html(catalog), encoding="utf-8")
+
+
+def generate_progress_maps(catalog: SyntheticCatalog, student_count: int=10, program_size: int=12, seed: int=0) -> list[tuple[dict[str, dict[str, str]], int]]:
+    """
+    Generate student progress maps over random programs drawn from the catalog. Lower level courses are more likely to
+    be complete, as they would be for a real student.
+
+    Returns:
+        list of (progress map, free elective count) tuples, matching parse_pdf results
+    """
+    rng: random.Random = random.Random(seed)
+    codes: list[str] = list(catalog.titles)
+    depth: int = max(catalog.levels.values()) + 1
+    students: list[tuple[dict[str, dict[str, str]], int]] = []
+
+    for _ in range(student_count):
+        progress: dict[str, dict[str, str]] = {}
+        for code in rng.sample(codes, min(program_size, len(codes))):
+            roll: float = rng.random() * (catalog.levels[code] + 1) / depth
+            if roll < 0.15:
+                progress[code] = {"status": "complete", "term": rng.choice(("FA23", "SP24", "SU24"))}
+            elif roll < 0.2:
+                progress[code] = {"status": "current", "term": "FA24"}
+            else:
+                progress[code] = {"status": "incomplete", "term": ""}
+        students.append((progress, rng.randint(0, 2)))
+    return students
+
+
+@dataclass
+class SyntheticCorpus:
+    """
+    Paths of a corpus written to disk by write_corpus, with the catalog and progress maps it was generated from.
+    """
+    catalog: SyntheticCatalog
+    schedule: str
+    catalog_page: str
+    audit_dir: str
+    students: dict[str, tuple[dict[str, dict[str, str]], int]] = field(default_factory=dict)
+
+    def audit_path(self, student: str) -> Path:
+        return Path(self.audit_dir) / f"{student}.json"
+
+
+def write_corpus(root: str, course_count: int=30, depth: int=3, student_count: int=6, program_size: int=6, seed: int=3) -> SyntheticCorpus:
+    """
+    Write a schedule workbook, a catalog page and one progress JSON audit per student, named student0, student1 and
+    so on, into root, as the batch, watch and shard commands read them.
+    """
+    catalog: SyntheticCatalog = generate_catalog(course_count=course_count, depth=depth, seed=seed)
+    corpus: SyntheticCorpus = SyntheticCorpus(
+        catalog=catalog,
+        schedule=str(Path(root) / "schedule.xlsx"),
+        catalog_page=str(Path(root) / "catalog.html"),
+        audit_dir=str(Path(root) / "audits"),
+    )
+    write_schedule_workbook(catalog, corpus.schedule)
+    write_catalog_html(catalog, corpus.catalog_page)
+    Path(corpus.audit_dir).mkdir(parents=True, exist_ok=True)
+    for index, (progress, electives) in enumerate(generate_progress_maps(catalog, student_count=student_count, program_size=program_size, seed=seed)):
+        corpus.students[f"student{index}"] = (progress, electives)
+        corpus.audit_path(f"student{index}").write_text(json.dumps({"progress": progress, "free_electives": electives}))
+    return corpus
@@ -0,0 +1,3 @@
+from class_planning_tool.cli import main
+
+raise SystemExit(main(configure_logging=True))
@@ -0,0 +1,365 @@
+"""
+Headless command line interface, for running the planning pipeline without the dashboard. Examples:
+
+    python -m class_planning_tool plan --audits DIR --schedule FILE --catalog URL --out DIR --jobs 4
+    python -m class_planning_tool forecast --plans DIR --out demand.csv
+    python -m class_planning_tool watch --audits DIR --schedule FILE --catalog URL --out DIR
+    python -m class_planning_tool query --store plans.db --taking "CPSC 6105" --term SP26
+    python -m class_planning_tool job --audits DIR --schedule FILE --catalog URL --out JOBDIR
+    python -m class_planning_tool shard --manifest JOBDIR/manifest.json --index 0 --count 4 --out DIR
+    python -m class_planning_tool merge --manifest JOBDIR/manifest.json --shards DIR [DIR ...] --out DIR
+"""
+import argparse
+import json
+import os
+import sys
+from typing import TextIO
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="class_planning_tool", description="Smart Class Planning Tool")
+    parser.add_argument("--log-levels", default="", help="levels per subsystem, e.g. planner=DEBUG,input=WARNING")
+    parser.add_argument("--log-dir", default="", help="directory for this run's log file (default ~/course_scheduler_logs)")
+    subparsers = parser.add_subparsers(dest="command")
+
+    plan = subparsers.add_parser("plan", help="plan every student audit in a directory")
+    plan.add_argument("--audits", required=True, help="directory of DegreeWorks PDFs and/or progress JSON files")
+    plan.add_argument("--schedule", required=True, help="4-year schedule workbook (.xlsx)")
+    plan.add_argument("--catalog", required=True, help="course descriptions URL or saved HTML file")
+    plan.add_argument("--out", required=True, help="output directory for the generated plans")
+    plan.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="number of worker processes")
+    plan.add_argument("--start-semester", default="", help="ignore schedule columns before this term, e.g. SP25")
+    plan.add_argument("--report", default="", help="optional path to write the timing and failure report as JSON")
+    plan.add_argument("--track-memory", action="store_true", help="also record peak memory per stage (slower)")
+    plan.add_argument("--validate", action="store_true", help="check every plan against prerequisites, offerings and term capacity")
+    plan.add_argument("--demand", default="", help="optional path to write per-course, per-term seat demand (.csv or .xlsx)")
+    plan.add_argument("--store", default="", help="optional SQLite plan store to save every plan to")
+    plan.add_argument("--seats", default="", help="seat limits CSV (course, term, seats); plans the cohort together within them")
+    plan.add_argument("--default-seats", type=int, default=None, help="seats for courses missing from --seats (default unlimited)")
+    plan.add_argument("--max-in-flight", type=int, default=0, help="students queued or running at once (default 2 per job)")
+    plan.add_argument("--recycle-after", type=int, default=None, help="replace each worker process after this many students")
+    plan.add_argument("--modes", default="", help="only plan terms offering a course in these delivery modes, e.g. O or DN (F, O, D, N)")
+    plan.add_argument("--prioritize", action="store_true", help="take courses that gate the longest prerequisite chains first")
+    plan.set_defaults(handler=run_plan)
+
+    watch = subparsers.add_parser("watch", help="keep plans current as audits, the schedule or a saved catalog change")
+    watch.add_argument("--audits", required=True, help="directory of DegreeWorks PDFs and/or progress JSON files")
+    watch.add_argument("--schedule", required=True, help="4-year schedule workbook (.xlsx)")
+    watch.add_argument("--catalog", required=True, help="course descriptions URL or saved HTML file (watched if a file)")
+    watch.add_argument("--out", required=True, help="output directory for the generated plans")
+    watch.add_argument("--start-semester", default="", help="ignore schedule columns before this term, e.g. SP25")
+    watch.add_argument("--validate", action="store_true", help="check every plan against prerequisites, offerings and term capacity")
+    watch.add_argument("--interval", type=float, default=2.0, help="seconds between checks for changed files")
+    watch.add_argument("--once", action="store_true", help="check once and exit instead of watching")
+    watch.add_argument("--prioritize", action="store_true", help="take courses that gate the longest prerequisite chains first")
+    watch.set_defaults(handler=run_watch)
+
+    job = subparsers.add_parser("job", help="write a job manifest and catalog artifact for planning in shards")
+    job.add_argument("--audits", required=True, help="directory of DegreeWorks PDFs and/or progress JSON files")
+    job.add_argument("--schedule", required=True, help="4-year schedule workbook (.xlsx)")
+    job.add_argument("--catalog", required=True, help="course descriptions URL or saved HTML file")
+    job.add_argument("--out", required=True, help="job directory for the manifest and catalog artifact")
+    job.add_argument("--start-semester", default="", help="ignore schedule columns before this term, e.g. SP25")
+    job.add_argument("--modes", default="", help="only plan terms offering a course in these delivery modes, e.g. O or DN (F, O, D, N)")
+    job.set_defaults(handler=run_job)
+
+    shard = subparsers.add_parser("shard", help="plan one shard of a job")
+    shard.add_argument("--manifest", required=True, help="job manifest written by the job command")
+    shard.add_argument("--index", type=int, required=True, help="shard to plan, from 0 to --count - 1")
+    shard.add_argument("--count", type=int, required=True, help="number of shards the job is split into")
+    shard.add_argument("--out", required=True, help="output directory for the shard's plans and report")
+    shard.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="number of worker processes")
+    shard.add_argument("--track-memory", action="store_true", help="also record peak memory per stage (slower)")
+    shard.add_argument("--validate", action="store_true", help="check every plan against prerequisites, offerings and term capacity")
+    shard.set_defaults(handler=run_shard_job)
+
+    merge = subparsers.add_parser("merge", help="combine the shard reports of a job")
+    merge.add_argument("--manifest", required=True, help="job manifest written by the job command")
+    merge.add_argument("--shards", nargs="+", required=True, help="shard report files or shard output directories")
+    merge.add_argument("--report", default="", help="optional path to write the merged report as JSON")
+    merge.add_argument("--out", default="", help="optional directory to copy every shard's plans into")
+    merge.add_argument("--demand", default="", help="optional path to write per-course, per-term seat demand (.csv or .xlsx)")
+    merge.add_argument("--store", default="", help="optional SQLite plan store to save every plan to")
+    merge.set_defaults(handler=run_merge)
+
+    forecast = subparsers.add_parser("forecast", help="aggregate previously exported plan workbooks into seat demand")
+    forecast.add_argument("--plans", required=True, help="directory of plan workbooks (.xlsx)")
+    forecast.add_argument("--out", required=True, help="path to write the demand table (.csv or .xlsx)")
+    forecast.set_defaults(handler=run_forecast)
+
+    query = subparsers.add_parser("query", help="query a SQLite plan store")
+    query.add_argument("--store", required=True, help="plan store written by plan --store or the dashboard")
+    selection = query.add_mutually_exclusive_group(required=True)
+    selection.add_argument("--taking", metavar="COURSE", help="students planned to take COURSE in --term")
+    selection.add_argument("--graduating-by", metavar="TERM", help="students whose plan finishes by TERM")
+    selection.add_argument("--student", help="print one student's stored plan")
+    selection.add_argument("--demand", metavar="TERM", help="planned seats per course in TERM")
+    query.add_argument("--term", default="", help="term for --taking, e.g. SP26")
+    query.set_defaults(handler=run_query)
+
+    serve = subparsers.add_parser("serve", help="run the local HTTP planning service")
+    serve.add_argument("--schedule", required=True, help="4-year schedule workbook (.xlsx)")
+    serve.add_argument("--catalog", required=True, help="course descriptions URL or saved HTML file")
+    serve.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    serve.add_argument("--port", type=int, default=8080, help="port to listen on")
+    serve.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="number of planning processes")
+    serve.add_argument("--max-queue", type=int, default=16, help="plans allowed to wait for a worker before requests are refused")
+    serve.add_argument("--start-semester", default="", help="ignore schedule columns before this term, e.g. SP25")
+    serve.set_defaults(handler=run_serve)
+
+    return parser
+
+
+def student_status(result) -> str:
+    """One line outcome of a StudentResult, followed in reports by its violations and changes."""
+    status: str = "ok" if result.ok else f"FAILED {result.error}"
+    if result.unchanged:
+        status += " (unchanged)"
+    elif result.changes:
+        status += f" ({len(result.changes)} changes)"
+    if result.violations:
+        status += f" ({len(result.violations)} violations)"
+    return status
+
+
+def print_report(report, stream: TextIO) -> None:
+    """
+    Print per-student outcomes followed by the stage timing summary.
+    """
+    for stage, seconds in report.shared_timings.items():
+        stream.write(f"{stage:<15} {seconds * 1000:10.1f} ms (shared)\n")
+
+    for result in report.results:
+        stream.write(f"{result.student}: {student_status(result)}\n")
+        for line in result.violations + result.changes:
+            stream.write(f"    {line}\n")
+
+    stream.write(f"{'stage':<15} {'count':>6} {'mean ms':>10} {'max ms':>10} {'total ms':>10} {'peak KiB':>10}\n")
+    for stage, entry in report.stage_summary().items():
+        stream.write(
+            f"{stage:<15} {entry['count']:>6} {entry['mean'] * 1000:>10.1f} {entry['max'] * 1000:>10.1f} "
+            f"{entry['total'] * 1000:>10.1f} {entry['peak_memory'] / 1024:>10.1f}\n"
+        )
+    if report.retained_memory:
+        stream.write(f"most memory held between students: {report.retained_memory / 1024:.1f} KiB\n")
+    stream.write(f"{len(report.results) - len(report.failures)} planned, {len(report.failures)} failed\n")
+    if report.invalid:
+        stream.write(f"{len(report.invalid)} plans have violations\n")
+
+
+def run_plan(args: argparse.Namespace) -> int:
+    from class_planning_tool.controller.batch_runner import BatchSetupError, run_batch, run_cohort
+    from class_planning_tool.course_planner.cohort_scheduler import SeatLimitError, load_seat_limits
+    from class_planning_tool.output_generation.demand_forecast import DemandForecast, write_demand
+
+    from class_planning_tool.output_generation.plan_store import PlanStore
+
+    forecast: DemandForecast | None = DemandForecast() if args.demand else None
+    store: PlanStore | None = PlanStore(args.store) if args.store else None
+    try:
+        if args.seats:
+            report = run_cohort(
+                args.audits, args.schedule, args.catalog, args.out, load_seat_limits(args.seats, args.default_seats),
+                start_semester=args.start_semester, track_memory=args.track_memory, validate=args.validate,
+                forecast=forecast, store=store, modes=args.modes, prioritize=args.prioritize
+            )
+        else:
+            report = run_batch(
+                args.audits, args.schedule, args.catalog, args.out, jobs=args.jobs, start_semester=args.start_semester,
+                track_memory=args.track_memory, validate=args.validate, forecast=forecast, store=store,
+                max_in_flight=args.max_in_flight, max_tasks_per_child=args.recycle_after, modes=args.modes,
+                prioritize=args.prioritize
+            )
+    except (BatchSetupError, NotADirectoryError, SeatLimitError) as e:
+        sys.stderr.write(f"{e}\n")
+        return 2
+    finally:
+        if store is not None:
+            store.close()
+
+    print_report(report, sys.stdout)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, indent=2)
+    if forecast is not None:
+        write_demand(forecast, args.demand)
+    return 1 if report.failures else 0
+
+
+def run_watch(args: argparse.Namespace) -> int:
+    from class_planning_tool.controller.batch_runner import BatchSetupError
+    from class_planning_tool.controller.watcher import PlanWatcher, WatchCycle
+
+    def print_cycle(cycle: WatchCycle) -> None:
+        for result in cycle.planned:
+            sys.stdout.write(f"{result.student}: {student_status(result)}\n")
+            for line in result.changes:
+                sys.stdout.write(f"    {line}\n")
+        for student in cycle.removed:
+            sys.stdout.write(f"{student}: audit removed\n")
+        sys.stdout.flush()
+
+    watcher: PlanWatcher = PlanWatcher(
+        args.audits, args.schedule, args.catalog, args.out, args.start_semester, args.validate, args.prioritize
+    )
+    try:
+        if args.once:
+            cycle: WatchCycle = watcher.poll()
+            print_cycle(cycle)
+            return 1 if any(not result.ok for result in cycle.planned) else 0
+        sys.stdout.write(f"Watching {args.audits}, press Ctrl+C to stop\n")
+        watcher.watch(args.interval, on_cycle=print_cycle)
+    except (BatchSetupError, NotADirectoryError) as e:
+        sys.stderr.write(f"{e}\n")
+        return 2
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def run_job(args: argparse.Namespace) -> int:
+    from class_planning_tool.controller.batch_runner import BatchSetupError
+    from class_planning_tool.controller.shards import create_job
+
+    try:
+        manifest = create_job(args.audits, args.schedule, args.catalog, args.out, args.start_semester, args.modes)
+    except (BatchSetupError, NotADirectoryError) as e:
+        sys.stderr.write(f"{e}\n")
+        return 2
+    sys.stdout.write(f"{len(manifest.students)} students written to {manifest.path}\n")
+    return 0
+
+
+def run_shard_job(args: argparse.Namespace) -> int:
+    from class_planning_tool.controller.shards import ShardError, run_shard
+
+    try:
+        report = run_shard(args.manifest, args.index, args.count, args.out, jobs=args.jobs, track_memory=args.track_memory, validate=args.validate)
+    except ShardError as e:
+        sys.stderr.write(f"{e}\n")
+        return 2
+    print_report(report, sys.stdout)
+    return 1 if report.failures else 0
+
+
+def run_merge(args: argparse.Namespace) -> int:
+    from class_planning_tool.controller.shards import ShardError, merge_shards
+    from class_planning_tool.output_generation.demand_forecast import DemandForecast, write_demand
+    from class_planning_tool.output_generation.plan_store import PlanStore
+
+    forecast: DemandForecast | None = DemandForecast() if args.demand else None
+    store: PlanStore | None = PlanStore(args.store) if args.store else None
+    try:
+        report = merge_shards(args.manifest, args.shards, args.out, forecast=forecast, store=store)
+    except ShardError as e:
+        sys.stderr.write(f"{e}\n")
+        return 2
+    finally:
+        if store is not None:
+            store.close()
+    print_report(report, sys.stdout)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, indent=2)
+    if forecast is not None:
+        write_demand(forecast, args.demand)
+    return 1 if report.failures else 0
+
+
+def run_forecast(args: argparse.Namespace) -> int:
+    from pathlib import Path
+
+    from class_planning_tool.output_generation.class_plan_writer import read_plan_workbook
+    from class_planning_tool.output_generation.demand_forecast import DemandForecast, write_demand
+
+    plans_dir: Path = Path(args.plans)
+    if not plans_dir.is_dir():
+        sys.stderr.write(f"The path {args.plans} is not a directory.\n")
+        return 2
+
+    # workbooks are read one at a time and only their counts are kept
+    forecast: DemandForecast = DemandForecast.from_plans(read_plan_workbook(str(path)) for path in sorted(plans_dir.glob("*.xlsx")))
+    write_demand(forecast, args.out)
+    sys.stdout.write(f"{forecast.plans} plans, {len(forecast.courses())} courses over {len(forecast.terms())} terms written to {args.out}\n")
+    return 0
+
+
+def run_query(args: argparse.Namespace) -> int:
+    from class_planning_tool.output_generation.plan_store import PlanStore
+
+    if not os.path.exists(args.store):
+        sys.stderr.write(f"No plan store at {args.store}\n")
+        return 2
+    if args.taking and not args.term:
+        sys.stderr.write("--taking needs --term\n")
+        return 2
+
+    with PlanStore(args.store) as store:
+        try:
+            if args.taking:
+                lines: list[str] = store.students_taking(args.taking, args.term)
+            elif args.graduating_by:
+                lines = store.students_graduating_by(args.graduating_by)
+            elif args.demand:
+                lines = [f"{course}: {seats}" for course, seats in store.course_demand(args.demand).items()]
+            else:
+                course_plan = store.get_plan(args.student)
+                if course_plan is None:
+                    sys.stderr.write(f"No stored plan for {args.student}\n")
+                    return 1
+                lines = [f"{term}: {', '.join(course['code'] for course in courses)}" for term, courses in course_plan.items()]
+        except ValueError as e:
+            sys.stderr.write(f"{e}\n")
+            return 2
+
+    for line in lines:
+        sys.stdout.write(f"{line}\n")
+    return 0
+
+
+def run_serve(args: argparse.Namespace) -> int:
+    from class_planning_tool.controller.batch_runner import BatchSetupError
+    from class_planning_tool.service.http_service import create_server
+
+    try:
+        server = create_server(args.host, args.port, args.schedule, args.catalog, workers=args.workers, max_queue=args.max_queue, start_semester=args.start_semester)
+    except BatchSetupError as e:
+        sys.stderr.write(f"{e}\n")
+        return 2
+
+    host, port = server.server_address[:2]
+    sys.stdout.write(f"Serving plans on http://{host}:{port}/plan\n")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.shutdown()
+    return 0
+
+
+def main(argv: list[str] | None = None, configure_logging: bool=False) -> int:
+    """
+    Run the command line. With configure_logging, as when run as a module, logging goes to a per-run file set up by
+    logging_config.setup_logging with the --log-levels and --log-dir options.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not getattr(args, "handler", None):
+        parser.print_help()
+        return 2
+    if not configure_logging:
+        return args.handler(args)
+
+    from class_planning_tool.logging_config import LOG_DIR, parse_levels, setup_logging
+
+    try:
+        logging_run = setup_logging(args.log_dir or LOG_DIR, parse_levels(args.log_levels))
+    except ValueError as e:
+        sys.stderr.write(f"{e}\n")
+        return 2
+    try:
+        return args.handler(args)
+    finally:
+        logging_run.stop()
@@ -0,0 +1,180 @@
+"""
+Asyncio counterpart of ClassPlanController for async servers. Each stage runs its blocking work in an executor and
+raises a PlanningError subclass naming the stage, instead of returning the error as a string, so stages for many
+students can be awaited together with asyncio.gather on one event loop.
+"""
+from concurrent.futures import Executor
+from io import BytesIO
+from typing import Callable
+import asyncio
+import json
+import logging
+
+from class_planning_tool.controller.class_plan_controller import ClassPlanController
+from class_planning_tool.controller.session import PlanningSession
+from class_planning_tool.error_handling.cancellation import CancelToken, PlanCancelledError, check_cancelled
+
+logger = logging.getLogger(__name__)
+
+
+class PlanningError(Exception):
+    """
+    Base class of the errors raised by AsyncPlanController. The original exception is kept as __cause__.
+    """
+
+
+class AuditError(PlanningError):
+    """Raised when an audit cannot be read or parsed."""
+
+
+class ScheduleError(PlanningError):
+    """Raised when the schedule workbook cannot be read or parsed."""
+
+
+class CatalogError(PlanningError):
+    """Raised when the course catalog cannot be fetched or parsed."""
+
+
+class PlanError(PlanningError):
+    """Raised when a parsed audit cannot be planned, including catalog problems found before planning."""
+
+
+class ExportError(PlanningError):
+    """Raised when a plan cannot be written as a workbook."""
+
+
+def _read_audit(audit: str | bytes, cancel_token: CancelToken | None) -> tuple[dict[str, dict[str, str]], int]:
+    if isinstance(audit, bytes):
+        if audit.startswith(b"%PDF"):
+            from class_planning_tool.input_data.degreeworks_parser import parse_pdf_bytes
+
+            return parse_pdf_bytes(audit)
+        from class_planning_tool.input_data.progress_json import validate_progress_content
+
+        return validate_progress_content(json.loads(audit))
+
+    if audit.lower().endswith(".json"):
+        from class_planning_tool.input_data.progress_json import parse_progress_json
+
+        check_cancelled(cancel_token)
+        return parse_progress_json(audit)
+    from class_planning_tool.input_data.degreeworks_parser import parse_pdf
+
+    return parse_pdf(audit, cancel_token)
+
+
+def _write_workbook(course_plan: dict[str, list[dict[str, str]]], output_path: str | None) -> str | bytes:
+    from class_planning_tool.output_generation.class_plan_writer import export_plan, write_plan_workbook
+
+    if output_path is None:
+        buffer: BytesIO = BytesIO()
+        write_plan_workbook(course_plan, buffer)
+        return buffer.getvalue()
+    export_plan(course_plan, output_path)
+    return output_path
+
+
+class AsyncPlanController:
+    """
+    Async planning pipeline. Schedules and catalogs are cached in a PlanningSession, shared by every call, so
+    concurrent students only load them once and share one CompiledCatalog.
+
+    The executor must be a thread pool (the default is the event loop's), since stages share the session and cancel
+    tokens with the caller. Use as an async context manager, or call close, to release a session it created.
+    """
+
+    def __init__(self, session: PlanningSession | None=None, executor: Executor | None=None):
+        self.owns_session: bool = session is None
+        self.session: PlanningSession = session or PlanningSession()
+        self.executor: Executor | None = executor
+
+    async def __aenter__(self) -> "AsyncPlanController":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.owns_session:
+            self.session.close()
+
+    async def _run(self, error_type: type[PlanningError], function: Callable, *args):
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+        except (PlanCancelledError, asyncio.CancelledError):
+            raise
+        except Exception as e:
+            raise error_type(str(e)) from e
+
+    async def load_audit(self, audit: str | bytes, cancel_token: CancelToken | None=None) -> tuple[dict[str, dict[str, str]], int]:
+        """
+        Args:
+            audit (str | bytes): path of a DegreeWorks PDF or progress JSON file, or the content of either
+
+        Returns:
+            tuple of the progress map and free elective count, as parse_pdf returns
+
+        Raises:
+            AuditError: if the audit cannot be read or parsed
+        """
+        return await self._run(AuditError, _read_audit, audit, cancel_token)
+
+    async def load_schedule(self, schedule_file: str, start_semester: str="", cancel_token: CancelToken | None=None) -> dict[str, list[str]]:
+        """
+        Raises:
+            ScheduleError: if the workbook cannot be read or parsed
+        """
+        return await self._run(ScheduleError, self.session.schedule, schedule_file, start_semester, cancel_token)
+
+    async def load_catalog(self, url: str, cancel_token: CancelToken | None=None) -> tuple[dict[str, list[list[str]]], dict[str, str]]:
+        """
+        Returns:
+            tuple of the prerequisites and course titles
+
+        Raises:
+            CatalogError: if the catalog cannot be fetched or parsed
+        """
+        return await self._run(CatalogError, self.session.catalog, url, cancel_token)
+
+    async def plan(self, degree_data: dict[str, dict[str, str]], free_electives: int, schedule_data: dict[str, list[str]], prereq_data: dict[str, list[list[str]]], title_map: dict[str, str], cancel_token: CancelToken | None=None):
+        """
+        Returns:
+            the course plan, as Planner.find_best_schedule returns
+
+        Raises:
+            PlanError: if the student cannot be planned
+        """
+        controller: ClassPlanController = ClassPlanController(session=self.session)
+        return await self._run(
+            PlanError, controller.get_plan, degree_data, free_electives, schedule_data, prereq_data, title_map, cancel_token
+        )
+
+    async def export(self, course_plan: dict[str, list[dict[str, str]]], output_path: str | None=None) -> str | bytes:
+        """
+        Write the plan as a workbook to output_path, or return the workbook's bytes when no path is given. A workbook
+        at output_path that already holds the same plan is left as it is, see export_plan.
+
+        Raises:
+            ExportError: if the workbook cannot be written
+        """
+        return await self._run(ExportError, _write_workbook, course_plan, output_path)
+
+    async def run(self, audit: str | bytes, schedule_file: str, url: str, output_path: str | None=None, start_semester: str="", cancel_token: CancelToken | None=None):
+        """
+        Load the three inputs concurrently, plan, and export the plan if output_path is given.
+
+        Returns:
+            the course plan
+
+        Raises:
+            PlanningError: the subclass for the first stage that failed
+        """
+        (degree_data, free_electives), schedule_data, (prereq_data, title_map) = await asyncio.gather(
+            self.load_audit(audit, cancel_token),
+            self.load_schedule(schedule_file, start_semester, cancel_token),
+            self.load_catalog(url, cancel_token),
+        )
+        course_plan = await self.plan(degree_data, free_electives, schedule_data, prereq_data, title_map, cancel_token)
+        if output_path is not None:
+            await self.export(course_plan, output_path)
+        return course_plan
@@ -0,0 +1,467 @@
+"""
+Headless batch planning built on ClassPlanController. The schedule and catalog are loaded once and shared with every
+worker, then each student's audit is parsed, planned and exported independently.
+"""
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, as_completed, wait
+from dataclasses import dataclass, field
+from multiprocessing import get_context
+from pathlib import Path
+import logging
+import tracemalloc
+
+from class_planning_tool.controller.class_plan_controller import ClassPlanController
+from class_planning_tool.controller.metrics import PLAN
+from class_planning_tool.course_planner.cohort_scheduler import CohortSchedule, CohortScheduler, SeatLimits
+from class_planning_tool.course_planner.catalog import CompiledCatalog
+from class_planning_tool.course_planner.course_table import CourseTable, ProgressMaps
+from class_planning_tool.course_planner.diagnostics import CatalogDiagnostics, CatalogProblemError, diagnose
+from class_planning_tool.course_planner.validator import PlanValidator
+from class_planning_tool.output_generation.demand_forecast import DemandForecast
+from class_planning_tool.output_generation.plan_store import PlanStore, plan_placements
+
+logger = logging.getLogger(__name__)
+
+AUDIT_EXTENSIONS: tuple[str, ...] = (".pdf", ".json")
+
+# plans buffered before each plan store transaction
+STORE_BATCH_SIZE: int = 500
+
+# students submitted to the pool per worker before waiting for one to finish, unless run_batch is given a limit
+IN_FLIGHT_PER_JOB: int = 2
+
+# schedule and catalog data shared by every student planned in this process, populated by init_worker
+_shared_inputs: dict[str, object] = {}
+
+
+class BatchSetupError(Exception):
+    """
+    Raised when an input shared by the whole batch (schedule or catalog) cannot be loaded, so no student can be planned.
+    """
+
+
+class DuplicateAuditError(BatchSetupError):
+    """
+    Raised when two audits in a directory share a name, e.g. foo.pdf and foo.json, so they would write the same
+    workbook and store entry.
+    """
+
+
+@dataclass
+class StudentResult:
+    """
+    Outcome of planning one student. error holds the failing stage and message, and is empty on success. metrics is
+    the controller's PlanMetrics as a dict, kept in that form so results stay cheap to pass between processes, as are
+    the plan's validation violations, which are only filled in when the batch validates plans. placements carries the
+    plan, as made by plan_placements, to a demand forecast or plan store and is emptied once they have taken it.
+    unchanged is set when the student's workbook already held the same plan and was not rewritten, and changes lists
+    what moved when an earlier plan in the output directory was replaced, see PlanDiff.summary.
+    """
+    student: str
+    audit_path: str
+    output_path: str = ""
+    error: str = ""
+    metrics: dict[str, dict[str, float]] = field(default_factory=dict)
+    violations: list[str] = field(default_factory=list)
+    placements: list[tuple[str, str, str]] = field(default_factory=list)
+    unchanged: bool = False
+    changes: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+    @property
+    def timings(self) -> dict[str, float]:
+        return {stage: values["seconds"] for stage, values in self.metrics.items()}
+
+
+@dataclass
+class BatchReport:
+    """
+    Collected results of a batch run, with the metrics of the shared loading stages kept apart from per-student ones.
+    retained_memory is the most Python memory the collecting process held between students, in bytes, when memory
+    tracking is on; unlike the per-stage peaks it shows whether memory grows over the run.
+    """
+    shared_metrics: dict[str, dict[str, float]] = field(default_factory=dict)
+    results: list[StudentResult] = field(default_factory=list)
+    retained_memory: int = 0
+
+    @property
+    def shared_timings(self) -> dict[str, float]:
+        return {stage: values["seconds"] for stage, values in self.shared_metrics.items()}
+
+    @property
+    def failures(self) -> list[StudentResult]:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def invalid(self) -> list[StudentResult]:
+        return [result for result in self.results if result.violations]
+
+    def stage_summary(self) -> dict[str, dict[str, float]]:
+        """
+        Aggregate per-student stage metrics into count, total, mean and max seconds, plus the largest memory peak, per
+        stage.
+        """
+        summary: dict[str, dict[str, float]] = {}
+        for result in self.results:
+            for stage, values in result.metrics.items():
+                entry = summary.setdefault(stage, {"count": 0, "total": 0.0, "max": 0.0, "peak_memory": 0})
+                entry["count"] += 1
+                entry["total"] += values["seconds"]
+                entry["max"] = max(entry["max"], values["seconds"])
+                entry["peak_memory"] = max(entry["peak_memory"], values["peak_memory"])
+        for entry in summary.values():
+            entry["mean"] = entry["total"] / entry["count"]
+        return summary
+
+    def to_dict(self) -> dict:
+        return {
+            "shared_metrics": self.shared_metrics,
+            "stage_summary": self.stage_summary(),
+            "retained_memory": self.retained_memory,
+            "students": [
+                {
+                    "student": result.student,
+                    "audit_path": result.audit_path,
+                    "output_path": result.output_path,
+                    "error": result.error,
+                    "metrics": result.metrics,
+                    "violations": result.violations,
+                    "unchanged": result.unchanged,
+                    "changes": result.changes,
+                }
+                for result in self.results
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, content: dict) -> "BatchReport":
+        """Rebuild a report written with to_dict. Placements are not part of the dict and stay empty."""
+        return cls(
+            shared_metrics=content["shared_metrics"],
+            retained_memory=content.get("retained_memory", 0),
+            results=[StudentResult(**student) for student in content["students"]],
+        )
+
+
+def find_audits(audit_dir: str) -> list[Path]:
+    """
+    List the audit files (DegreeWorks PDFs or progress JSON files) in a directory, sorted by name. Each student is
+    named by their audit's file name without the extension, compared case-insensitively as on Windows.
+
+    Raises:
+        NotADirectoryError if audit_dir is not a directory
+        DuplicateAuditError if two audits name the same student
+    """
+    path: Path = Path(audit_dir)
+    if not path.is_dir():
+        raise NotADirectoryError(f"The path {audit_dir} is not a directory.")
+    audits: list[Path] = sorted(child for child in path.iterdir() if child.is_file() and child.suffix.lower() in AUDIT_EXTENSIONS)
+    students: dict[str, list[str]] = {}
+    for audit in audits:
+        students.setdefault(audit.stem.casefold(), []).append(audit.name)
+    duplicates: list[str] = [" and ".join(names) for names in students.values() if len(names) > 1]
+    if duplicates:
+        raise DuplicateAuditError(f"Audits in {audit_dir} name the same student, keep one of each: {'; '.join(duplicates)}")
+    return audits
+
+
+def load_shared_inputs(schedule_file: str, catalog_url: str, start_semester: str="", track_memory: bool=False, modes: str="") -> tuple[tuple, dict[str, dict[str, float]]]:
+    """
+    Load the schedule and catalog once for the whole batch. With modes, the schedule only keeps semesters offering a
+    course in one of those delivery modes, see offerings_for_modes.
+
+    Returns:
+        tuple of (schedule_data, prereq_data, title_map) and the metrics of both loading stages
+
+    Raises:
+        BatchSetupError: if either input cannot be loaded
+    """
+    controller: ClassPlanController = ClassPlanController(track_memory=track_memory)
+
+    schedule_data = controller.process_schedule_file(schedule_file, start_semester, modes=modes)
+    if isinstance(schedule_data, str):
+        raise BatchSetupError(f"Could not load schedule {schedule_file}: {schedule_data}")
+
+    try:
+        prereq_data, title_map = controller.process_prerequisites(catalog_url)
+    except Exception as e:
+        raise BatchSetupError(f"Could not load catalog {catalog_url}: {e}") from e
+
+    return (schedule_data, prereq_data, title_map), controller.metrics.to_dict()
+
+
+def init_worker(schedule_data: dict[str, list[str]], prereq_data: dict[str, list[list[str]]], title_map: dict[str, str], prioritize: bool=False) -> None:
+    """
+    Store the shared inputs, and the CompiledCatalog built from them, for every plan_student call made by this
+    process. Used as the process pool initializer. With prioritize, plans take the courses that gate the longest
+    prerequisite chains first, see CompiledCatalog.
+    """
+    _shared_inputs["schedule_data"] = schedule_data
+    _shared_inputs["prereq_data"] = prereq_data
+    _shared_inputs["title_map"] = title_map
+    _shared_inputs["compiled"] = CompiledCatalog(prereq_data, title_map, schedule_data, prioritize)
+    _shared_inputs["validator"] = PlanValidator(prereq_data, schedule_data)
+    # analysed once per process; students the catalog cannot serve then fail before planning, see CatalogDiagnostics
+    diagnose(prereq_data, title_map)
+
+
+def plan_progress(degree_data: dict[str, dict[str, str]], free_electives: int, controller: ClassPlanController | None=None):
+    """
+    Plan one student's parsed progress against the inputs set by init_worker, recording into controller's metrics if
+    one is given.
+    """
+    return (controller or ClassPlanController()).get_plan(
+        degree_data,
+        free_electives,
+        _shared_inputs["schedule_data"],
+        _shared_inputs["prereq_data"],
+        _shared_inputs["title_map"],
+        compiled=_shared_inputs.get("compiled"),
+    )
+
+
+def plan_student(audit_path: str, output_dir: str, track_memory: bool=False, validate: bool=False, collect_plan: bool=False) -> StudentResult:
+    """
+    Parse, plan and export a single student's audit against the inputs set by init_worker. Failures are recorded on
+    the result rather than raised so that one bad audit does not stop the batch. With validate, the plan is also
+    checked by PlanValidator and any violations recorded; they do not count as failures. With collect_plan, the plan's
+    placements are returned on the result for a demand forecast or plan store.
+    """
+    path: Path = Path(audit_path)
+    result: StudentResult = StudentResult(student=path.stem, audit_path=str(path))
+    controller: ClassPlanController = ClassPlanController(track_memory=track_memory)
+
+    try:
+        if path.suffix.lower() == ".json":
+            audit_data = controller.process_progress_file(str(path))
+        else:
+            audit_data = controller.process_degreeworks_file(str(path))
+        if isinstance(audit_data, str):
+            result.error = f"audit: {audit_data}"
+            return result
+        degree_data, free_electives = audit_data
+        return export_student(result, degree_data, free_electives, output_dir, controller, validate, collect_plan)
+    finally:
+        result.metrics = controller.metrics.to_dict()
+
+
+def export_student(result: StudentResult, degree_data: dict[str, dict[str, str]], free_electives: int, output_dir: str, controller: ClassPlanController, validate: bool=False, collect_plan: bool=False) -> StudentResult:
+    """
+    Plan one student's parsed progress and export it as output_dir/<student>.xlsx, recording the outcome on result as
+    plan_student does.
+    """
+    try:
+        course_plan = plan_progress(degree_data, free_electives, controller)
+    except CatalogProblemError as e:
+        result.error = f"catalog: {e}"
+        return result
+    except Exception as e:
+        result.error = f"plan: {e!r}"
+        return result
+
+    if validate:
+        result.violations = [str(violation) for violation in _shared_inputs["validator"].validate(course_plan, degree_data)]
+    if collect_plan:
+        result.placements = plan_placements(course_plan)
+
+    try:
+        result.output_path = controller.generate_course_plan(course_plan, str(Path(output_dir) / f"{result.student}.xlsx"))
+    except Exception as e:
+        result.error = f"export: {e!r}"
+    else:
+        record_export(result, controller)
+    return result
+
+
+def record_export(result: StudentResult, controller: ClassPlanController) -> None:
+    """Copy whether the controller's last export rewrote the workbook, and what moved, onto result."""
+    export = controller.last_export
+    result.unchanged = not export.written
+    result.changes = export.diff.summary() if export.diff is not None else []
+
+
+def run_batch(audit_dir: str, schedule_file: str, catalog_url: str, output_dir: str, jobs: int=1, start_semester: str="", track_memory: bool=False, validate: bool=False, forecast: DemandForecast | None=None, store: PlanStore | None=None, max_in_flight: int=0, max_tasks_per_child: int | None=None, modes: str="", prioritize: bool=False) -> BatchReport:
+    """
+    Plan every audit in audit_dir and write one workbook per student into output_dir. Memory stays bounded however
+    many audits there are: at most max_in_flight students are queued or running at once, each student's documents and
+    workbooks are closed before the next, and only small per-student results are kept.
+
+    Args:
+        audit_dir (str): directory of DegreeWorks PDFs and/or progress JSON files
+        schedule_file (str): path of the 4-year schedule workbook
+        catalog_url (str): course descriptions URL, or path to a saved copy of the page
+        output_dir (str): directory for the generated workbooks, created if missing
+        jobs (int): number of worker processes; 1 plans in the calling process
+        start_semester (str): optional schedule cutoff in 'SP24' format
+        track_memory (bool): also record peak memory per stage, see PlanMetrics
+        validate (bool): check every plan with PlanValidator and record its violations
+        forecast (DemandForecast): optional forecast that every successful plan is added to as its result arrives
+        store (PlanStore): optional store that every successful plan is saved to, STORE_BATCH_SIZE plans per transaction
+        max_in_flight (int): students submitted to the pool but not yet collected; 0 means IN_FLIGHT_PER_JOB per job
+        max_tasks_per_child (int): optionally replace each worker process after this many students, returning
+            whatever memory it has accumulated to the system
+        modes (str): optional delivery mode codes, e.g. "O"; courses are only planned in semesters offering one of them
+        prioritize (bool): take the courses that gate the longest prerequisite chains first, see CompiledCatalog
+
+    Returns:
+        BatchReport: per-student results sorted by student name, plus shared stage metrics
+
+    Raises:
+        BatchSetupError: if the schedule or catalog cannot be loaded
+        NotADirectoryError: if audit_dir is not a directory
+    """
+    audits: list[Path] = find_audits(audit_dir)
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    shared, shared_metrics = load_shared_inputs(schedule_file, catalog_url, start_semester, track_memory, modes)
+    report: BatchReport = BatchReport(shared_metrics=shared_metrics)
+    return plan_audits(
+        audits, shared, report, output_dir, jobs=jobs, track_memory=track_memory, validate=validate, forecast=forecast,
+        store=store, source=audit_dir, max_in_flight=max_in_flight, max_tasks_per_child=max_tasks_per_child,
+        prioritize=prioritize
+    )
+
+
+def plan_audits(audits: list[Path], shared: tuple, report: BatchReport, output_dir: str, jobs: int=1, track_memory: bool=False, validate: bool=False, forecast: DemandForecast | None=None, store: PlanStore | None=None, source: str="", max_in_flight: int=0, max_tasks_per_child: int | None=None, prioritize: bool=False) -> BatchReport:
+    """
+    Plan the given audits against already loaded shared inputs, adding their results to report. This is run_batch
+    without the loading, for callers that get the schedule and catalog elsewhere, such as a shard worker.
+
+    Args:
+        audits (list[Path]): audit files to plan
+        shared (tuple): (schedule_data, prereq_data, title_map) as returned by load_shared_inputs
+        report (BatchReport): report to add the results to
+        source (str): source recorded with plans saved to store
+        other arguments as for run_batch
+
+    Returns:
+        BatchReport: report, with its results sorted by student name
+    """
+    pending: list[tuple[str, list[tuple[str, str, str]]]] = []
+
+    def collect(result: StudentResult) -> StudentResult:
+        if result.ok and forecast is not None:
+            forecast.add_placements(result.placements)
+        if result.ok and store is not None:
+            pending.append((result.student, result.placements))
+            if len(pending) >= STORE_BATCH_SIZE:
+                store.save_placements(pending, source=source)
+                pending.clear()
+        result.placements = []
+        return result
+
+    options: tuple = (output_dir, track_memory, validate, forecast is not None or store is not None)
+    started_tracing: bool = track_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        if jobs <= 1 or len(audits) <= 1:
+            init_worker(*shared, prioritize)
+            for audit in audits:
+                report.results.append(collect(plan_student(str(audit), *options)))
+                if track_memory:
+                    report.retained_memory = max(report.retained_memory, tracemalloc.get_traced_memory()[0])
+        else:
+            limit: int = max_in_flight or jobs * IN_FLIGHT_PER_JOB
+            # worker recycling is not available with fork
+            context = get_context("spawn") if max_tasks_per_child else None
+            with ProcessPoolExecutor(max_workers=jobs, mp_context=context, initializer=init_worker, initargs=(*shared, prioritize), max_tasks_per_child=max_tasks_per_child) as pool:
+                in_flight: set[Future] = set()
+                for audit in audits:
+                    if len(in_flight) >= limit:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        report.results.extend(collect(future.result()) for future in done)
+                        if track_memory:
+                            report.retained_memory = max(report.retained_memory, tracemalloc.get_traced_memory()[0])
+                    in_flight.add(pool.submit(plan_student, str(audit), *options))
+                report.results.extend(collect(future.result()) for future in as_completed(in_flight))
+        if store is not None and pending:
+            store.save_placements(pending, source=source)
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+    report.results.sort(key=lambda result: result.student)
+    return report
+
+
+def run_cohort(audit_dir: str, schedule_file: str, catalog_url: str, output_dir: str, seat_limits: SeatLimits, start_semester: str="", track_memory: bool=False, validate: bool=False, forecast: DemandForecast | None=None, store: PlanStore | None=None, modes: str="", prioritize: bool=False) -> BatchReport:
+    """
+    Plan every audit in audit_dir together with CohortScheduler, so students compete for the seats in seat_limits
+    instead of being planned independently, then write one workbook per student into output_dir. Audits are parsed
+    in this process, since every progress map is needed before any student can be scheduled. The cohort's progress
+    maps and plans are held as CourseTable records until they are exported.
+
+    Args:
+        seat_limits (SeatLimits): seats per course and term, see load_seat_limits
+        other arguments as for run_batch
+
+    Returns:
+        BatchReport: per-student results sorted by student name; the cohort planning stage is in shared_metrics
+
+    Raises:
+        BatchSetupError: if the schedule or catalog cannot be loaded
+        NotADirectoryError: if audit_dir is not a directory
+    """
+    audits: list[Path] = find_audits(audit_dir)
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    shared, shared_metrics = load_shared_inputs(schedule_file, catalog_url, start_semester, track_memory, modes)
+    init_worker(*shared, prioritize)
+    report: BatchReport = BatchReport(shared_metrics=shared_metrics)
+    diagnostics: CatalogDiagnostics = diagnose(shared[1], shared[2])
+
+    controllers: dict[str, ClassPlanController] = {}
+    table: CourseTable = CourseTable.from_catalog(shared[1], shared[2], shared[0])
+    progress_maps: ProgressMaps = ProgressMaps(table)
+    for audit in audits:
+        result: StudentResult = StudentResult(student=audit.stem, audit_path=str(audit))
+        controller: ClassPlanController = ClassPlanController(track_memory=track_memory)
+        if audit.suffix.lower() == ".json":
+            audit_data = controller.process_progress_file(str(audit))
+        else:
+            audit_data = controller.process_degreeworks_file(str(audit))
+        problems: list[str] = [] if isinstance(audit_data, str) else diagnostics.student_problems(audit_data[0], shared[0])
+        if isinstance(audit_data, str):
+            result.error = f"audit: {audit_data}"
+        elif problems:
+            result.error = f"catalog: {'; '.join(problems)}"
+        else:
+            for warning in diagnostics.student_warnings(audit_data[0], shared[0]):
+                logger.warning(f"{result.student}: {warning}")
+            progress_maps[result.student] = audit_data[0]
+            controllers[result.student] = controller
+        result.metrics = controller.metrics.to_dict()
+        report.results.append(result)
+
+    schedule_data, prereq_data, title_map = shared
+    cohort_controller: ClassPlanController = ClassPlanController(track_memory=track_memory)
+    with cohort_controller.metrics.measure(PLAN, len(progress_maps)) as stage:
+        scheduler: CohortScheduler = CohortScheduler(
+            schedule_data, prereq_data, title_map, seat_limits, compiled=_shared_inputs["compiled"], table=table
+        )
+        cohort: CohortSchedule = scheduler.schedule(progress_maps)
+        stage.output_size = sum(cohort.seats_used.values())
+    report.shared_metrics.update(cohort_controller.metrics.to_dict())
+
+    for result in report.results:
+        if not result.ok:
+            continue
+        controller = controllers[result.student]
+        course_plan = cohort.plans[result.student]
+        if validate:
+            result.violations = [str(violation) for violation in _shared_inputs["validator"].validate(course_plan, progress_maps[result.student])]
+        try:
+            result.output_path = controller.generate_course_plan(course_plan, str(Path(output_dir) / f"{result.student}.xlsx"))
+        except Exception as e:
+            result.error = f"export: {e!r}"
+        else:
+            record_export(result, controller)
+            if forecast is not None:
+                forecast.add(course_plan)
+        result.metrics = controller.metrics.to_dict()
+
+    if store is not None:
+        store.save_plans(((result.student, cohort.plans[result.student]) for result in report.results if result.ok), source=audit_dir)
+    report.results.sort(key=lambda result: result.student)
+    return report
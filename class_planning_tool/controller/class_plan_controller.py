@@ -1,47 +1,151 @@
-from class_planning_tool.input_data.degreeworks_parser import parse_pdf
-from class_planning_tool.input_data.excel_inputs import get_class_schedule_data
-from class_planning_tool.input_data.prereq_scraper import Scraper
-from class_planning_tool.output_generation.class_plan_writer import write_plan_workbook
-from class_planning_tool.course_planner.planner import Planner
-
 import os
+import logging
+
+from class_planning_tool.controller.metrics import (
+    EXPORT, PDF_PARSE, PLAN, PROGRESS_PARSE, SCHEDULE_PARSE, SCRAPE, PlanMetrics
+)
+from class_planning_tool.controller.progress import ProgressReporter
+from class_planning_tool.error_handling.cancellation import CancelToken, PlanCancelledError, check_cancelled
+
+# Subsystem modules are imported inside the methods that use them. Their dependencies (PyMuPDF, openpyxl,
+# BeautifulSoup) are slow to import, and deferring them keeps dashboard and CLI startup fast; each is only paid for
+# the first time that subsystem is used.
+
+logger = logging.getLogger(__name__)
+
+
+def _file_size(path) -> int:
+    try:
+        return os.path.getsize(path)
+    except (OSError, TypeError):
+        return 0
 
 
 class ClassPlanController:
-    def __init__(self):
-        pass 
+    def __init__(self, track_memory=False, session=None):
+        """
+        Each stage method records its timing and sizes into self.metrics. track_memory additionally records peak
+        Python memory per stage, at some cost in speed.
+        session is an optional PlanningSession; when given, the schedule, catalog and compiled planner structures are
+        loaded through it and reused for as long as their inputs are unchanged. The first prefetch call creates one.
+        """
+        self.track_memory = track_memory
+        self.metrics: PlanMetrics = PlanMetrics(track_memory=track_memory)
+        self.session = session
+        # ExportResult of the last generate_course_plan call, saying whether the workbook was rewritten and what moved
+        self.last_export = None
 
-    def process_degreeworks_file(self, degree_file):
-        try:
+    def reset_metrics(self) -> PlanMetrics:
+        """Start a fresh metrics record, e.g. before planning the next student. Returns the new record."""
+        self.metrics = PlanMetrics(track_memory=self.track_memory)
+        return self.metrics
+
+    def prefetch_schedule(self, schedule_file, start_semester=""):
+        """
+        Start parsing the schedule in the background; process_schedule_file reuses the result if the file is unchanged.
+        """
+        self._get_session().prefetch_schedule(schedule_file, start_semester)
+
+    def prefetch_catalog(self, url):
+        """
+        Start scraping the catalog in the background; process_prerequisites reuses the result for the same URL.
+        """
+        self._get_session().prefetch_catalog(url)
 
-            degree_data = parse_pdf(degree_file)
+    def _get_session(self):
+        if self.session is None:
+            from class_planning_tool.controller.session import PlanningSession
 
+            self.session = PlanningSession()
+        return self.session
+
+    def process_degreeworks_file(self, degree_file, cancel_token: CancelToken | None = None):
+        try:
+            from class_planning_tool.input_data.degreeworks_parser import parse_pdf
+
+            with self.metrics.measure(PDF_PARSE, _file_size(degree_file)) as stage:
+                degree_data = parse_pdf(degree_file, cancel_token)
+                stage.output_size = len(degree_data[0])
 
             return degree_data
 
+        except PlanCancelledError:
+            raise
         except Exception as e:
             return str(e)
-    def process_schedule_file(self, schedule_file, start_semester=""):
+
+    def process_progress_file(self, progress_file, cancel_token: CancelToken | None = None):
         """
-        Wrapper for prerequisite schedule file parser call
+        Wrapper for progress JSON loader call, the non-PDF counterpart of process_degreeworks_file
         """
         try:
-           
-            schedule_data = get_class_schedule_data(schedule_file, start_semester)
+            from class_planning_tool.input_data.progress_json import parse_progress_json
+
+            check_cancelled(cancel_token)
+            with self.metrics.measure(PROGRESS_PARSE, _file_size(progress_file)) as stage:
+                progress_data = parse_progress_json(progress_file)
+                stage.output_size = len(progress_data[0])
+            return progress_data
+        except PlanCancelledError:
+            raise
+        except Exception as e:
+            return str(e)
+
+    def process_schedule_file(self, schedule_file, start_semester="", cancel_token: CancelToken | None = None, modes: str = ""):
+        """
+        Wrapper for prerequisite schedule file parser call. With modes, only semesters offering a course in one of
+        those delivery modes are kept, see offerings_for_modes.
+        """
+        try:
+            from class_planning_tool.input_data.excel_inputs import get_class_schedule_data
+
+            with self.metrics.measure(SCHEDULE_PARSE, _file_size(schedule_file)) as stage:
+                # the session only caches the full schedule
+                if self.session is not None and not modes:
+                    schedule_data = self.session.schedule(schedule_file, start_semester, cancel_token)
+                else:
+                    schedule_data = get_class_schedule_data(schedule_file, start_semester, cancel_token, modes)
+                stage.output_size = len(schedule_data)
             return schedule_data
+        except PlanCancelledError:
+            raise
         except Exception as e:
             return str(e) 
         
-    def process_prerequisites(self, url):
+    def process_prerequisites(self, url, cancel_token: CancelToken | None = None):
         """
         Wrapper for prerequisite input handler call
         """
-        scraper: Scraper = Scraper(url)
-        return scraper.get_prerequisites(), scraper.title_map
+        from class_planning_tool.input_data.prereq_scraper import Scraper
+
+        with self.metrics.measure(SCRAPE) as stage:
+            if self.session is not None:
+                catalog = self.session.catalog(url, cancel_token)
+            else:
+                scraper: Scraper = Scraper(url, cancel_token)
+                catalog = scraper.get_prerequisites(), scraper.title_map
+            stage.output_size = len(catalog[1])
+        return catalog
     
-    def get_plan(self, degree_data, free_electives, schedule_data, prereq_data, title_map):
-        """Wrapper for retrieving course plan based on inputs"""
-        return Planner(degree_data, free_electives, schedule_data, prereq_data, title_map).find_best_schedule()
+    def get_plan(self, degree_data, free_electives, schedule_data, prereq_data, title_map, cancel_token: CancelToken | None = None, compiled=None):
+        """
+        Wrapper for retrieving course plan based on inputs. compiled is an optional CompiledCatalog for these inputs;
+        otherwise the session's is used when the inputs came from it. Pass one built with prioritize=True to plan in
+        critical-path order.
+
+        Raises:
+            CatalogProblemError: before planning, if catalog problems would stop the planner for this student
+        """
+        from class_planning_tool.course_planner.diagnostics import check_student
+        from class_planning_tool.course_planner.planner import Planner
+
+        check_student(degree_data, prereq_data, title_map, schedule_data)
+        with self.metrics.measure(PLAN, len(degree_data)) as stage:
+            if compiled is None and self.session is not None:
+                compiled = self.session.compiled_for(schedule_data, prereq_data, title_map)
+            course_plan = Planner(degree_data, free_electives, schedule_data, prereq_data, title_map, cancel_token, compiled).find_best_schedule()
+            stage.output_size = sum(len(courses) for courses in course_plan.values())
+        return course_plan
     
     # def generate_course_plan(self, course_plan, output_path=None):
     #     try:
@@ -54,16 +158,121 @@ class ClassPlanController:
            
     #         raise
     def generate_course_plan(self, course_plan, output_path=None):
+        """
+        Export the plan with export_plan, which leaves a workbook already holding the same plan untouched. The outcome
+        is kept in self.last_export.
+        """
+        from class_planning_tool.output_generation.class_plan_writer import export_plan
+
         try:
             # Default to user's Documents folder
             output_path = output_path or os.path.join(os.path.expanduser("~"), "Documents", "Course_Plan.xlsx")
             
-            # Debugging: Print the output path
-            print(f"Attempting to write course plan to: {output_path}")
+            logger.debug(f"Attempting to write course plan to: {output_path}")
 
-            write_plan_workbook(course_plan, output_path)
-            print(f"Course plan successfully saved at: {output_path}")
+            with self.metrics.measure(EXPORT, sum(len(courses) for courses in course_plan.values())) as stage:
+                self.last_export = export_plan(course_plan, output_path)
+                stage.output_size = _file_size(output_path)
+            logger.info(f"Course plan successfully saved at: {output_path}")
             return output_path
         except Exception as e:
-            print(f"Failed to generate course plan: {e}")
-            raise
\ No newline at end of file
+            logger.error(f"Failed to generate course plan: {e}")
+            raise
+
+    def audit_student(self, degree_file):
+        """
+        Name the student an audit belongs to, for keying stored plans: the name and ID printed on a DegreeWorks PDF, or
+        the file name without its extension when the audit does not show them or is a progress JSON file.
+        """
+        from class_planning_tool.input_data.degreeworks_parser import read_student
+
+        if not str(degree_file).lower().endswith(".json"):
+            student = read_student(degree_file)
+            if student:
+                return student
+        return os.path.splitext(os.path.basename(degree_file))[0]
+
+    def store_plan(self, course_plan, student, store_path=None):
+        """
+        Save the plan to the SQLite plan store, replacing the student's previous plan, so it outlives the exported
+        workbook. store_path defaults to the CLASS_PLANNER_STORE environment variable, or course_plans.db in the
+        user's home directory, see default_store_path.
+        """
+        from class_planning_tool.output_generation.plan_store import PlanStore, default_store_path
+
+        with PlanStore(store_path or default_store_path()) as store:
+            store.save_plan(student, course_plan, source="dashboard")
+
+    def run_pipeline(self, degree_file, schedule_file, url, output_path=None, metrics_path=None, events=None, cancel_token: CancelToken | None = None, export=True):
+        """
+        Run every stage for one student with fresh metrics: parse the audit, parse the schedule, scrape the catalog,
+        plan and, unless export is False, export.
+
+        Args:
+            degree_file (str): DegreeWorks PDF, or progress JSON file
+            schedule_file (str): 4-year schedule workbook
+            url (str): course descriptions URL or saved page
+            output_path (str): workbook destination, see generate_course_plan
+            metrics_path (str): optional path to also write the metrics as JSON
+            events (queue.Queue): optional queue receiving a ProgressEvent as each stage starts and finishes, then one
+                final DONE, FAILED or CANCELLED event. Safe to consume from another thread.
+            cancel_token (CancelToken): optional token checked between and inside stages
+            export (bool): whether to write the workbook
+
+        Returns:
+            tuple of the course plan and its PlanMetrics
+
+        Raises:
+            ValueError: if the audit or schedule cannot be parsed, with the parser's message, or CatalogProblemError if
+                the catalog cannot serve this student
+            PlanCancelledError: if cancel_token was cancelled
+        """
+        metrics: PlanMetrics = self.reset_metrics()
+        is_json: bool = str(degree_file).lower().endswith(".json")
+        progress: ProgressReporter = ProgressReporter(events, 5 if export else 4)
+        try:
+            check_cancelled(cancel_token)
+            progress.started(PROGRESS_PARSE if is_json else PDF_PARSE)
+            if is_json:
+                audit_data = self.process_progress_file(degree_file, cancel_token)
+            else:
+                audit_data = self.process_degreeworks_file(degree_file, cancel_token)
+            if isinstance(audit_data, str):
+                raise ValueError(audit_data)
+            degree_data, free_electives = audit_data
+            progress.finished()
+
+            check_cancelled(cancel_token)
+            progress.started(SCHEDULE_PARSE)
+            schedule_data = self.process_schedule_file(schedule_file, cancel_token=cancel_token)
+            if isinstance(schedule_data, str):
+                raise ValueError(schedule_data)
+            progress.finished()
+
+            check_cancelled(cancel_token)
+            progress.started(SCRAPE)
+            prereq_data, title_map = self.process_prerequisites(url, cancel_token)
+            progress.finished()
+
+            check_cancelled(cancel_token)
+            progress.started(PLAN)
+            course_plan = self.get_plan(degree_data, free_electives, schedule_data, prereq_data, title_map, cancel_token)
+            progress.finished()
+
+            if export:
+                check_cancelled(cancel_token)
+                progress.started(EXPORT)
+                self.generate_course_plan(course_plan, output_path)
+                progress.finished()
+
+            progress.done(course_plan)
+            return course_plan, metrics
+        except PlanCancelledError:
+            progress.cancelled()
+            raise
+        except Exception as e:
+            progress.failed(str(e))
+            raise
+        finally:
+            if metrics_path:
+                metrics.write_json(metrics_path)
\ No newline at end of file
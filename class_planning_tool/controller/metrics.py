@@ -0,0 +1,93 @@
+"""
+Per-stage metrics for the planning pipeline: wall time, input and output sizes and, optionally, peak Python memory.
+"""
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Iterator
+
+# stage names used by ClassPlanController
+PDF_PARSE: str = "pdf_parse"
+PROGRESS_PARSE: str = "progress_parse"
+SCHEDULE_PARSE: str = "schedule_parse"
+SCRAPE: str = "scrape"
+PLAN: str = "plan"
+EXPORT: str = "export"
+
+# the highest traced memory seen so far by each open measurement, innermost last. A measurement starting inside another
+# resets the process wide tracemalloc peak, so it folds the peak reached until then into every enclosing one first.
+_open_peaks: list[int] = []
+
+
+@dataclass
+class StageMetrics:
+    """
+    Measurements for one pipeline stage. Sizes are bytes for files and item counts for in-memory data, see the
+    controller method for each stage. peak_memory is the most memory the stage allocated on top of what was already
+    held when it started, in bytes, and stays 0 when memory tracking is off.
+    """
+    name: str
+    seconds: float = 0.0
+    input_size: int = 0
+    output_size: int = 0
+    peak_memory: int = 0
+
+
+@dataclass
+class PlanMetrics:
+    """
+    Metrics for every stage of one plan, in the order the stages ran. Memory tracking uses tracemalloc, which slows
+    pure Python stages noticeably and is process wide, so it is opt-in and only meaningful for one plan at a time per
+    process. Measurements may be nested, and an enclosing stage's peak includes its nested stages, but measurements
+    running concurrently in several threads are not supported.
+    """
+    track_memory: bool = False
+    stages: dict[str, StageMetrics] = field(default_factory=dict)
+
+    @contextmanager
+    def measure(self, stage: str, input_size: int=0) -> Iterator[StageMetrics]:
+        """
+        Time the enclosed block as the named stage. The yielded StageMetrics can be used to record the output size.
+        The stage is recorded even if the block raises.
+        """
+        metrics: StageMetrics = StageMetrics(stage, input_size=input_size)
+        started_tracing: bool = False
+        baseline: int = 0
+        if self.track_memory:
+            if tracemalloc.is_tracing():
+                peak: int = tracemalloc.get_traced_memory()[1]
+                _open_peaks[:] = [max(open_peak, peak) for open_peak in _open_peaks]
+                tracemalloc.reset_peak()
+                baseline = tracemalloc.get_traced_memory()[0]
+            else:
+                tracemalloc.start()
+                started_tracing = True
+            _open_peaks.append(0)
+
+        start: float = time.perf_counter()
+        try:
+            yield metrics
+        finally:
+            metrics.seconds = time.perf_counter() - start
+            if self.track_memory:
+                peak = max(_open_peaks.pop(), tracemalloc.get_traced_memory()[1])
+                metrics.peak_memory = max(0, peak - baseline)
+                if started_tracing:
+                    tracemalloc.stop()
+            self.stages[stage] = metrics
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(stage.seconds for stage in self.stages.values())
+
+    def timings(self) -> dict[str, float]:
+        return {name: stage.seconds for name, stage in self.stages.items()}
+
+    def to_dict(self) -> dict[str, dict[str, float]]:
+        return {name: {key: value for key, value in asdict(stage).items() if key != "name"} for name, stage in self.stages.items()}
+
+    def write_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"total_seconds": self.total_seconds, "stages": self.to_dict()}, f, indent=2)
@@ -0,0 +1,135 @@
+"""
+Speculative background loading of the catalog and schedule. The dashboard starts a prefetch as soon as each input is
+provided; at submit time the controller takes the prefetched result if it was made from the same input, so the user
+mostly waits on planning alone.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+
+from class_planning_tool.error_handling.cancellation import CancelToken, PlanCancelledError, check_cancelled
+
+logger = logging.getLogger(__name__)
+
+# how often a caller waiting on a prefetch re-checks its own cancel token
+_WAIT_INTERVAL_SECONDS: float = 0.1
+
+
+def schedule_key(schedule_file, start_semester: str="") -> tuple:
+    """
+    Identify a schedule input by path, modification time, size and cutoff, so an edited file is never served from a
+    stale prefetch.
+    """
+    try:
+        stat = os.stat(schedule_file)
+        return (os.fspath(schedule_file), stat.st_mtime_ns, stat.st_size, start_semester)
+    except (OSError, TypeError):
+        return (str(schedule_file), None, None, start_semester)
+
+
+def _load_schedule(schedule_file, start_semester: str, cancel_token: CancelToken) -> dict[str, list[str]]:
+    from class_planning_tool.input_data.excel_inputs import get_class_schedule_data
+
+    return get_class_schedule_data(schedule_file, start_semester, cancel_token)
+
+
+def _load_catalog(url: str, cancel_token: CancelToken) -> tuple[dict[str, list[list[str]]], dict[str, str]]:
+    from class_planning_tool.input_data.prereq_scraper import Scraper
+
+    scraper = Scraper(url, cancel_token)
+    return scraper.get_prerequisites(), scraper.title_map
+
+
+class _Slot:
+    """
+    One in-flight or finished prefetch: the input key, the future and the token used to abandon it.
+    """
+
+    def __init__(self, key: tuple, future: Future, cancel_token: CancelToken):
+        self.key: tuple = key
+        self.future: Future = future
+        self.cancel_token: CancelToken = cancel_token
+
+    def abandon(self) -> None:
+        self.cancel_token.cancel()
+        self.future.cancel()
+
+
+class Prefetcher:
+    """
+    Holds at most one catalog and one schedule prefetch. Starting a prefetch for a different input abandons the old
+    one. Results are only handed out for an identical input; a failed prefetch is discarded so the caller loads the
+    input itself and sees the error first hand.
+    """
+
+    def __init__(self):
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="prefetch")
+        self._lock: threading.Lock = threading.Lock()
+        self._slots: dict[str, _Slot] = {}
+
+    def _start(self, name: str, key: tuple, loader, *args) -> Future:
+        with self._lock:
+            slot: _Slot | None = self._slots.get(name)
+            if slot is not None and slot.key == key:
+                return slot.future
+            if slot is not None:
+                slot.abandon()
+            cancel_token: CancelToken = CancelToken()
+            future: Future = self._executor.submit(loader, *args, cancel_token)
+            self._slots[name] = _Slot(key, future, cancel_token)
+            logger.debug(f"Started {name} prefetch for {key}")
+            return future
+
+    def _take(self, name: str, key: tuple, cancel_token: CancelToken | None):
+        with self._lock:
+            slot: _Slot | None = self._slots.get(name)
+        if slot is None or slot.key != key:
+            return None
+
+        while True:
+            check_cancelled(cancel_token)
+            try:
+                return slot.future.result(timeout=_WAIT_INTERVAL_SECONDS)
+            except TimeoutError:
+                continue
+            except PlanCancelledError:
+                return None
+            except Exception as e:
+                logger.info(f"Discarding failed {name} prefetch for {key}: {e}")
+                with self._lock:
+                    if self._slots.get(name) is slot:
+                        del self._slots[name]
+                return None
+
+    def prefetch_schedule(self, schedule_file, start_semester: str="") -> Future:
+        return self._start("schedule", schedule_key(schedule_file, start_semester), _load_schedule, schedule_file, start_semester)
+
+    def prefetch_catalog(self, url: str) -> Future:
+        return self._start("catalog", (url,), _load_catalog, url)
+
+    def take_schedule(self, schedule_file, start_semester: str="", cancel_token: CancelToken | None=None) -> dict[str, list[str]] | None:
+        """
+        Wait for and return the prefetched schedule if it was made from this exact file state, otherwise None.
+        """
+        return self._take("schedule", schedule_key(schedule_file, start_semester), cancel_token)
+
+    def take_catalog(self, url: str, cancel_token: CancelToken | None=None) -> tuple[dict[str, list[list[str]]], dict[str, str]] | None:
+        """
+        Wait for and return the prefetched (prerequisites, titles) if they were made from this URL, otherwise None.
+        """
+        return self._take("catalog", (url,), cancel_token)
+
+    def invalidate(self, name: str | None=None) -> None:
+        """
+        Abandon the named prefetch ("catalog" or "schedule"), or both when no name is given.
+        """
+        with self._lock:
+            for slot_name in [name] if name else list(self._slots):
+                slot: _Slot | None = self._slots.pop(slot_name, None)
+                if slot is not None:
+                    slot.abandon()
+
+    def shutdown(self) -> None:
+        self.invalidate()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,78 @@
+"""
+Progress events emitted by ClassPlanController.run_pipeline. Events are put on a queue.Queue by the worker thread and
+consumed elsewhere, e.g. polled by the dashboard from the Tk main loop, so no widget is touched off the main thread.
+"""
+from dataclasses import dataclass
+from queue import Queue
+
+STARTED: str = "started"
+FINISHED: str = "finished"
+FAILED: str = "failed"
+CANCELLED: str = "cancelled"
+DONE: str = "done"
+
+# user facing descriptions of the controller stages
+STAGE_LABELS: dict[str, str] = {
+    "pdf_parse": "Reading degree requirements",
+    "progress_parse": "Reading progress file",
+    "schedule_parse": "Reading course schedule",
+    "scrape": "Retrieving prerequisites",
+    "plan": "Planning courses",
+    "export": "Writing workbook",
+}
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """
+    One pipeline progress update. step counts the stages finished so far out of total. For DONE events payload holds
+    the course plan; for FAILED events message holds the error.
+    """
+    stage: str
+    status: str
+    step: int
+    total: int
+    message: str = ""
+    payload: object = None
+
+    @property
+    def fraction(self) -> float:
+        return self.step / self.total if self.total else 0.0
+
+    @property
+    def terminal(self) -> bool:
+        return self.status in (DONE, FAILED, CANCELLED)
+
+
+class ProgressReporter:
+    """
+    Queues ProgressEvents for a run of a known number of stages, remembering the current stage so failures and
+    cancellation are attributed to it. With no queue every call is a no-op.
+    """
+
+    def __init__(self, events: "Queue[ProgressEvent] | None", total: int):
+        self.events = events
+        self.total: int = total
+        self.step: int = 0
+        self.stage: str = ""
+
+    def emit(self, status: str, message: str="", payload: object=None) -> None:
+        if self.events is not None:
+            self.events.put(ProgressEvent(self.stage, status, self.step, self.total, message, payload))
+
+    def started(self, stage: str) -> None:
+        self.stage = stage
+        self.emit(STARTED, STAGE_LABELS.get(stage, stage))
+
+    def finished(self) -> None:
+        self.step += 1
+        self.emit(FINISHED)
+
+    def done(self, payload: object) -> None:
+        self.emit(DONE, payload=payload)
+
+    def failed(self, message: str) -> None:
+        self.emit(FAILED, message)
+
+    def cancelled(self) -> None:
+        self.emit(CANCELLED)
@@ -0,0 +1,158 @@
+"""
+Long-lived planning session. Advisors plan students back to back against the same catalog and schedule, so the
+session keeps both in memory, together with the compiled planner structures, until they change or are explicitly
+invalidated. Only the first student of a session pays for loading them.
+"""
+import logging
+import threading
+
+from class_planning_tool.controller.prefetch import Prefetcher, schedule_key
+from class_planning_tool.course_planner.catalog import CompiledCatalog
+from class_planning_tool.error_handling.cancellation import CancelToken
+
+logger = logging.getLogger(__name__)
+
+
+class PlanningSession:
+    """
+    Cache of the loaded catalog, schedule and CompiledCatalog, shared by every ClassPlanController given this session.
+    The schedule is keyed by file path, mtime, size and cutoff, and the catalog by URL, so a changed input is reloaded
+    automatically; invalidate_catalog, invalidate_schedule and invalidate force a reload regardless.
+    Safe to use from the dashboard's main and worker threads. Loads are single-flight: callers asking for an input
+    that is already being loaded wait for that load instead of starting their own. With prioritize, the CompiledCatalog
+    orders each plan's courses by longest prerequisite chain first.
+    """
+
+    def __init__(self, prioritize: bool=False):
+        self.prioritize: bool = prioritize
+        self.prefetcher: Prefetcher = Prefetcher()
+        self._lock: threading.RLock = threading.RLock()
+        self._catalog: tuple[tuple, tuple[dict[str, list[list[str]]], dict[str, str]]] | None = None
+        self._schedule: tuple[tuple, dict[str, list[str]]] | None = None
+        self._compiled: CompiledCatalog | None = None
+        # one lock per input being loaded, held for the whole load and removed once its result is cached
+        self._load_locks: dict[tuple, threading.Lock] = {}
+
+    def _load_lock(self, key: tuple) -> threading.Lock:
+        with self._lock:
+            return self._load_locks.setdefault(key, threading.Lock())
+
+    def prefetch_catalog(self, url: str) -> None:
+        if not self.has_catalog(url):
+            self.prefetcher.prefetch_catalog(url)
+
+    def prefetch_schedule(self, schedule_file, start_semester: str="") -> None:
+        if not self.has_schedule(schedule_file, start_semester):
+            self.prefetcher.prefetch_schedule(schedule_file, start_semester)
+
+    def has_catalog(self, url: str) -> bool:
+        with self._lock:
+            return self._catalog is not None and self._catalog[0] == (url,)
+
+    def has_schedule(self, schedule_file, start_semester: str="") -> bool:
+        with self._lock:
+            return self._schedule is not None and self._schedule[0] == schedule_key(schedule_file, start_semester)
+
+    def catalog(self, url: str, cancel_token: CancelToken | None=None) -> tuple[dict[str, list[list[str]]], dict[str, str]]:
+        """
+        Return (prerequisites, titles) for the URL, from memory, a finished prefetch, or by scraping.
+
+        Raises:
+            HTTPError or URLError if the catalog has to be fetched and the request fails
+        """
+        key: tuple = (url,)
+        with self._lock:
+            if self._catalog is not None and self._catalog[0] == key:
+                return self._catalog[1]
+
+        with self._load_lock(("catalog",) + key):
+            with self._lock:
+                # loaded by another caller while this one waited
+                if self._catalog is not None and self._catalog[0] == key:
+                    return self._catalog[1]
+
+            try:
+                catalog = self.prefetcher.take_catalog(url, cancel_token)
+                if catalog is None:
+                    from class_planning_tool.input_data.prereq_scraper import Scraper
+
+                    scraper = Scraper(url, cancel_token)
+                    catalog = scraper.get_prerequisites(), scraper.title_map
+
+                with self._lock:
+                    self._catalog = (key, catalog)
+                    self._compiled = None
+            finally:
+                with self._lock:
+                    self._load_locks.pop(("catalog",) + key, None)
+        logger.info(f"Session catalog loaded from {url}")
+        return catalog
+
+    def schedule(self, schedule_file, start_semester: str="", cancel_token: CancelToken | None=None) -> dict[str, list[str]]:
+        """
+        Return the course offerings for the schedule file, from memory, a finished prefetch, or by parsing it.
+
+        Raises:
+            see get_class_schedule_data
+        """
+        key: tuple = schedule_key(schedule_file, start_semester)
+        with self._lock:
+            if self._schedule is not None and self._schedule[0] == key:
+                return self._schedule[1]
+
+        with self._load_lock(("schedule",) + key):
+            with self._lock:
+                # loaded by another caller while this one waited
+                if self._schedule is not None and self._schedule[0] == key:
+                    return self._schedule[1]
+
+            try:
+                schedule_data = self.prefetcher.take_schedule(schedule_file, start_semester, cancel_token)
+                if schedule_data is None:
+                    from class_planning_tool.input_data.excel_inputs import get_class_schedule_data
+
+                    schedule_data = get_class_schedule_data(schedule_file, start_semester, cancel_token)
+
+                with self._lock:
+                    self._schedule = (key, schedule_data)
+                    self._compiled = None
+            finally:
+                with self._lock:
+                    self._load_locks.pop(("schedule",) + key, None)
+        logger.info(f"Session schedule loaded from {schedule_file}")
+        return schedule_data
+
+    def compiled_for(self, schedule_data: dict[str, list[str]], prereq_data: dict[str, list[list[str]]], title_map: dict[str, str]) -> CompiledCatalog | None:
+        """
+        Return the CompiledCatalog for the session's current inputs if the given data are those inputs, building it on
+        first use. Returns None for any other data, in which case the planner builds its own structures.
+        """
+        with self._lock:
+            if self._catalog is None or self._schedule is None:
+                return None
+            prerequisites, titles = self._catalog[1]
+            if schedule_data is not self._schedule[1] or prereq_data is not prerequisites or title_map is not titles:
+                return None
+            if self._compiled is None:
+                self._compiled = CompiledCatalog(prerequisites, titles, schedule_data, self.prioritize)
+            return self._compiled
+
+    def invalidate_catalog(self) -> None:
+        with self._lock:
+            self._catalog = None
+            self._compiled = None
+        self.prefetcher.invalidate("catalog")
+
+    def invalidate_schedule(self) -> None:
+        with self._lock:
+            self._schedule = None
+            self._compiled = None
+        self.prefetcher.invalidate("schedule")
+
+    def invalidate(self) -> None:
+        self.invalidate_catalog()
+        self.invalidate_schedule()
+
+    def close(self) -> None:
+        self.invalidate()
+        self.prefetcher.shutdown()
@@ -0,0 +1,332 @@
+"""
+Batch planning split across machines. A job manifest lists every student's audit and points at a catalog artifact,
+the schedule and catalog already parsed, so workers never scrape the catalog or parse the schedule themselves. Each
+worker plans one shard, shard i of N, and writes a shard report next to its plans; merge_shards combines the reports
+into one BatchReport and can gather the shards' workbooks into one directory, a demand forecast and a plan store. Students are assigned to shards by a hash of their name, so every machine computes the same
+split without coordinating, and adding students does not move the others.
+"""
+from dataclasses import dataclass, field
+from pathlib import Path
+import hashlib
+import json
+import logging
+import shutil
+
+from class_planning_tool.controller.batch_runner import (
+    STORE_BATCH_SIZE, BatchReport, StudentResult, find_audits, load_shared_inputs, plan_audits
+)
+from class_planning_tool.controller.metrics import PlanMetrics
+from class_planning_tool.output_generation.demand_forecast import DemandForecast
+from class_planning_tool.output_generation.plan_store import PlanStore
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION: int = 1
+MANIFEST_NAME: str = "manifest.json"
+ARTIFACT_NAME: str = "catalog.json"
+
+# shared stage recorded by each shard worker
+ARTIFACT_LOAD: str = "artifact_load"
+
+
+class ShardError(Exception):
+    """
+    Raised when a manifest, catalog artifact or set of shard reports is missing, malformed, or from a different job.
+    """
+
+
+def shard_of(student: str, count: int) -> int:
+    """The shard, from 0 to count - 1, that plans student."""
+    return int.from_bytes(hashlib.sha256(student.encode("utf-8")).digest()[:8], "big") % count
+
+
+def shard_report_name(index: int, count: int) -> str:
+    return f"shard-{index}-of-{count}.json"
+
+
+def _digest(content) -> str:
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _read_json(path: Path, what: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except OSError as e:
+        raise ShardError(f"Could not read {what} {path}: {e}") from e
+    except json.JSONDecodeError as e:
+        raise ShardError(f"The {what} {path} is not valid JSON: {e}") from e
+
+
+@dataclass
+class JobManifest:
+    """
+    One sharded batch job. students pairs each student's name with their audit path; artifact is the catalog
+    artifact's path. Relative paths are relative to the manifest's directory. setup_metrics are the metrics of loading
+    the schedule and catalog when the job was created.
+    """
+    artifact: str
+    fingerprint: str
+    students: list[tuple[str, str]]
+    setup_metrics: dict[str, dict[str, float]] = field(default_factory=dict)
+    path: str = ""
+
+    @property
+    def job_id(self) -> str:
+        """Identifies the job's catalog and students, so shard reports from another job are refused on merge."""
+        return _digest([self.fingerprint, self.students])
+
+    def resolve(self, path: str) -> Path:
+        return Path(self.path).parent / path
+
+    def shard(self, index: int, count: int) -> list[tuple[str, str]]:
+        """
+        The (student, audit path) pairs of shard index of count.
+
+        Raises:
+            ShardError: if index is not between 0 and count - 1
+        """
+        if count < 1 or not 0 <= index < count:
+            raise ShardError(f"Shard {index} of {count} does not exist; shards are numbered from 0 to count - 1.")
+        return [(student, audit) for student, audit in self.students if shard_of(student, count) == index]
+
+    def to_dict(self) -> dict:
+        return {
+            "version": MANIFEST_VERSION,
+            "artifact": self.artifact,
+            "fingerprint": self.fingerprint,
+            "setup_metrics": self.setup_metrics,
+            "students": [{"student": student, "audit": audit} for student, audit in self.students],
+        }
+
+    def write(self, path: str) -> None:
+        self.path = path
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+def load_manifest(path: str) -> JobManifest:
+    """
+    Raises:
+        ShardError: if the manifest cannot be read or is not a version this tool writes
+    """
+    content: dict = _read_json(Path(path), "manifest")
+    if not isinstance(content, dict) or content.get("version") != MANIFEST_VERSION:
+        raise ShardError(f"The manifest {path} is not a version {MANIFEST_VERSION} job manifest.")
+    try:
+        return JobManifest(
+            artifact=content["artifact"],
+            fingerprint=content["fingerprint"],
+            students=[(entry["student"], entry["audit"]) for entry in content["students"]],
+            setup_metrics=content.get("setup_metrics", {}),
+            path=path,
+        )
+    except (KeyError, TypeError) as e:
+        raise ShardError(f"The manifest {path} is missing {e}") from e
+
+
+def write_catalog_artifact(path: str, shared: tuple) -> str:
+    """
+    Write the parsed schedule and catalog, as returned by load_shared_inputs, to path.
+
+    Returns:
+        str: the artifact's fingerprint, recorded in the manifest
+    """
+    schedule_data, prereq_data, title_map = shared
+    content: dict = {"schedule": schedule_data, "prerequisites": prereq_data, "titles": title_map}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(content, f)
+    return _digest(content)
+
+
+def load_catalog_artifact(path: str, fingerprint: str) -> tuple:
+    """
+    Read a catalog artifact written by write_catalog_artifact.
+
+    Returns:
+        tuple of (schedule_data, prereq_data, title_map), as load_shared_inputs returns
+
+    Raises:
+        ShardError: if the artifact cannot be read or does not match fingerprint
+    """
+    content: dict = _read_json(Path(path), "catalog artifact")
+    if _digest(content) != fingerprint:
+        raise ShardError(f"The catalog artifact {path} does not match its manifest; recreate the job.")
+    return content["schedule"], content["prerequisites"], content["titles"]
+
+
+def create_job(audit_dir: str, schedule_file: str, catalog_url: str, job_dir: str, start_semester: str="", modes: str="") -> JobManifest:
+    """
+    Load the schedule and catalog once and write the catalog artifact and job manifest for every audit in audit_dir
+    into job_dir. Audit paths are written as absolute paths, so workers must see the audits at the same location, for
+    example on a shared file system; the job directory itself can be copied. modes restricts the schedule written to
+    the artifact as for run_batch.
+
+    Returns:
+        JobManifest: the manifest written to job_dir/MANIFEST_NAME
+
+    Raises:
+        BatchSetupError: if the schedule or catalog cannot be loaded
+        NotADirectoryError: if audit_dir is not a directory
+    """
+    audits: list[Path] = find_audits(audit_dir)
+    shared, setup_metrics = load_shared_inputs(schedule_file, catalog_url, start_semester, modes=modes)
+    Path(job_dir).mkdir(parents=True, exist_ok=True)
+
+    manifest: JobManifest = JobManifest(
+        artifact=ARTIFACT_NAME,
+        fingerprint=write_catalog_artifact(str(Path(job_dir) / ARTIFACT_NAME), shared),
+        students=[(audit.stem, str(audit.resolve())) for audit in audits],
+        setup_metrics=setup_metrics,
+    )
+    manifest.write(str(Path(job_dir) / MANIFEST_NAME))
+    logger.info("Wrote job manifest for %d students to %s", len(manifest.students), job_dir)
+    return manifest
+
+
+def run_shard(manifest_path: str, index: int, count: int, output_dir: str, jobs: int=1, track_memory: bool=False, validate: bool=False) -> BatchReport:
+    """
+    Plan shard index of count of a job, writing one workbook per student and the shard report into output_dir.
+
+    Args:
+        manifest_path (str): job manifest written by create_job
+        index (int): shard to plan, from 0 to count - 1
+        count (int): number of shards the job is split into
+        other arguments as for run_batch
+
+    Returns:
+        BatchReport: the shard's results; the artifact load is its only shared stage
+
+    Raises:
+        ShardError: if the manifest or catalog artifact is unusable, or the shard does not exist
+    """
+    manifest: JobManifest = load_manifest(manifest_path)
+    students: list[tuple[str, str]] = manifest.shard(index, count)
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    metrics: PlanMetrics = PlanMetrics(track_memory=track_memory)
+    artifact: Path = manifest.resolve(manifest.artifact)
+    with metrics.measure(ARTIFACT_LOAD, artifact.stat().st_size if artifact.exists() else 0) as stage:
+        shared: tuple = load_catalog_artifact(str(artifact), manifest.fingerprint)
+        stage.output_size = len(shared[1])
+
+    report: BatchReport = plan_audits(
+        [manifest.resolve(audit) for _, audit in students], shared, BatchReport(shared_metrics=metrics.to_dict()),
+        output_dir, jobs=jobs, track_memory=track_memory, validate=validate
+    )
+    with open(Path(output_dir) / shard_report_name(index, count), "w", encoding="utf-8") as f:
+        json.dump({"job_id": manifest.job_id, "shard": index, "count": count, "report": report.to_dict()}, f, indent=2)
+    return report
+
+
+def find_shard_reports(paths: list[str]) -> list[Path]:
+    """Expand directories among paths into the shard reports they hold."""
+    reports: list[Path] = []
+    for path in map(Path, paths):
+        reports.extend(sorted(path.glob("shard-*-of-*.json")) if path.is_dir() else [path])
+    return reports
+
+
+def merge_shards(manifest_path: str, report_paths: list[str], output_dir: str="", forecast: DemandForecast | None=None, store: PlanStore | None=None) -> BatchReport:
+    """
+    Combine the shard reports of a job into one report, as run_batch would have returned for the whole job. Shared
+    metrics are the job's setup metrics plus the slowest shard's artifact load, since shards run side by side. Each
+    shard's workbooks are expected next to its report.
+
+    Args:
+        manifest_path (str): the job's manifest
+        report_paths (list[str]): shard report files, or directories holding them
+        output_dir (str): optional directory every shard's workbooks are copied into
+        forecast (DemandForecast): optional forecast that every successful plan is added to
+        store (PlanStore): optional store that every successful plan is saved to, as run_batch does
+
+    Returns:
+        BatchReport: every student's result, sorted by student name, with output paths pointing at the merged
+        workbooks when output_dir is given and at the shards' workbooks otherwise
+
+    Raises:
+        ShardError: if a report is malformed or belongs to another job, any shard or student is missing, or a
+        successful student's workbook is not next to its shard report
+    """
+    manifest: JobManifest = load_manifest(manifest_path)
+    merged: BatchReport = BatchReport(shared_metrics=dict(manifest.setup_metrics))
+    seen: dict[int, Path] = {}
+    counts: set[int] = set()
+    # shard output directory of every student, where their workbook was written
+    shard_dirs: dict[str, Path] = {}
+
+    for path in find_shard_reports(report_paths):
+        content = _read_json(path, "shard report")
+        if not isinstance(content, dict) or content.get("job_id") != manifest.job_id:
+            raise ShardError(f"The shard report {path} belongs to a different job.")
+        try:
+            index: int = content["shard"]
+            count: int = content["count"]
+            report: BatchReport = BatchReport.from_dict(content["report"])
+        except (KeyError, TypeError) as e:
+            raise ShardError(f"The shard report {path} is missing {e}") from e
+        if index in seen:
+            raise ShardError(f"Shard {index} is reported by both {seen[index]} and {path}.")
+        seen[index] = path
+        counts.add(count)
+
+        merged.results.extend(report.results)
+        shard_dirs.update((result.student, path.parent) for result in report.results)
+        merged.retained_memory = max(merged.retained_memory, report.retained_memory)
+        for stage, values in report.shared_metrics.items():
+            entry: dict[str, float] = merged.shared_metrics.setdefault(stage, dict(values))
+            for key, value in values.items():
+                entry[key] = max(entry[key], value)
+
+    if len(counts) != 1:
+        raise ShardError(f"Expected the reports of one split of the job, found shard counts {sorted(counts) or 'none'}.")
+    missing_shards: list[int] = sorted(set(range(counts.pop())) - set(seen))
+    if missing_shards:
+        raise ShardError(f"Missing reports for shards {', '.join(map(str, missing_shards))}.")
+    missing_students: set[str] = {student for student, _ in manifest.students} - {result.student for result in merged.results}
+    if missing_students:
+        raise ShardError(f"No results for {', '.join(sorted(missing_students))}.")
+
+    merged.results.sort(key=lambda result: result.student)
+    collect_workbooks(merged.results, shard_dirs, output_dir, forecast, store, source=str(Path(manifest.path).parent))
+    return merged
+
+
+def collect_workbooks(results: list[StudentResult], shard_dirs: dict[str, Path], output_dir: str="", forecast: DemandForecast | None=None, store: PlanStore | None=None, source: str="") -> None:
+    """
+    Point every successful result at its workbook in its shard directory, or copy the workbook into output_dir, and
+    add the plan it holds to forecast and store.
+
+    Raises:
+        ShardError: if a successful student's workbook is missing from their shard directory
+    """
+    from class_planning_tool.output_generation.class_plan_writer import read_plan_workbook
+
+    if output_dir:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+    pending: list[tuple[str, dict[str, list[dict[str, str]]]]] = []
+    for result in results:
+        if not result.ok:
+            continue
+        workbook: Path = shard_dirs[result.student] / Path(result.output_path).name
+        if not workbook.is_file():
+            raise ShardError(f"The plan {workbook} of {result.student} is missing; keep each shard's plans next to its report.")
+        result.output_path = str(workbook)
+        if output_dir:
+            target: Path = Path(output_dir) / workbook.name
+            if target.resolve() != workbook.resolve():
+                shutil.copy2(workbook, target)
+            result.output_path = str(target)
+
+        if forecast is None and store is None:
+            continue
+        course_plan = read_plan_workbook(str(workbook))
+        if forecast is not None:
+            forecast.add(course_plan)
+        if store is not None:
+            pending.append((result.student, course_plan))
+            if len(pending) >= STORE_BATCH_SIZE:
+                store.save_plans(pending, source=source)
+                pending = []
+    if store is not None and pending:
+        store.save_plans(pending, source=source)
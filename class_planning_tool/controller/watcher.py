@@ -0,0 +1,226 @@
+"""
+Watch mode: keeps one plan workbook per audit in an output directory current while the audits, the schedule workbook
+and a saved catalog page change. Files are compared by modification time and size, and hashed only when those
+differ, so touching a file without changing it replans nobody. Only changed inputs are reparsed, and only the
+students they affect are replanned.
+"""
+from dataclasses import dataclass, field
+from pathlib import Path
+import hashlib
+import logging
+import os
+import time
+from typing import Callable
+
+from class_planning_tool.controller.batch_runner import (
+    BatchSetupError, DuplicateAuditError, StudentResult, export_student, find_audits, init_worker
+)
+from class_planning_tool.controller.class_plan_controller import ClassPlanController
+from class_planning_tool.error_handling.cancellation import CancelToken
+
+logger = logging.getLogger(__name__)
+
+# seconds between polls of the input directory
+WATCH_INTERVAL: float = 2.0
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class FileState:
+    mtime_ns: int
+    size: int
+    digest: str
+
+
+@dataclass
+class WatchCycle:
+    """
+    What one poll found and did. planned holds a result for every student replanned, removed the students whose audits
+    disappeared.
+    """
+    planned: list[StudentResult] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    schedule_changed: bool = False
+    catalog_changed: bool = False
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.planned or self.removed or self.schedule_changed or self.catalog_changed)
+
+
+class PlanWatcher:
+    """
+    Polls an audit directory, a schedule workbook and, when it is a local file, the catalog. The first poll plans
+    every audit. Later polls replan a student when their audit changed, when the catalog changed, or when the schedule
+    changed the offerings of a course they still need. Inputs that fail to load after the first poll are logged and
+    the previous version is kept, since they are usually caught mid-save; so is the list of audits while two of them
+    name the same student. A student's workbook is deleted when their audit is removed or their replan fails, so the
+    output directory never shows an outdated plan. prioritize is passed to init_worker.
+    """
+
+    def __init__(self, audit_dir: str, schedule_file: str, catalog_url: str, output_dir: str, start_semester: str="", validate: bool=False, prioritize: bool=False):
+        self.audit_dir: str = audit_dir
+        self.schedule_file: str = schedule_file
+        self.catalog_url: str = catalog_url
+        self.output_dir: str = output_dir
+        self.start_semester: str = start_semester
+        self.validate: bool = validate
+        self.prioritize: bool = prioritize
+
+        self.files: dict[str, FileState] = {}
+        self.audits: set[str] = set()
+        # parsed (progress map, free electives) per audit path; audits that failed to parse wait for their next change
+        self.progress: dict[str, tuple[dict[str, dict[str, str]], int]] = {}
+        self.schedule_data: dict[str, list[str]] | None = None
+        self.prereq_data: dict[str, list[list[str]]] | None = None
+        self.title_map: dict[str, str] | None = None
+
+    def has_changed(self, path: str) -> bool:
+        """
+        Whether the file's content differs from the last time this was called for it. A missing file is unchanged.
+        """
+        try:
+            stat: os.stat_result = os.stat(path)
+        except OSError:
+            return False
+        state: FileState | None = self.files.get(path)
+        if state is not None and state.mtime_ns == stat.st_mtime_ns and state.size == stat.st_size:
+            return False
+        digest: str = file_digest(path)
+        self.files[path] = FileState(stat.st_mtime_ns, stat.st_size, digest)
+        return state is None or state.digest != digest
+
+    def poll(self) -> WatchCycle:
+        """
+        Check every input once, reparse what changed and replan the affected students.
+
+        Raises:
+            BatchSetupError: if the schedule or catalog cannot be loaded, or two audits name the same student, on the
+                first poll
+            NotADirectoryError: if the audit directory is missing
+        """
+        cycle: WatchCycle = WatchCycle()
+        Path(self.output_dir).mkdir(parents=True, exist_ok=True)
+        affected_courses: set[str] = self._reload_schedule(cycle)
+        self._reload_catalog(cycle)
+        if cycle.schedule_changed or cycle.catalog_changed:
+            init_worker(self.schedule_data, self.prereq_data, self.title_map, self.prioritize)
+
+        try:
+            audits: list[str] = [str(audit) for audit in find_audits(self.audit_dir)]
+        except DuplicateAuditError as e:
+            if not self.audits:
+                raise
+            # usually an audit caught mid-replacement by one of another format; the directory settles by the next poll
+            logger.warning(f"Keeping the previous audits: {e}")
+            audits = sorted(self.audits)
+        for path in self.audits.difference(audits):
+            self.progress.pop(path, None)
+            self.files.pop(path, None)
+            self._discard_workbook(Path(path).stem)
+            cycle.removed.append(Path(path).stem)
+        self.audits = set(audits)
+
+        for path in audits:
+            result: StudentResult | None = None
+            if self.has_changed(path):
+                result = self._plan(path, reparse=True)
+            elif path in self.progress and (cycle.catalog_changed or self._needs_course(path, affected_courses)):
+                result = self._plan(path, reparse=False)
+            if result is not None:
+                if not result.ok:
+                    # the workbook left from the last successful plan no longer matches the audit or the inputs
+                    self._discard_workbook(result.student)
+                cycle.planned.append(result)
+
+        cycle.removed.sort()
+        cycle.planned.sort(key=lambda result: result.student)
+        if cycle.changed:
+            logger.info(f"Watch cycle replanned {len(cycle.planned)} students, {len(cycle.removed)} audits removed")
+        return cycle
+
+    def watch(self, interval: float=WATCH_INTERVAL, cancel_token: CancelToken | None=None, on_cycle: Callable[[WatchCycle], None] | None=None) -> None:
+        """
+        Poll every interval seconds until cancel_token is cancelled, passing each cycle that changed something to
+        on_cycle.
+        """
+        while cancel_token is None or not cancel_token.cancelled:
+            cycle: WatchCycle = self.poll()
+            if on_cycle is not None and cycle.changed:
+                on_cycle(cycle)
+            time.sleep(interval)
+
+    def _reload_schedule(self, cycle: WatchCycle) -> set[str]:
+        """
+        Returns:
+            courses whose offerings changed
+        """
+        if not self.has_changed(self.schedule_file) and self.schedule_data is not None:
+            return set()
+        schedule_data = ClassPlanController().process_schedule_file(self.schedule_file, self.start_semester)
+        if isinstance(schedule_data, str):
+            if self.schedule_data is None:
+                raise BatchSetupError(f"Could not load schedule {self.schedule_file}: {schedule_data}")
+            logger.warning(f"Keeping the previous schedule, could not load {self.schedule_file}: {schedule_data}")
+            return set()
+
+        previous: dict[str, list[str]] = self.schedule_data or {}
+        affected: set[str] = {course for course in previous.keys() | schedule_data.keys() if previous.get(course) != schedule_data.get(course)}
+        self.schedule_data = schedule_data
+        cycle.schedule_changed = True
+        return affected
+
+    def _reload_catalog(self, cycle: WatchCycle) -> None:
+        # a catalog URL is only loaded once; a saved copy of the page is watched like the other inputs
+        changed: bool = os.path.isfile(self.catalog_url) and self.has_changed(self.catalog_url)
+        if self.prereq_data is not None and not changed:
+            return
+        try:
+            self.prereq_data, self.title_map = ClassPlanController().process_prerequisites(self.catalog_url)
+        except Exception as e:
+            if self.prereq_data is None:
+                raise BatchSetupError(f"Could not load catalog {self.catalog_url}: {e}") from e
+            logger.warning(f"Keeping the previous catalog, could not load {self.catalog_url}: {e}")
+            return
+        cycle.catalog_changed = True
+
+    def _discard_workbook(self, student: str) -> None:
+        workbook: Path = Path(self.output_dir) / f"{student}.xlsx"
+        try:
+            workbook.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Could not remove the outdated plan {workbook}: {e}")
+        else:
+            logger.debug(f"Removed the outdated plan {workbook}")
+
+    def _needs_course(self, path: str, courses: set[str]) -> bool:
+        if not courses:
+            return False
+        progress: dict[str, dict[str, str]] = self.progress[path][0]
+        return any(course in courses and progress[course]["status"] != "complete" for course in progress)
+
+    def _plan(self, path: str, reparse: bool) -> StudentResult:
+        result: StudentResult = StudentResult(student=Path(path).stem, audit_path=path)
+        controller: ClassPlanController = ClassPlanController()
+        try:
+            if reparse:
+                if path.lower().endswith(".json"):
+                    audit_data = controller.process_progress_file(path)
+                else:
+                    audit_data = controller.process_degreeworks_file(path)
+                if isinstance(audit_data, str):
+                    self.progress.pop(path, None)
+                    result.error = f"audit: {audit_data}"
+                    return result
+                self.progress[path] = audit_data
+            degree_data, free_electives = self.progress[path]
+            return export_student(result, degree_data, free_electives, self.output_dir, controller, self.validate)
+        finally:
+            result.metrics = controller.metrics.to_dict()
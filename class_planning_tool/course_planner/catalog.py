@@ -0,0 +1,164 @@
+from collections import defaultdict, deque
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _bit_members(mask: int, courses: list[str]) -> list[str]:
+    """Courses whose bits are set in mask, in bit order."""
+    members: list[str] = []
+    while mask:
+        low: int = mask & -mask
+        members.append(courses[low.bit_length() - 1])
+        mask ^= low
+    return members
+
+
+class CompiledCatalog:
+    """
+    Student-independent planner structures, built once per catalog and schedule and shared by every Planner using
+    them: the prerequisite graph, its topological order and set-based offering lookups.
+
+    It also precomputes the transitive closure of the prerequisite graph, as one int bitset per course over the
+    topological order, and each course's longest downstream chain. The closures answer "what does X need" and "what
+    does X unlock" with a bit operation, and priority_order ranks courses that gate the longest chains first.
+    order_for reproduces Planner.topological_sort for each student, whose Kahn queue starts from their remaining
+    courses, so sharing a catalog never changes a plan. Built with prioritize=True, it instead moves the courses that
+    gate the longest chains to the front of that order.
+    Instances are treated as read-only after construction so they can be shared between plans and threads.
+    """
+
+    def __init__(self, prerequisites: dict[str, list[list[str]]], titles: dict[str, str], offerings: dict[str, list[str]], prioritize: bool=False):
+        self.prerequisites: dict[str, list[list[str]]] = prerequisites
+        self.titles: dict[str, str] = titles
+        self.offerings: dict[str, list[str]] = offerings
+        self.offering_sets: dict[str, frozenset[str]] = {course: frozenset(terms) for course, terms in offerings.items()}
+
+        self.graph: dict[str, list[str]] = self.build_graph(prerequisites)
+        self.topological_order: list[str] = self.sort_graph(self.graph)
+        # what Planner.build_course_graph adds after a student's remaining courses: every prerequisite, first seen first
+        self.prerequisite_order: list[str] = list(dict.fromkeys(
+            prereq for prereq_groups in prerequisites.values() for prereq_group in prereq_groups for prereq in prereq_group
+        ))
+        self.in_degree: dict[str, int] = {course: 0 for course in self.graph}
+        for dependents in self.graph.values():
+            for dependent in dependents:
+                self.in_degree[dependent] += 1
+
+        # bit i stands for topological_order[i]; courses on cycles have no bit and no closure
+        self.bit_index: dict[str, int] = {course: index for index, course in enumerate(self.topological_order)}
+        self.requires_mask: dict[str, int] = {}
+        self.unlocks_mask: dict[str, int] = {}
+        self.chain_length: dict[str, int] = {}
+        self.build_closures()
+        self.priority_order: list[str] = sorted(
+            self.topological_order, key=lambda course: (-self.chain_length[course], self.bit_index[course])
+        )
+        self.prioritize: bool = prioritize
+        self.candidate_order: list[str] = self.priority_order if prioritize else self.topological_order
+
+    @staticmethod
+    def build_graph(prerequisites: dict[str, list[list[str]]]) -> dict[str, list[str]]:
+        """
+        Map every course to the courses that list it as a prerequisite, matching Planner.build_course_graph.
+        """
+        graph: dict[str, list[str]] = defaultdict(list)
+        for course, prereq_groups in prerequisites.items():
+            graph[course]
+            for prereq_group in prereq_groups:
+                for prereq in prereq_group:
+                    graph[prereq].append(course)
+        return dict(graph)
+
+    @staticmethod
+    def sort_graph(graph: dict[str, list[str]]) -> list[str]:
+        """
+        Kahn's algorithm over the whole catalog. As in Planner.topological_sort, courses on a cycle are left out.
+        """
+        in_degree: dict[str, int] = {course: 0 for course in graph}
+        for dependents in graph.values():
+            for dependent in dependents:
+                in_degree[dependent] += 1
+
+        zero_in_degree: deque[str] = deque(course for course, degree in in_degree.items() if degree == 0)
+        order: list[str] = []
+        while zero_in_degree:
+            course = zero_in_degree.popleft()
+            order.append(course)
+            for dependent in graph[course]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    zero_in_degree.append(dependent)
+
+        if len(order) < len(graph):
+            logger.warning(f"{len(graph) - len(order)} catalog courses are on prerequisite cycles and were not ordered")
+        return order
+
+    def build_closures(self) -> None:
+        """
+        Fill requires_mask, unlocks_mask and chain_length in one pass each way over the topological order.
+        chain_length counts the courses on the longest chain of dependents starting at a course, itself included, so
+        it is a lower bound on the terms left once the course is next to take.
+        """
+        for course in self.topological_order:
+            mask: int = 0
+            for prereq_group in self.prerequisites.get(course, ()):
+                for prereq in prereq_group:
+                    bit: int | None = self.bit_index.get(prereq)
+                    if bit is not None:
+                        mask |= self.requires_mask[prereq] | (1 << bit)
+            self.requires_mask[course] = mask
+
+        for course in reversed(self.topological_order):
+            mask = 0
+            longest: int = 0
+            for dependent in self.graph[course]:
+                bit = self.bit_index.get(dependent)
+                if bit is not None:
+                    mask |= self.unlocks_mask[dependent] | (1 << bit)
+                    longest = max(longest, self.chain_length[dependent])
+            self.unlocks_mask[course] = mask
+            self.chain_length[course] = longest + 1
+
+    def requires(self, course: str) -> list[str]:
+        """Every course that is a direct or indirect prerequisite of course, in topological order."""
+        return _bit_members(self.requires_mask.get(course, 0), self.topological_order)
+
+    def unlocks(self, course: str) -> list[str]:
+        """Every course that course is a direct or indirect prerequisite of, in topological order."""
+        return _bit_members(self.unlocks_mask.get(course, 0), self.topological_order)
+
+    def is_prerequisite(self, prereq: str, course: str) -> bool:
+        """Whether prereq is a direct or indirect prerequisite of course."""
+        bit: int | None = self.bit_index.get(prereq)
+        return bit is not None and bool(self.requires_mask.get(course, 0) >> bit & 1)
+
+    def order_for(self, required_courses: set[str]) -> list[str]:
+        """
+        Candidate order for one student, the same as Planner.topological_sort: Kahn's algorithm seeded with the
+        required courses that have no prerequisites, in the set's own order, then the other prerequisites without
+        any. The graph and in-degrees are shared, so only the sort itself runs per student. With prioritize, courses
+        are then stably reordered by longest chain first; a prerequisite's chain is always longer than its
+        dependent's, so that is still a topological order.
+        """
+        in_degree: dict[str, int] = dict(self.in_degree)
+        zero_in_degree: deque[str] = deque(course for course in required_courses if not in_degree.get(course))
+        zero_in_degree.extend(
+            course for course in self.prerequisite_order if in_degree[course] == 0 and course not in required_courses
+        )
+        order: list[str] = []
+        while zero_in_degree:
+            course = zero_in_degree.popleft()
+            order.append(course)
+            for dependent in self.graph.get(course, ()):
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    zero_in_degree.append(dependent)
+
+        if self.prioritize:
+            order.sort(key=lambda course: -self.chain_length.get(course, 1))
+        return order
+
+    def is_offered(self, course: str, semester: str) -> bool:
+        terms: frozenset[str] | None = self.offering_sets.get(course)
+        return terms is not None and semester in terms
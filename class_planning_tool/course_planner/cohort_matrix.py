@@ -0,0 +1,157 @@
+"""
+Vectorized cohort queries. The schedule becomes a boolean course x term offering matrix and a cohort's parsed audits a
+boolean student x course remaining matrix over the same course axis, so questions such as "how many students can
+take X in SP26" are single array operations instead of loops over every student and course.
+
+NumPy is an optional dependency, only needed when these classes are used.
+"""
+from typing import Iterable
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency, see _require_numpy
+    np = None
+
+from class_planning_tool.course_planner.validator import term_rank
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("NumPy is required for cohort matrices, install it with 'pip install numpy'")
+
+
+def _term_sort_key(term: str) -> tuple[int, str]:
+    rank: int | None = term_rank(term)
+    return (rank if rank is not None else -1, term)
+
+
+class OfferingMatrix:
+    """
+    Boolean matrix of courses (rows) by terms (columns), True where the schedule offers the course in that term.
+    Terms are ordered chronologically.
+    """
+
+    def __init__(self, courses: list[str], terms: list[str], offered):
+        _require_numpy()
+        self.courses: list[str] = courses
+        self.terms: list[str] = terms
+        self.course_index: dict[str, int] = {course: index for index, course in enumerate(courses)}
+        self.term_index: dict[str, int] = {term: index for index, term in enumerate(terms)}
+        self.offered = offered
+
+    @classmethod
+    def from_schedule(cls, offerings: dict[str, list[str]], extra_courses: Iterable[str]=()) -> "OfferingMatrix":
+        """
+        Build the matrix from extract_sheet_data or get_class_schedule_data output. extra_courses adds rows for
+        courses missing from the schedule, which are never offered.
+        """
+        _require_numpy()
+        courses: list[str] = list(offerings)
+        known: set[str] = set(courses)
+        for course in extra_courses:
+            if course not in known:
+                known.add(course)
+                courses.append(course)
+        terms: list[str] = sorted({term for course_terms in offerings.values() for term in course_terms}, key=_term_sort_key)
+        term_index: dict[str, int] = {term: index for index, term in enumerate(terms)}
+
+        offered = np.zeros((len(courses), len(terms)), dtype=bool)
+        for row, course in enumerate(courses):
+            columns: list[int] = [term_index[term] for term in offerings.get(course, ())]
+            offered[row, columns] = True
+        return cls(courses, terms, offered)
+
+    def is_offered(self, course: str, term: str) -> bool:
+        if course not in self.course_index or term not in self.term_index:
+            return False
+        return bool(self.offered[self.course_index[course], self.term_index[term]])
+
+    def courses_in(self, term: str) -> list[str]:
+        """Courses offered in the term, in schedule order."""
+        if term not in self.term_index:
+            return []
+        return [self.courses[row] for row in np.flatnonzero(self.offered[:, self.term_index[term]])]
+
+    def terms_for(self, course: str) -> list[str]:
+        """Terms the course is offered in, in chronological order."""
+        if course not in self.course_index:
+            return []
+        return [self.terms[column] for column in np.flatnonzero(self.offered[self.course_index[course]])]
+
+
+class CohortMatrix:
+    """
+    Boolean matrix of students (rows) by the offering matrix's courses (columns), True where the student still needs
+    the course. Built with from_progress, which also extends the offering matrix with any audit course missing from the
+    schedule so both share one course axis.
+    """
+
+    def __init__(self, students: list[str], remaining, offerings: OfferingMatrix):
+        _require_numpy()
+        self.students: list[str] = students
+        self.remaining = remaining
+        self.offerings: OfferingMatrix = offerings
+
+    @classmethod
+    def from_progress(cls, progress_maps: Iterable[tuple[str, dict[str, dict[str, str]]]], schedule: dict[str, list[str]], include_current: bool=False) -> "CohortMatrix":
+        """
+        Args:
+            progress_maps: (student, progress map) pairs, the progress maps as returned by parse_pdf or
+                parse_progress_json
+            schedule (dict[str, list[str]]): course offerings from the schedule parser
+            include_current (bool): also count courses the student is currently taking as remaining
+
+        Raises:
+            ImportError: if NumPy is not installed
+        """
+        _require_numpy()
+        remaining_statuses: set[str] = {"incomplete", "current"} if include_current else {"incomplete"}
+        students: list[str] = []
+        needed: list[list[str]] = []
+        for student, progress in progress_maps:
+            students.append(student)
+            needed.append([course for course, entry in progress.items() if entry["status"] in remaining_statuses])
+
+        offerings: OfferingMatrix = OfferingMatrix.from_schedule(schedule, (course for courses in needed for course in courses))
+        remaining = np.zeros((len(students), len(offerings.courses)), dtype=bool)
+        for row, courses in enumerate(needed):
+            remaining[row, [offerings.course_index[course] for course in courses]] = True
+        return cls(students, remaining, offerings)
+
+    def demand(self) -> dict[str, int]:
+        """Number of students still needing each course, for courses at least one student needs."""
+        counts = self.remaining.sum(axis=0)
+        return {self.offerings.courses[column]: int(counts[column]) for column in np.flatnonzero(counts)}
+
+    def term_demand(self):
+        """
+        Integer course x term matrix: the number of students who need the course where it is offered, else 0.
+        """
+        return self.remaining.sum(axis=0)[:, None] * self.offerings.offered
+
+    def can_take(self, course: str, term: str) -> int:
+        """Number of students who still need the course, if it is offered in the term, otherwise 0."""
+        if not self.offerings.is_offered(course, term):
+            return 0
+        return int(self.remaining[:, self.offerings.course_index[course]].sum())
+
+    def students_needing(self, course: str) -> list[str]:
+        if course not in self.offerings.course_index:
+            return []
+        return [self.students[row] for row in np.flatnonzero(self.remaining[:, self.offerings.course_index[course]])]
+
+    def available_counts(self):
+        """
+        Integer student x term matrix: how many of each student's remaining courses are offered in each term.
+        """
+        return self.remaining.astype(np.int32) @ self.offerings.offered.astype(np.int32)
+
+    def unofferable(self) -> dict[str, list[str]]:
+        """
+        Remaining courses that are offered in no scheduled term, per affected student.
+        """
+        blocked = self.remaining & ~self.offerings.offered.any(axis=1)
+        return {
+            self.students[row]: [self.offerings.courses[column] for column in np.flatnonzero(blocked[row])]
+            for row in np.flatnonzero(blocked.any(axis=1))
+        }
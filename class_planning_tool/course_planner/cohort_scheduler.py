@@ -0,0 +1,226 @@
+"""
+Seat-aware scheduling of a whole cohort. Planner plans each student on their own, so with limited sections every
+student lands in the same popular course in the same term. CohortScheduler instead fills each term's seats across all
+students, giving students closest to graduation first pick.
+"""
+from collections import Counter, OrderedDict
+from collections.abc import Mapping, MutableMapping
+from dataclasses import dataclass, field
+from pathlib import Path
+import csv
+import heapq
+import logging
+
+from class_planning_tool.course_planner.catalog import CompiledCatalog
+from class_planning_tool.course_planner.course_table import CourseTable, PlanMaps
+from class_planning_tool.course_planner.validator import term_code, term_rank
+from class_planning_tool.error_handling.cancellation import CancelToken, check_cancelled
+
+logger = logging.getLogger(__name__)
+
+# same term range as Planner.find_best_schedule
+DEFAULT_TERMS: tuple[str, ...] = tuple(term_code(rank) for rank in range(term_rank("FA24"), term_rank("FA29") + 1))
+
+# capstone courses, placed in each student's final term as Planner does with CPSC 6000
+FINAL_COURSES: frozenset[str] = frozenset({"CPSC 6000"})
+
+
+class SeatLimitError(Exception):
+    """
+    Raised when a seat limits file cannot be read.
+    """
+
+
+class SeatLimits:
+    """
+    Seats available per course and term. A (course, term) limit wins over a course-wide limit, which wins over the
+    default; a default of None leaves courses without a limit unlimited.
+    """
+
+    def __init__(self, default: int | None=None):
+        self.default: int | None = default
+        self.course_limits: dict[str, int] = {}
+        self.term_limits: dict[tuple[str, str], int] = {}
+
+    def set(self, course: str, seats: int, term: str="") -> None:
+        if term:
+            self.term_limits[(course, term)] = seats
+        else:
+            self.course_limits[course] = seats
+
+    def seats(self, course: str, term: str) -> int | None:
+        """Seats offered for the course in the term, or None if unlimited."""
+        seats: int | None = self.term_limits.get((course, term))
+        if seats is None:
+            seats = self.course_limits.get(course, self.default)
+        return seats
+
+
+def load_seat_limits(file_path: str, default: int | None=None) -> SeatLimits:
+    """
+    Read seat limits from a CSV file with course, term and seats columns and a header row. A blank term applies the
+    limit to every term.
+
+    Raises:
+        SeatLimitError if the file cannot be read or a row is malformed
+    """
+    limits: SeatLimits = SeatLimits(default)
+    try:
+        with open(file_path, newline="", encoding="utf-8") as f:
+            for line_number, row in enumerate(csv.DictReader(f), start=2):
+                try:
+                    limits.set(row["course"].strip(), int(row["seats"]), (row.get("term") or "").strip())
+                except (KeyError, TypeError, ValueError, AttributeError):
+                    raise SeatLimitError(f"{Path(file_path).name} line {line_number}: expected course, term and seats columns")
+    except OSError as e:
+        raise SeatLimitError(f"Cannot read seat limits: {e}")
+    return limits
+
+
+@dataclass
+class CohortSchedule:
+    """
+    Result of scheduling a cohort. plans are in Planner.find_best_schedule's shape, padded to whole academic years so
+    they can be exported, and are held as PlanMaps records when the scheduler was given a CourseTable; unplaced lists
+    each student's remaining courses that found no seat or term.
+    """
+    plans: MutableMapping[str, dict[str, list[dict[str, str]]]] = field(default_factory=dict)
+    unplaced: dict[str, list[str]] = field(default_factory=dict)
+    seats_used: Counter = field(default_factory=Counter)
+
+
+class _StudentState:
+    __slots__ = ("name", "remaining", "done", "statuses", "placed")
+
+    def __init__(self, name: str, progress: dict[str, dict[str, str]], order: dict[str, int]):
+        self.name: str = name
+        self.statuses: dict[str, str] = {course: entry["status"] for course, entry in progress.items()}
+        # remaining courses in the catalog's candidate order, so earlier links of a chain are seated first
+        self.remaining: list[str] = sorted(
+            (course for course, status in self.statuses.items() if status != "complete"),
+            key=lambda course: (order.get(course, -1), course)
+        )
+        # course -> rank of the term it is finished in; completed and current courses count as already done
+        self.done: dict[str, int] = {course: -1 for course, status in self.statuses.items() if status in ("complete", "current")}
+        self.placed: list[tuple[int, str]] = []
+
+
+class CohortScheduler:
+    """
+    Assigns every student's remaining courses to terms under per-course, per-term seat limits.
+
+    Terms are filled in order. In each term students are served by fewest remaining courses first (closest to
+    graduation, ties by name), and each takes up to max_courses_per_semester courses that are offered that term, have
+    seats left and whose prerequisites are done in an earlier term. Prerequisite groups follow PlanValidator: met by a
+    completed or current course, a course finished earlier in the plan, or a prerequisite outside the student's
+    progress map. A term costs O(S log S + R) for S students with R remaining courses between them, so thousands of
+    students over hundreds of courses take seconds.
+    """
+
+    def __init__(self, schedule: dict[str, list[str]], prerequisites: dict[str, list[list[str]]], titles: dict[str, str], seat_limits: SeatLimits, max_courses_per_semester: int=4, terms: tuple[str, ...]=DEFAULT_TERMS, compiled: CompiledCatalog | None=None, cancel_token: CancelToken | None=None, table: CourseTable | None=None):
+        self.titles: dict[str, str] = titles
+        self.seat_limits: SeatLimits = seat_limits
+        self.max_courses_per_semester: int = max_courses_per_semester
+        self.terms: tuple[str, ...] = terms
+        self.cancel_token: CancelToken | None = cancel_token
+        self.compiled: CompiledCatalog = compiled or CompiledCatalog(prerequisites, titles, schedule)
+        self.order: dict[str, int] = {course: index for index, course in enumerate(self.compiled.candidate_order)}
+        self.prerequisites: dict[str, list[list[str]]] = prerequisites
+        # optional interning table to keep the cohort's plans as compact records
+        self.table: CourseTable | None = table
+
+    def schedule(self, students: Mapping[str, dict[str, dict[str, str]]]) -> CohortSchedule:
+        """
+        Args:
+            students (Mapping[str, dict[str, dict[str, str]]]): progress map per student name, as returned by
+                parse_pdf; a ProgressMaps is read one student at a time
+
+        Returns:
+            CohortSchedule: a plan per student, unplaced courses and the seats taken per (course, term)
+        """
+        states: list[_StudentState] = [_StudentState(name, progress, self.order) for name, progress in students.items()]
+        seats_left: dict[tuple[str, str], int] = {}
+        result: CohortSchedule = CohortSchedule() if self.table is None else CohortSchedule(plans=PlanMaps(self.table))
+
+        for term in self.terms:
+            check_cancelled(self.cancel_token)
+            rank: int = term_rank(term)
+            queue: list[tuple[int, str, int]] = [
+                (sum(course not in FINAL_COURSES for course in state.remaining), state.name, index)
+                for index, state in enumerate(states) if state.remaining
+            ]
+            heapq.heapify(queue)
+            while queue:
+                _, _, index = heapq.heappop(queue)
+                self._seat_student(states[index], term, rank, seats_left, result.seats_used)
+
+        for state in states:
+            self._place_final_courses(state, seats_left, result.seats_used)
+            result.plans[state.name] = self._plan_for(state)
+            if state.remaining:
+                result.unplaced[state.name] = list(state.remaining)
+        if result.unplaced:
+            logger.warning(f"{len(result.unplaced)} of {len(states)} students have courses that found no seat")
+        return result
+
+    def _seat_student(self, state: _StudentState, term: str, rank: int, seats_left: dict[tuple[str, str], int], seats_used: Counter) -> None:
+        taken: list[str] = []
+        for course in state.remaining:
+            if len(taken) >= self.max_courses_per_semester:
+                break
+            if course in FINAL_COURSES or not self.compiled.is_offered(course, term):
+                continue
+            if not self._prerequisites_met(state, course, rank):
+                continue
+            if not self._take_seat(course, term, seats_left):
+                continue
+            taken.append(course)
+
+        for course in taken:
+            state.remaining.remove(course)
+            state.done[course] = rank
+            state.placed.append((rank, course))
+            seats_used[(course, term)] += 1
+
+    def _prerequisites_met(self, state: _StudentState, course: str, rank: int) -> bool:
+        for group in self.prerequisites.get(course, ()):
+            if group and not any(
+                state.done.get(prereq, rank) < rank or prereq not in state.statuses for prereq in group
+            ):
+                return False
+        return True
+
+    def _take_seat(self, course: str, term: str, seats_left: dict[tuple[str, str], int]) -> bool:
+        key: tuple[str, str] = (course, term)
+        if key not in seats_left:
+            seats: int | None = self.seat_limits.seats(course, term)
+            if seats is None:
+                return True
+            seats_left[key] = seats
+        if seats_left[key] <= 0:
+            return False
+        seats_left[key] -= 1
+        return True
+
+    def _place_final_courses(self, state: _StudentState, seats_left: dict[tuple[str, str], int], seats_used: Counter) -> None:
+        final_rank: int = max((rank for rank, _ in state.placed), default=term_rank(self.terms[0]))
+        for course in [course for course in state.remaining if course in FINAL_COURSES]:
+            term: str = term_code(final_rank)
+            if self._take_seat(course, term, seats_left):
+                state.remaining.remove(course)
+                state.placed.append((final_rank, course))
+                seats_used[(course, term)] += 1
+
+    def _plan_for(self, state: _StudentState) -> OrderedDict[str, list[dict[str, str]]]:
+        """
+        Lay the student's placements out over whole academic years from the first term, as write_plan_workbook needs.
+        """
+        first_rank: int = term_rank(self.terms[0])
+        last_rank: int = max((rank for rank, _ in state.placed), default=first_rank)
+        term_count: int = -(-(last_rank - first_rank + 1) // 3) * 3
+        plan: OrderedDict[str, list[dict[str, str]]] = OrderedDict(
+            (term_code(rank), []) for rank in range(first_rank, first_rank + term_count)
+        )
+        for rank, course in sorted(state.placed, key=lambda placement: placement[0]):
+            plan[term_code(rank)].append({"code": course, "title": self.titles.get(course, "")})
+        return plan
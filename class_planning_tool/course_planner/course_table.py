@@ -0,0 +1,265 @@
+"""
+Compact course model for cohort-scale runs. Course codes and terms are interned once into a CourseTable and referred
+to by small integer IDs; courses, progress maps and plans are stored as __slots__ records over arrays of those IDs
+instead of nested dicts of repeated strings. Adapters convert to and from the dict shapes the parsers, planner and
+writer use, so those keep their signatures; ProgressMaps and PlanMaps hold a whole cohort's progress maps and plans
+as records behind the usual name -> dict mapping, decoding one student at a time.
+"""
+from array import array
+from collections.abc import Iterator, MutableMapping
+import sys
+
+# progress statuses in the order of their encoded value
+STATUSES: tuple[str, ...] = ("complete", "current", "incomplete")
+_STATUS_IDS: dict[str, int] = {status: index for index, status in enumerate(STATUSES)}
+
+# term ID 0 is the blank term of courses not yet taken
+BLANK_TERM: str = ""
+
+
+class CourseRecord:
+    """
+    One catalog course. prerequisites holds groups of course IDs where any one course of a group satisfies it and
+    every group is required, as in the scraper's output; offered holds the IDs of the terms the course runs in, in
+    schedule order.
+    """
+    __slots__ = ("course_id", "code", "title", "prerequisites", "offered")
+
+    def __init__(self, course_id: int, code: str, title: str, prerequisites: tuple[tuple[int, ...], ...]=(), offered: tuple[int, ...]=()):
+        self.course_id: int = course_id
+        self.code: str = code
+        self.title: str = title
+        self.prerequisites: tuple[tuple[int, ...], ...] = prerequisites
+        self.offered: tuple[int, ...] = offered
+
+    def __repr__(self) -> str:
+        return f"CourseRecord({self.course_id}, {self.code!r})"
+
+
+class ProgressRecord:
+    """
+    One student's progress map as parallel arrays of course IDs, status values and term IDs.
+    """
+    __slots__ = ("course_ids", "statuses", "term_ids", "free_electives")
+
+    def __init__(self, course_ids: array, statuses: array, term_ids: array, free_electives: int=0):
+        self.course_ids: array = course_ids
+        self.statuses: array = statuses
+        self.term_ids: array = term_ids
+        self.free_electives: int = free_electives
+
+    def __len__(self) -> int:
+        return len(self.course_ids)
+
+
+class PlanRecord:
+    """
+    One course plan. Term i holds course_ids[offsets[i]:offsets[i + 1]], so terms left empty by the planner are kept.
+    """
+    __slots__ = ("term_ids", "offsets", "course_ids")
+
+    def __init__(self, term_ids: array, offsets: array, course_ids: array):
+        self.term_ids: array = term_ids
+        self.offsets: array = offsets
+        self.course_ids: array = course_ids
+
+    def __len__(self) -> int:
+        return len(self.course_ids)
+
+    def term_courses(self, index: int) -> array:
+        return self.course_ids[self.offsets[index]:self.offsets[index + 1]]
+
+
+class CourseTable:
+    """
+    Interning table shared by every record built from it. Records hold IDs only, so they must be decoded with the
+    table that encoded them. Codes and terms not seen before are added on demand; interning is not thread safe, so
+    build the table before sharing it between threads.
+    """
+
+    def __init__(self):
+        self.codes: list[str] = []
+        self.titles: list[str] = []
+        self.courses: list[CourseRecord] = []
+        self.terms: list[str] = [BLANK_TERM]
+        self._course_ids: dict[str, int] = {}
+        self._term_ids: dict[str, int] = {BLANK_TERM: 0}
+
+    @classmethod
+    def from_catalog(cls, prerequisites: dict[str, list[list[str]]], titles: dict[str, str], offerings: dict[str, list[str]]) -> "CourseTable":
+        """
+        Build a table from the scraper's prerequisites and titles and the schedule parser's offerings.
+        """
+        table: CourseTable = cls()
+        for code, title in titles.items():
+            table.intern(code, title)
+        for code, groups in prerequisites.items():
+            course: CourseRecord = table.courses[table.intern(code)]
+            course.prerequisites = tuple(tuple(table.intern(prereq) for prereq in group) for group in groups)
+        for code, terms in offerings.items():
+            course = table.courses[table.intern(code)]
+            course.offered = tuple(table.intern_term(term) for term in terms)
+        return table
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._course_ids
+
+    def intern(self, code: str, title: str="") -> int:
+        """
+        Return the ID of a course code, adding it to the table if new. A title fills in a missing one.
+        """
+        course_id: int | None = self._course_ids.get(code)
+        if course_id is None:
+            course_id = len(self.codes)
+            code = sys.intern(code)
+            self._course_ids[code] = course_id
+            self.codes.append(code)
+            self.titles.append(title)
+            self.courses.append(CourseRecord(course_id, code, title))
+        elif title and not self.titles[course_id]:
+            self.titles[course_id] = title
+            self.courses[course_id].title = title
+        return course_id
+
+    def intern_term(self, term: str) -> int:
+        term_id: int | None = self._term_ids.get(term)
+        if term_id is None:
+            term_id = len(self.terms)
+            term = sys.intern(term)
+            self._term_ids[term] = term_id
+            self.terms.append(term)
+        return term_id
+
+    def course_id(self, code: str) -> int:
+        """
+        Raises:
+            KeyError: if the code was never interned
+        """
+        return self._course_ids[code]
+
+    def course(self, code: str) -> CourseRecord:
+        return self.courses[self._course_ids[code]]
+
+    def prerequisites(self) -> dict[str, list[list[str]]]:
+        """Prerequisites in the scraper's shape, for courses that have any."""
+        codes: list[str] = self.codes
+        return {
+            course.code: [[codes[prereq] for prereq in group] for group in course.prerequisites]
+            for course in self.courses if course.prerequisites
+        }
+
+    def offerings(self) -> dict[str, list[str]]:
+        """Offerings in the schedule parser's shape, with each course's terms in schedule order."""
+        return {
+            course.code: [self.terms[term_id] for term_id in course.offered]
+            for course in self.courses if course.offered
+        }
+
+    def title_map(self) -> dict[str, str]:
+        return {code: title for code, title in zip(self.codes, self.titles) if title}
+
+    def encode_progress(self, progress: dict[str, dict[str, str]], free_electives: int=0) -> ProgressRecord:
+        """
+        Encode a progress map as returned by parse_pdf or parse_progress_json.
+
+        Raises:
+            KeyError: if a status is not one of STATUSES
+        """
+        course_ids: array = array("I")
+        statuses: array = array("B")
+        term_ids: array = array("H")
+        for code, entry in progress.items():
+            course_ids.append(self.intern(code))
+            statuses.append(_STATUS_IDS[entry["status"]])
+            term_ids.append(self.intern_term(entry.get("term", BLANK_TERM)))
+        return ProgressRecord(course_ids, statuses, term_ids, free_electives)
+
+    def decode_progress(self, record: ProgressRecord) -> tuple[dict[str, dict[str, str]], int]:
+        """
+        Returns:
+            (progress map, free elective count), the shape parse_pdf returns
+        """
+        progress: dict[str, dict[str, str]] = {
+            self.codes[course_id]: {"status": STATUSES[status], "term": self.terms[term_id]}
+            for course_id, status, term_id in zip(record.course_ids, record.statuses, record.term_ids)
+        }
+        return progress, record.free_electives
+
+    def encode_plan(self, plan: dict[str, list[dict[str, str]]]) -> PlanRecord:
+        """
+        Encode a plan as returned by Planner.find_best_schedule.
+        """
+        term_ids: array = array("H")
+        offsets: array = array("I", [0])
+        course_ids: array = array("I")
+        for term, courses in plan.items():
+            term_ids.append(self.intern_term(term))
+            course_ids.extend(self.intern(course["code"], course.get("title", "")) for course in courses)
+            offsets.append(len(course_ids))
+        return PlanRecord(term_ids, offsets, course_ids)
+
+    def decode_plan(self, record: PlanRecord) -> dict[str, list[dict[str, str]]]:
+        """
+        Returns:
+            the plan in Planner.find_best_schedule's shape, ready for write_plan_workbook
+        """
+        return {
+            self.terms[term_id]: [
+                {"code": self.codes[course_id], "title": self.titles[course_id]} for course_id in record.term_courses(index)
+            ]
+            for index, term_id in enumerate(record.term_ids)
+        }
+
+
+class ProgressMaps(MutableMapping):
+    """
+    Student name -> progress map, stored as ProgressRecords of a shared table. Progress maps are encoded when set and
+    decoded on every lookup, so callers see the parse_pdf shape while the cohort is held as records.
+    """
+
+    def __init__(self, table: CourseTable):
+        self.table: CourseTable = table
+        self.records: dict[str, ProgressRecord] = {}
+
+    def __getitem__(self, name: str) -> dict[str, dict[str, str]]:
+        return self.table.decode_progress(self.records[name])[0]
+
+    def __setitem__(self, name: str, progress: dict[str, dict[str, str]]) -> None:
+        self.records[name] = self.table.encode_progress(progress)
+
+    def __delitem__(self, name: str) -> None:
+        del self.records[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+
+class PlanMaps(MutableMapping):
+    """
+    Student name -> plan in Planner.find_best_schedule's shape, stored as PlanRecords of a shared table.
+    """
+
+    def __init__(self, table: CourseTable):
+        self.table: CourseTable = table
+        self.records: dict[str, PlanRecord] = {}
+
+    def __getitem__(self, name: str) -> dict[str, list[dict[str, str]]]:
+        return self.table.decode_plan(self.records[name])
+
+    def __setitem__(self, name: str, plan: dict[str, list[dict[str, str]]]) -> None:
+        self.records[name] = self.table.encode_plan(plan)
+
+    def __delitem__(self, name: str) -> None:
+        del self.records[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
@@ -0,0 +1,232 @@
+"""
+Catalog analysis run before planning. Planner.topological_sort silently drops courses on prerequisite cycles, and
+everything that depends on them, and find_best_schedule raises KeyError when it places a course the catalog has no
+title for. This pass finds both up front, in time linear in the size of the prerequisite graph, so doomed students
+can be reported instead of planned.
+"""
+from dataclasses import dataclass, field
+import hashlib
+import json
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# problem kinds reported for a student
+UNREACHABLE: str = "unreachable"
+UNTITLED: str = "untitled"
+
+# courses Planner.find_best_schedule titles even when the schedule does not offer them: the capstone it places in the
+# final term; electives are recognized by their code starting with "6"
+PLANNER_TITLED: frozenset[str] = frozenset({"CPSC 6000"})
+
+_cache: dict[str, "CatalogDiagnostics"] = {}
+_cache_lock: threading.Lock = threading.Lock()
+# (prerequisites, titles, diagnostics) of the last call, so callers passing the same objects skip even the hashing
+_last: tuple | None = None
+
+
+class CatalogProblemError(ValueError):
+    """
+    Raised when a student cannot be planned because of problems in the catalog, see CatalogDiagnostics.
+    """
+
+
+@dataclass
+class CatalogDiagnostics:
+    """
+    Findings for one catalog.
+
+    Attributes:
+        fingerprint: hash of the prerequisites and titles the diagnostics were made from
+        cycles: each group of courses that require one another, sorted
+        dangling: prerequisites that are not catalog courses, per course listing them
+        unreachable: courses on a cycle or depending on one, which the planner can never order
+    """
+    fingerprint: str
+    cycles: list[list[str]] = field(default_factory=list)
+    dangling: dict[str, list[str]] = field(default_factory=dict)
+    unreachable: frozenset[str] = frozenset()
+    titled: frozenset[str] = frozenset()
+
+    @property
+    def ok(self) -> bool:
+        return not self.cycles
+
+    def untitled_courses(self, progress: dict[str, dict[str, str]], offerings: dict[str, list[str]]) -> tuple[list[str], list[str]]:
+        """
+        Remaining courses without a catalog title, split into those the planner would look a title up for (offered in
+        the schedule, CPSC 6000 and electives) and those it never places, which are harmless.
+
+        Returns:
+            (titled by the planner, never placed), each sorted
+        """
+        needed: list[str] = []
+        unplaced: list[str] = []
+        for course in sorted(course for course, entry in progress.items() if entry["status"] != "complete"):
+            if course in self.titled or course in self.unreachable:
+                continue
+            if offerings.get(course) or course in PLANNER_TITLED or course.startswith("6"):
+                needed.append(course)
+            else:
+                unplaced.append(course)
+        return needed, unplaced
+
+    def student_problems(self, progress: dict[str, dict[str, str]], offerings: dict[str, list[str]]) -> list[str]:
+        """
+        Problems that would stop the planner for this student: a remaining course it cannot order, or one it would
+        place without a catalog title.
+        """
+        untitled: set[str] = set(self.untitled_courses(progress, offerings)[0])
+        problems: list[str] = []
+        for course in sorted(course for course, entry in progress.items() if entry["status"] != "complete"):
+            if course in self.unreachable:
+                problems.append(f"{UNREACHABLE}: {course} is on or after a prerequisite cycle")
+            elif course in untitled:
+                problems.append(f"{UNTITLED}: {course} is not in the course catalog")
+        return problems
+
+    def student_warnings(self, progress: dict[str, dict[str, str]], offerings: dict[str, list[str]]) -> list[str]:
+        """
+        Remaining courses missing from the catalog that the planner leaves unplanned because the schedule never offers
+        them; the student can still be planned.
+        """
+        return [
+            f"{UNTITLED}: {course} is not in the course catalog or the schedule"
+            for course in self.untitled_courses(progress, offerings)[1]
+        ]
+
+    def summary(self) -> str:
+        return (
+            f"{len(self.cycles)} prerequisite cycles, {len(self.unreachable)} unreachable courses, "
+            f"{sum(len(missing) for missing in self.dangling.values())} prerequisites missing from the catalog"
+        )
+
+
+def catalog_fingerprint(prerequisites: dict[str, list[list[str]]], titles: dict[str, str]) -> str:
+    content: str = json.dumps([prerequisites, sorted(titles)], sort_keys=True)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def strongly_connected_components(graph: dict[str, list[str]]) -> list[list[str]]:
+    """
+    Tarjan's algorithm, iterative so deep prerequisite chains cannot hit the recursion limit. Every node of the graph
+    must be a key, including nodes without edges.
+    """
+    index: dict[str, int] = {}
+    lowlink: dict[str, int] = {}
+    on_stack: set[str] = set()
+    stack: list[str] = []
+    components: list[list[str]] = []
+
+    for root in graph:
+        if root in index:
+            continue
+        work: list[tuple[str, int]] = [(root, 0)]
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, edge = work[-1]
+            successors: list[str] = graph[node]
+            if edge < len(successors):
+                work[-1] = (node, edge + 1)
+                successor: str = successors[edge]
+                if successor not in index:
+                    index[successor] = lowlink[successor] = len(index)
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, 0))
+                elif successor in on_stack:
+                    lowlink[node] = min(lowlink[node], index[successor])
+                continue
+
+            work.pop()
+            if work:
+                parent: str = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index[node]:
+                component: list[str] = []
+                while True:
+                    member: str = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
+
+
+def analyze_catalog(prerequisites: dict[str, list[list[str]]], titles: dict[str, str], fingerprint: str="") -> CatalogDiagnostics:
+    """
+    Find prerequisite cycles, prerequisites missing from the catalog and the courses the planner cannot order.
+    """
+    graph: dict[str, list[str]] = {course: [] for course in titles}
+    dangling: dict[str, list[str]] = {}
+    for course, groups in prerequisites.items():
+        graph.setdefault(course, [])
+        for group in groups:
+            for prereq in group:
+                graph.setdefault(prereq, []).append(course)
+                if prereq not in titles and prereq not in prerequisites:
+                    dangling.setdefault(course, []).append(prereq)
+
+    cycles: list[list[str]] = [
+        sorted(component) for component in strongly_connected_components(graph)
+        if len(component) > 1 or component[0] in graph[component[0]]
+    ]
+
+    # everything downstream of a cycle keeps a nonzero in-degree in Kahn's algorithm, so it is never ordered either
+    unreachable: set[str] = {course for cycle in cycles for course in cycle}
+    frontier: list[str] = list(unreachable)
+    while frontier:
+        for dependent in graph[frontier.pop()]:
+            if dependent not in unreachable:
+                unreachable.add(dependent)
+                frontier.append(dependent)
+
+    return CatalogDiagnostics(
+        fingerprint=fingerprint or catalog_fingerprint(prerequisites, titles),
+        cycles=sorted(cycles),
+        dangling=dangling,
+        unreachable=frozenset(unreachable),
+        titled=frozenset(titles),
+    )
+
+
+def diagnose(prerequisites: dict[str, list[list[str]]], titles: dict[str, str]) -> CatalogDiagnostics:
+    """
+    analyze_catalog, cached per catalog fingerprint so repeated runs over the same catalog only hash it. Passing the
+    same dict objects as the previous call returns its result directly, so catalogs must not be modified in place.
+    """
+    global _last
+    last: tuple | None = _last
+    if last is not None and last[0] is prerequisites and last[1] is titles:
+        return last[2]
+
+    fingerprint: str = catalog_fingerprint(prerequisites, titles)
+    with _cache_lock:
+        diagnostics: CatalogDiagnostics | None = _cache.get(fingerprint)
+    if diagnostics is None:
+        diagnostics = analyze_catalog(prerequisites, titles, fingerprint)
+        if not diagnostics.ok:
+            logger.warning(f"Catalog problems: {diagnostics.summary()}; cycles: {diagnostics.cycles}")
+        with _cache_lock:
+            _cache[fingerprint] = diagnostics
+    _last = (prerequisites, titles, diagnostics)
+    return diagnostics
+
+
+def check_student(progress: dict[str, dict[str, str]], prerequisites: dict[str, list[list[str]]], titles: dict[str, str], offerings: dict[str, list[str]]) -> None:
+    """
+    Log the student's harmless catalog gaps as warnings.
+
+    Raises:
+        CatalogProblemError: listing every problem that would stop the planner for this student
+    """
+    diagnostics: CatalogDiagnostics = diagnose(prerequisites, titles)
+    for warning in diagnostics.student_warnings(progress, offerings):
+        logger.warning(warning)
+    problems: list[str] = diagnostics.student_problems(progress, offerings)
+    if problems:
+        raise CatalogProblemError("; ".join(problems))
@@ -1,28 +1,25 @@
 
 from collections import defaultdict, deque, OrderedDict
 
-# Configure the logger
-import os
+from class_planning_tool.course_planner.catalog import CompiledCatalog
+from class_planning_tool.error_handling.cancellation import CancelToken, check_cancelled
+
 import logging
 
-# Redirect log file to the user's home directory
-user_home = os.path.expanduser("~")
-log_file_path = os.path.join(user_home, "course_scheduler.log")
+logger = logging.getLogger(__name__)
 
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    filename=log_file_path,
-    filemode='w'
-)
 
-logger = logging.getLogger(__name__)
 class Planner:
-    def __init__(self, course_progress, free_electives, course_schedule, prerequisites, titles: dict[str, str]):
+    def __init__(self, course_progress, free_electives, course_schedule, prerequisites, titles: dict[str, str], cancel_token: CancelToken | None = None, compiled: CompiledCatalog | None = None):
         
         """Initializes the scheduler with prerequisites of the degree being pursued,
         course progress information obtained from degreeworks,
-        and the semesters that each course is offered (offerings)."""
+        and the semesters that each course is offered (offerings).
+        The optional cancel_token is checked while sorting and between semesters.
+        The optional compiled catalog must be built from the same prerequisites and schedule; it replaces the
+        per-student graph construction and sorts with shared in-degrees, giving the same order."""
+        self.cancel_token = cancel_token
+        self.compiled = compiled
         self.prerequisites = prerequisites
         self.course_progress = course_progress
         self.offerings = course_schedule
@@ -32,9 +29,13 @@ class Planner:
         # Identify required courses based on progress (ignore completed courses)
         self.required_courses = self.get_remaining_courses()
 
-        # Build the course graph and calculate in-degrees
-        self.course_graph = self.build_course_graph(self.prerequisites)
-        self.in_degree = self.calculate_in_degrees(self.course_graph)
+        # Build the course graph and calculate in-degrees, unless shared ones were compiled for this catalog
+        if compiled is None:
+            self.course_graph = self.build_course_graph(self.prerequisites)
+            self.in_degree = self.calculate_in_degrees(self.course_graph)
+        else:
+            self.course_graph = compiled.graph
+            self.in_degree = None
 
     def get_remaining_courses(self):
         """Determines which courses are still required by filtering out completed ones."""
@@ -42,7 +43,7 @@ class Planner:
             course for course, progress in self.course_progress.items()
             if progress["status"] != "complete"
         }
-        logger.info(f"Remaining courses: {remaining}")
+        logger.info("Remaining courses: %s", remaining)
         return remaining
 
     def build_course_graph(self, prerequisites):
@@ -57,7 +58,7 @@ class Planner:
                 for prereq in prereq_group:
                     graph[prereq].append(course)
 
-        logger.debug(f"Built course graph: {graph}")
+        logger.debug("Built course graph: %s", graph)
         return graph
 
     def calculate_in_degrees(self, graph):
@@ -71,19 +72,23 @@ class Planner:
             for dependent_course in graph[prereq]:
                 in_degree[dependent_course] += 1
 
-        logger.debug(f"Calculated in-degrees: {in_degree}")
+        logger.debug("Calculated in-degrees: %s", in_degree)
         return in_degree
 
     def topological_sort(self):
         """Performs a topological sort on the course graph."""
+        if self.compiled is not None:
+            return self.compiled.order_for(self.required_courses)
+
         zero_in_degree = deque(
             [course for course in self.course_graph if self.in_degree[course] == 0]
         )
         sorted_courses = []
 
         while zero_in_degree:
+            check_cancelled(self.cancel_token)
             course = zero_in_degree.popleft()
-            logger.info(f"Processing course: {course}")
+            logger.info("Processing course: %s", course)
             sorted_courses.append(course)
 
             for dependent_course in self.course_graph[course]:
@@ -91,16 +96,22 @@ class Planner:
                 if self.in_degree[dependent_course] == 0:
                     zero_in_degree.append(dependent_course)
 
-        logger.debug(f"Final sorted courses: {sorted_courses}")
+        logger.debug("Final sorted courses: %s", sorted_courses)
         return sorted_courses
 
     def available_courses_in_semester(self, semester, remaining_courses):
         """Returns a list of courses available in a given semester."""
-        available = [
-            course for course in remaining_courses
-            if semester in self.offerings.get(course, []) and course != "CPSC 6000"
-        ]
-        logger.info(f"Available courses in {semester}: {available}")
+        if self.compiled is not None:
+            available = [
+                course for course in remaining_courses
+                if self.compiled.is_offered(course, semester) and course != "CPSC 6000"
+            ]
+        else:
+            available = [
+                course for course in remaining_courses
+                if semester in self.offerings.get(course, []) and course != "CPSC 6000"
+            ]
+        logger.info("Available courses in %s: %s", semester, available)
         return available
 
     def find_best_schedule(self, max_courses_per_semester=4) -> dict[str, list[dict[str, str]]]:
@@ -127,6 +138,7 @@ class Planner:
         final_semester = None  # Initialize the final_semester variable
 
         for semester in semesters:
+            check_cancelled(self.cancel_token)
             available_courses = self.available_courses_in_semester(semester, remaining_courses)
             semester_courses = []
 
@@ -138,23 +150,23 @@ class Planner:
             if semester_courses:
                 schedule[semester] = semester_courses
                 final_semester = semester  # Update final_semester to the latest one with courses
-                logger.debug(f"Updated final_semester to: {final_semester}")
+                logger.debug("Updated final_semester to: %s", final_semester)
 
             if not remaining_courses:
                 break
 
         # Ensure 'CPSC 6000' is placed in the final semester
-        logger.debug(f"Final semester before placing CPSC 6000: {final_semester}")
+        logger.debug("Final semester before placing CPSC 6000: %s", final_semester)
         # Ensure 'CPSC 6000' is placed in the final semester
-        logger.debug(f"Remaining courses before placing CPSC 6000: {remaining_courses}")
+        logger.debug("Remaining courses before placing CPSC 6000: %s", remaining_courses)
         if "CPSC 6000" in remaining_courses:
             if final_semester not in schedule:
                 schedule[final_semester] = []
             schedule[final_semester].append({"code": "CPSC 6000", "title": self.titles["CPSC 6000"]})
             remaining_courses.remove("CPSC 6000")
-            logger.info(f"CPSC 6000 added to final semester: {final_semester}")
+            logger.info("CPSC 6000 added to final semester: %s", final_semester)
         else:
-            logger.warning(f"CPSC 6000 not found in remaining_courses!")
+            logger.warning("CPSC 6000 not found in remaining_courses!")
 
         # Add valid electives to fill free elective spots
         elective_count = min(self.free_electives, len(valid_electives))
@@ -178,7 +190,7 @@ class Planner:
             schedule[f"FA{last_year}"] = []
 
         if remaining_courses:
-            logger.warning(f"Unable to complete all required courses. Remaining: {remaining_courses}")
+            logger.warning("Unable to complete all required courses. Remaining: %s", remaining_courses)
 
         self.print_schedule(schedule)
         return schedule
@@ -187,4 +199,4 @@ class Planner:
         """Prints the schedule in a user-friendly format."""
         for semester, courses in schedule.items():
             course_names = [course["code"] for course in courses]
-            logger.info(f"{semester}: {', '.join(course_names)}")
+            logger.info("%s: %s", semester, ', '.join(course_names))
@@ -0,0 +1,140 @@
+"""
+Standalone checks of finished course plans against the catalog, for bulk QA of generated plans. Prerequisite and
+offering lookups are indexed once per catalog, so validating a plan is linear in its courses and their prerequisite
+groups.
+"""
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+import re
+
+# violation kinds
+PREREQUISITE: str = "prerequisite"
+OFFERING: str = "offering"
+CAPACITY: str = "capacity"
+DUPLICATE: str = "duplicate"
+COMPLETED: str = "completed"
+UNSCHEDULED: str = "unscheduled"
+TERM: str = "term"
+
+_TERM_PATTERN: re.Pattern = re.compile(r"^(SP|SU|FA)(\d{2})$")
+_SEASON_ORDER: dict[str, int] = {"SP": 0, "SU": 1, "FA": 2}
+
+
+def term_rank(term: str) -> int | None:
+    """
+    Chronological rank of a term code such as 'FA24', or None if the code is not in that format.
+    """
+    match: re.Match | None = _TERM_PATTERN.match(term)
+    if not match:
+        return None
+    return int(match.group(2)) * 3 + _SEASON_ORDER[match.group(1)]
+
+
+def term_code(rank: int) -> str:
+    """
+    Term code for a rank from term_rank, e.g. to name the terms following a plan's last one.
+    """
+    year, season = divmod(rank, 3)
+    return f"{('SP', 'SU', 'FA')[season]}{year:02d}"
+
+
+@dataclass(frozen=True)
+class Violation:
+    """
+    One problem found in a plan. course is empty for term-level problems such as capacity.
+    """
+    kind: str
+    term: str
+    course: str
+    detail: str
+
+    def __str__(self) -> str:
+        location: str = f"{self.term} {self.course}".strip()
+        return f"{self.kind}: {location}: {self.detail}"
+
+
+class PlanValidator:
+    """
+    Checks plans against one catalog and schedule. A plan violates:
+        prerequisite: a course is planned before, or in the same term as, every course of one of its prerequisite groups
+        offering: a course is planned in a term it is not offered in
+        capacity: a term holds more than max_courses_per_semester courses
+        duplicate: a course is planned more than once
+        term: a term code is not in 'FA24' format, so it cannot be ordered
+    and, when the student's progress map is given:
+        completed: a course the student already completed is planned again
+        unscheduled: an incomplete course is not planned
+
+    A prerequisite group counts as met by a course the student completed or is currently taking. Prerequisites that
+    appear in neither the plan nor the progress map are outside the student's program (admission requirements,
+    undergraduate courses) and are assumed met unless assume_untracked_met is False.
+    """
+
+    def __init__(self, prerequisites: dict[str, list[list[str]]], offerings: dict[str, list[str]], max_courses_per_semester: int=4, assume_untracked_met: bool=True):
+        self.prerequisites: dict[str, tuple[tuple[str, ...], ...]] = {
+            course: tuple(tuple(group) for group in groups if group) for course, groups in prerequisites.items()
+        }
+        self.offerings: dict[str, frozenset[str]] = {course: frozenset(terms) for course, terms in offerings.items()}
+        self.max_courses_per_semester: int = max_courses_per_semester
+        self.assume_untracked_met: bool = assume_untracked_met
+
+    def validate(self, plan: dict[str, list[dict[str, str]]], progress: dict[str, dict[str, str]] | None=None) -> list[Violation]:
+        """
+        Args:
+            plan (dict[str, list[dict[str, str]]]): plan as returned by Planner.find_best_schedule
+            progress (dict[str, dict[str, str]]): optional progress map the plan was made from
+
+        Returns:
+            list[Violation]: every violation found, in plan order; empty for a valid plan
+        """
+        progress = progress or {}
+        violations: list[Violation] = []
+        planned: dict[str, int] = {}
+        placements: list[tuple[str, int, str]] = []
+
+        for term, courses in plan.items():
+            rank: int | None = term_rank(term)
+            if rank is None:
+                violations.append(Violation(TERM, term, "", "term code cannot be ordered"))
+                continue
+            if len(courses) > self.max_courses_per_semester:
+                violations.append(Violation(CAPACITY, term, "", f"{len(courses)} courses, limit {self.max_courses_per_semester}"))
+            for course in courses:
+                code: str = course["code"]
+                if code in planned:
+                    violations.append(Violation(DUPLICATE, term, code, "already planned"))
+                    continue
+                planned[code] = rank
+                placements.append((term, rank, code))
+
+        for term, rank, code in placements:
+            if term not in self.offerings.get(code, ()):
+                violations.append(Violation(OFFERING, term, code, "not offered this term"))
+            if progress.get(code, {}).get("status") == "complete":
+                violations.append(Violation(COMPLETED, term, code, "already completed"))
+            for group in self.prerequisites.get(code, ()):
+                if not any(self._prerequisite_met(prereq, rank, planned, progress) for prereq in group):
+                    violations.append(Violation(PREREQUISITE, term, code, f"requires one of {', '.join(group)} first"))
+
+        for code, entry in progress.items():
+            if entry["status"] == "incomplete" and code not in planned:
+                violations.append(Violation(UNSCHEDULED, "", code, "incomplete course not in the plan"))
+        return violations
+
+    def _prerequisite_met(self, prereq: str, rank: int, planned: dict[str, int], progress: dict[str, dict[str, str]]) -> bool:
+        status: str | None = progress.get(prereq, {}).get("status")
+        if status in ("complete", "current"):
+            return True
+        if prereq in planned:
+            return planned[prereq] < rank
+        return self.assume_untracked_met and status is None
+
+    def validate_many(self, plans: Iterable[tuple[str, dict[str, list[dict[str, str]]], dict[str, dict[str, str]] | None]]) -> Iterator[tuple[str, list[Violation]]]:
+        """
+        Validate (name, plan, progress) items lazily, so thousands of plans can be streamed without holding them all.
+
+        Yields:
+            (name, violations) for every item, including valid plans with no violations
+        """
+        for name, plan, progress in plans:
+            yield name, self.validate(plan, progress)
@@ -0,0 +1,36 @@
+import threading
+
+
+class PlanCancelledError(Exception):
+    """
+    Raised from inside a loader or the planner when the run's CancelToken has been cancelled.
+    """
+
+
+class CancelToken:
+    """
+    Thread-safe cancellation flag shared between the thread requesting cancellation (e.g. the dashboard) and the
+    worker running the pipeline. Long running loops call raise_if_cancelled at safe points.
+    """
+
+    def __init__(self):
+        self._event: threading.Event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise PlanCancelledError("Planning was cancelled.")
+
+
+def check_cancelled(cancel_token: CancelToken | None) -> None:
+    """
+    Convenience for functions whose token is optional.
+    """
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
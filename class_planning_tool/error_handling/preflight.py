@@ -0,0 +1,143 @@
+"""
+Pre-flight checks of input files, run before they are handed to PyMuPDF or openpyxl. Only the container structure is
+checked, from a few KB read at each end of the file plus a workbook's central directory, so a mislabeled, empty or
+truncated file is rejected in microseconds rather than after a heavy parser has tried to load it. Passing the checks
+does not guarantee that parsing succeeds.
+"""
+from pathlib import Path
+from re import compile
+import struct
+
+# a PDF header may follow a little leading junk, and %%EOF must appear within the last KB
+PDF_HEADER_WINDOW: int = 1024
+PDF_TRAILER_WINDOW: int = 1024
+
+# read from the end of a workbook to find the zip end of central directory record, which is followed by a comment
+# of up to 64 KB; the tail is read again at full size only when a comment pushes the record further back
+ZIP_TAIL_WINDOW: int = 4096
+ZIP_MAX_COMMENT: int = 65535
+
+_PDF_HEADER = compile(rb"%PDF-\d\.\d")
+_STARTXREF = compile(rb"startxref\s+(\d+)\s+%%EOF")
+_ZIP_LOCAL_HEADER: bytes = b"PK\x03\x04"
+_ZIP_CENTRAL_HEADER: bytes = b"PK\x01\x02"
+_ZIP_END_RECORD: bytes = b"PK\x05\x06"
+_ZIP_END_SIZE: int = 22
+_ZIP_CENTRAL_SIZE: int = 46
+_OLE_MAGIC: bytes = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+_WORKSHEET_PART = compile(r"xl/worksheets/[^/]+\.xml")
+
+
+class InputRejectedError(ValueError):
+    """
+    Raised when an input file fails a pre-flight check, with a message saying what is wrong with it.
+    """
+
+
+def check_pdf(head: bytes, tail: bytes, size: int, name: str="PDF") -> None:
+    """
+    Check the start and end of a PDF.
+
+    Args:
+        head (bytes): at least the first PDF_HEADER_WINDOW bytes, or the whole file if it is shorter
+        tail (bytes): at least the last PDF_TRAILER_WINDOW bytes, or the whole file if it is shorter
+        size (int): size of the whole file
+        name (str): how to refer to the file in error messages
+
+    Raises:
+        InputRejectedError: if there is no PDF header, or no cross-reference offset and end of file marker at the end
+    """
+    if not size:
+        raise InputRejectedError(f"{name} is empty.")
+    if not _PDF_HEADER.search(head[:PDF_HEADER_WINDOW]):
+        raise InputRejectedError(f"{name} is not a PDF: no %PDF header at the start of the file.")
+    trailers: list[bytes] = _STARTXREF.findall(tail[-PDF_TRAILER_WINDOW:])
+    if not trailers:
+        raise InputRejectedError(f"{name} is truncated or damaged: no startxref and %%EOF at the end of the file.")
+    if int(trailers[-1]) >= size:
+        raise InputRejectedError(f"{name} is damaged: its cross-reference offset is past the end of the file.")
+
+
+def preflight_pdf(file_path: str) -> None:
+    """
+    Check that a file looks like a complete PDF before opening it, see check_pdf.
+
+    Raises:
+        FileNotFoundError: if the file does not exist
+        InputRejectedError: if the file is not a complete PDF
+    """
+    with open(file_path, "rb") as f:
+        size: int = f.seek(0, 2)
+        f.seek(0)
+        head: bytes = f.read(PDF_HEADER_WINDOW)
+        f.seek(max(0, size - PDF_TRAILER_WINDOW))
+        tail: bytes = f.read()
+    check_pdf(head, tail, size, Path(file_path).name)
+
+
+def preflight_pdf_bytes(content: bytes) -> None:
+    """
+    In-memory counterpart of preflight_pdf, for uploaded audits.
+
+    Raises:
+        InputRejectedError: if content is not a complete PDF
+    """
+    check_pdf(content[:PDF_HEADER_WINDOW], content[-PDF_TRAILER_WINDOW:], len(content), "The uploaded file")
+
+
+def _central_directory_names(directory: bytes) -> list[str]:
+    names: list[str] = []
+    offset: int = 0
+    while offset + _ZIP_CENTRAL_SIZE <= len(directory) and directory[offset:offset + 4] == _ZIP_CENTRAL_HEADER:
+        name_length, extra_length, comment_length = struct.unpack_from("<HHH", directory, offset + 28)
+        start: int = offset + _ZIP_CENTRAL_SIZE
+        names.append(directory[start:start + name_length].decode("utf-8", "replace"))
+        offset = start + name_length + extra_length + comment_length
+    return names
+
+
+def preflight_xlsx(file_path: str) -> None:
+    """
+    Check that a file is a zip archive holding an Excel workbook before opening it: the zip signatures and central
+    directory must be intact, and the directory must list the content types part and at least one worksheet.
+
+    Raises:
+        FileNotFoundError: if the file does not exist
+        InputRejectedError: if the file is not an intact .xlsx workbook
+    """
+    name: str = Path(file_path).name
+    with open(file_path, "rb") as f:
+        size: int = f.seek(0, 2)
+        f.seek(0)
+        magic: bytes = f.read(len(_OLE_MAGIC))
+        if not size:
+            raise InputRejectedError(f"{name} is empty.")
+        if magic == _OLE_MAGIC:
+            raise InputRejectedError(f"{name} is a legacy .xls workbook; save it as .xlsx.")
+        if not magic.startswith(_ZIP_LOCAL_HEADER):
+            raise InputRejectedError(f"{name} is not an Excel workbook: it is not a zip archive.")
+
+        end: int = -1
+        for window in (ZIP_TAIL_WINDOW, _ZIP_END_SIZE + ZIP_MAX_COMMENT):
+            start: int = max(0, size - window)
+            f.seek(start)
+            tail: bytes = f.read()
+            end = tail.rfind(_ZIP_END_RECORD)
+            if end >= 0 or start == 0:
+                break
+        if end < 0 or end + _ZIP_END_SIZE > len(tail):
+            raise InputRejectedError(f"{name} is truncated or damaged: the zip end of central directory is missing.")
+
+        entries, directory_size, directory_offset = struct.unpack_from("<HII", tail, end + 10)
+        if directory_offset == 0xFFFFFFFF:
+            return  # zip64, not produced by Excel for workbooks of any realistic size; left to openpyxl
+        directory_start: int = start + end - directory_size
+        if directory_start < 0 or directory_offset > directory_start:
+            raise InputRejectedError(f"{name} is truncated or damaged: the zip central directory is out of range.")
+        f.seek(directory_start)
+        names: list[str] = _central_directory_names(f.read(directory_size))
+
+    if len(names) != entries:
+        raise InputRejectedError(f"{name} is damaged: its zip central directory lists {len(names)} of {entries} entries.")
+    if "[Content_Types].xml" not in names or not any(_WORKSHEET_PART.fullmatch(part) for part in names):
+        raise InputRejectedError(f"{name} is a zip archive but not an Excel workbook: it has no worksheet parts.")
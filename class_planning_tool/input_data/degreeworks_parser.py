@@ -1,5 +1,11 @@
-import fitz
+from dataclasses import dataclass
 from re import Pattern, compile
+import logging
+
+import fitz
+
+from class_planning_tool.error_handling.cancellation import CancelToken, check_cancelled
+from class_planning_tool.error_handling.preflight import InputRejectedError, preflight_pdf, preflight_pdf_bytes
 
 COMPLETED_COURSE_PATTERN: Pattern = compile(r"([A-Z]{4} \d{4}) ?\n.{0,100}\n[ABCDF] ?\n\d{1} ?\n(Summer|Fall|Spring) (20\d{2})")
 
@@ -9,6 +15,76 @@ INCOMPLETE_COURSE_PATTERN: Pattern = compile(r"Still needed: ?\n1 Class in ([A-Z
 
 ELECTIVE_PATTERN: Pattern = compile(r"Program Electives ?\nStill needed: ?\n([\d]) Credits")
 
+STUDENT_NAME_PATTERN: Pattern = compile(r"Student name ?\n(.+?) ?\n")
+
+STUDENT_ID_PATTERN: Pattern = compile(r"Student ID ?\n(\S+)")
+
+# only this much of the first page is searched for a layout fingerprint
+FINGERPRINT_CHARS: int = 2000
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AuditLayout:
+    """
+    Compiled patterns for one DegreeWorks audit layout. Campuses export audits in different layouts, each recognised by
+    a fingerprint found near the start of the first page.
+
+    Attributes:
+        name: label used in logs
+        fingerprint: searched for in the first FINGERPRINT_CHARS characters of the first page
+        completed: finds completed courses, with groups (course, season, year) such as ("CPSC 6119", "Fall", "2023")
+        current: finds in-progress courses, with the same groups as completed
+        incomplete: finds still-needed courses, with the course as its only group
+        electives: finds the free elective credits still needed, as its first group
+        header_chars: characters of page header at the start of every page, dropped before matching
+    """
+    name: str
+    fingerprint: Pattern
+    completed: Pattern
+    current: Pattern
+    incomplete: Pattern
+    electives: Pattern
+    header_chars: int = 0
+
+
+CLASSIC_LAYOUT: AuditLayout = AuditLayout(
+    name="classic",
+    fingerprint=compile(r"Degree progress"),
+    completed=COMPLETED_COURSE_PATTERN,
+    current=CURRENT_COURSE_PATTERN,
+    incomplete=INCOMPLETE_COURSE_PATTERN,
+    electives=ELECTIVE_PATTERN,
+    header_chars=2,
+)
+
+# checked in order; the first layout whose fingerprint matches is used, and CLASSIC_LAYOUT when none does
+LAYOUTS: list[AuditLayout] = [CLASSIC_LAYOUT]
+
+
+def register_layout(layout: AuditLayout, first: bool=False) -> AuditLayout:
+    """
+    Add a layout to LAYOUTS, before the existing ones if first is set, e.g. when its fingerprint is more specific.
+    """
+    if first:
+        LAYOUTS.insert(0, layout)
+    else:
+        LAYOUTS.append(layout)
+    return layout
+
+
+def detect_layout(first_page: str) -> AuditLayout:
+    """
+    Pick the layout of an audit from the text of its first page, so each audit is matched against a single pattern set.
+    """
+    head: str = first_page[:FINGERPRINT_CHARS]
+    for layout in LAYOUTS:
+        if layout.fingerprint.search(head):
+            return layout
+    logger.debug("No audit layout fingerprint matched, using the classic layout")
+    return CLASSIC_LAYOUT
+
 class DegreeWorksParsingError(Exception):
     """
     Wrapper class for exceptions triggered during DegreeWorks PDF parsing. Provides a general message and access to the underlying exception.
@@ -23,30 +99,71 @@ class DegreeWorksParsingError(Exception):
 
 
 def open_file(file_path: str) -> fitz.Document:
+    """
+    Open a PDF file, rejecting files that are not complete PDFs before PyMuPDF tries to load them, see preflight_pdf.
+    """
     try:
+        preflight_pdf(file_path)
         return fitz.Document(file_path)
+    except InputRejectedError as e:
+        raise DegreeWorksParsingError("Not a usable PDF file", e)
     except (TypeError, FileNotFoundError, fitz.FileDataError, fitz.EmptyFileError, ValueError) as e:
         raise DegreeWorksParsingError("Could not open or read PDF file", e)
 
 
-def extract_text(doc: fitz.Document) -> str:
-    result: str = "\n".join([doc.load_page(i).get_textpage().extractText()[2:] for i in range(len(doc))]) # reason for excluding first two lines is the header
+def open_stream(content: bytes) -> fitz.Document:
+    """
+    Open a PDF held in memory, such as an uploaded audit, without writing it to disk first.
+    """
+    try:
+        preflight_pdf_bytes(content)
+        return fitz.Document(stream=content, filetype="pdf")
+    except InputRejectedError as e:
+        raise DegreeWorksParsingError("Not a usable PDF file", e)
+    except (TypeError, fitz.FileDataError, fitz.EmptyFileError, ValueError) as e:
+        raise DegreeWorksParsingError("Could not read PDF content", e)
+
+
+def read_audit(doc: fitz.Document, cancel_token: CancelToken | None=None, layout: AuditLayout | None=None) -> tuple[str, AuditLayout]:
+    """
+    Extract the text of every page with its header removed, detecting the layout from the first page unless given.
+
+    Returns:
+        tuple of the text and the layout it is in
+
+    Raises:
+        DegreeWorksParsingError: if the document has no text
+        PlanCancelledError: if cancel_token is cancelled while reading
+    """
+    pages: list[str] = []
+    for i in range(len(doc)):
+        check_cancelled(cancel_token)
+        page_text: str = doc.load_page(i).get_textpage().extractText()
+        if layout is None:
+            layout = detect_layout(page_text)
+            logger.debug(f"Reading audit in the {layout.name} layout")
+        pages.append(page_text[layout.header_chars:])
+    result: str = "\n".join(pages)
     if not result:
         raise DegreeWorksParsingError("Empty text content from PDF", ValueError("Empty result"))
-    return result
+    return result, layout
+
+
+def extract_text(doc: fitz.Document, cancel_token: CancelToken | None=None, layout: AuditLayout | None=None) -> str:
+    return read_audit(doc, cancel_token, layout)[0]
 
 
-def process_content(text: str) -> tuple[dict[str, dict[str, str]], int]:
+def process_content(text: str, layout: AuditLayout=CLASSIC_LAYOUT) -> tuple[dict[str, dict[str, str]], int]:
     results: dict[str, dict[str, str]] = {}
 
-    completed_courses: list[tuple[str, str, str]] = COMPLETED_COURSE_PATTERN.findall(text)
+    completed_courses: list[tuple[str, str, str]] = layout.completed.findall(text)
     for course in completed_courses:
         results[course[0]] = {
             "status": "complete",
             "term": f"{course[1][:2].upper()}{course[2][2:]}"
         }
 
-    incomplete_courses: list[tuple[str, str, str]] = INCOMPLETE_COURSE_PATTERN.findall(text)
+    incomplete_courses: list[tuple[str, str, str]] = layout.incomplete.findall(text)
     for course in incomplete_courses:
         results[course] = {
             "status": "incomplete",
@@ -54,7 +171,7 @@ def process_content(text: str) -> tuple[dict[str, dict[str, str]], int]:
         }
     # this may pick up some current courses but they will be overridden below anyway
 
-    current_courses: list[tuple[str, str, str]] = CURRENT_COURSE_PATTERN.findall(text)
+    current_courses: list[tuple[str, str, str]] = layout.current.findall(text)
     for course in current_courses:
         results[course[0]] = {
             "status": "current",
@@ -62,25 +179,56 @@ def process_content(text: str) -> tuple[dict[str, dict[str, str]], int]:
         }
     
     free_elective_count: int = 0
-    elective_clause = ELECTIVE_PATTERN.search(text)
+    elective_clause = layout.electives.search(text)
     if elective_clause:
         free_elective_count = int(elective_clause.group(1)) // 3
 
     return results, free_elective_count
 
 
-def parse_pdf(file_path: str) -> tuple[dict[str, dict[str, str]], int]:
+def student_identity(text: str) -> str:
+    """
+    Identify the student an audit belongs to from its first page: "name (ID)", just the name when the ID is redacted
+    (has no digits), or "" when the audit shows neither.
+    """
+    name_match = STUDENT_NAME_PATTERN.search(text[:FINGERPRINT_CHARS])
+    id_match = STUDENT_ID_PATTERN.search(text[:FINGERPRINT_CHARS])
+    name: str = name_match.group(1).strip() if name_match else ""
+    student_id: str = id_match.group(1) if id_match and any(char.isdigit() for char in id_match.group(1)) else ""
+    if name and student_id:
+        return f"{name} ({student_id})"
+    return name or student_id
+
+
+def read_student(file_path: str) -> str:
+    """
+    student_identity of a PDF audit, reading only its first page.
+
+    Raises:
+        DegreeWorksParsingError: if the file cannot be opened as a PDF
+    """
+    doc: fitz.Document = open_file(file_path)
+    try:
+        return student_identity(doc.load_page(0).get_textpage().extractText()) if len(doc) else ""
+    finally:
+        doc.close()
+
+
+def parse_pdf(file_path: str, cancel_token: CancelToken | None=None) -> tuple[dict[str, dict[str, str]], int]:
     """
     Open a PDF, extract course completion data, and return a dictionary representing the student's course progress.
+    The audit layout is detected from the first page, see detect_layout.
     
     Args:
         file_path (str): path to the PDF to open
+        cancel_token (CancelToken): optional token checked between pages
     
     Returns:
         dict[str, dict[str, str]]: dictionary representing course progress.
     
     Raises:
         DegreeWorksParsingError: wrapper for several errors from various functions
+        PlanCancelledError: if cancel_token is cancelled while reading
         
     An example of the progress map structure is
 
@@ -99,5 +247,26 @@ def parse_pdf(file_path: str) -> tuple[dict[str, dict[str, str]], int]:
     
     """
     doc: fitz.Document = open_file(file_path)
-    text: str = extract_text(doc)
-    return process_content(text)
+    try:
+        text, layout = read_audit(doc, cancel_token)
+    finally:
+        doc.close()
+    return process_content(text, layout)
+
+
+def parse_pdf_bytes(content: bytes) -> tuple[dict[str, dict[str, str]], int]:
+    """
+    In-memory counterpart of parse_pdf, see parse_pdf for the result structure.
+
+    Args:
+        content (bytes): raw PDF file content
+
+    Raises:
+        DegreeWorksParsingError: wrapper for several errors from various functions
+    """
+    doc: fitz.Document = open_stream(content)
+    try:
+        text, layout = read_audit(doc)
+    finally:
+        doc.close()
+    return process_content(text, layout)
@@ -4,9 +4,20 @@ from openpyxl import Workbook, load_workbook
 from openpyxl.worksheet.worksheet import Worksheet
 from re import compile
 
+from class_planning_tool.error_handling.cancellation import CancelToken, check_cancelled
+from class_planning_tool.error_handling.preflight import preflight_xlsx
+
 # intends to capture any combo of F/O/D/N with optional commas or spaces, potentially followed by (May) as some of the summer columns have
 COURSE_AVAILABLE_PATTERN = compile(r"^[FODN\s,]+(?:\(May\))?$") 
 
+# delivery mode codes used in the schedule cells, as explained in the sheet's key row
+DELIVERY_MODES: dict[str, str] = {
+    "F": "fixed date and time",
+    "O": "online",
+    "D": "day time",
+    "N": "night time",
+}
+
 
 def get_cutoff_format(semester: str) -> int:
     """
@@ -60,35 +71,101 @@ def populate_column_semester_map(row_values: list[str], cutoff_input: str="") ->
 
 
 
-def extract_sheet_data(sheet: Worksheet, cutoff: str="") -> dict[str, list[str]]:
+def classify_cell(value: str) -> frozenset[str] | None:
     """
-    Extracts a map of course codes to semester identifiers from the course schedule sheet
+    Classify the text of one course/term cell of the schedule.
+
+    Args:
+        value (str): the cell's value as a string
+
+    Returns:
+        frozenset[str] | None: the delivery modes offered (see DELIVERY_MODES), or None if the course is not offered
+    """
+    text: str = value.replace("?", "")  # assumption is made that semesters marked ?? turn out to be offered
+    if not text or len(text) >= 8 or not COURSE_AVAILABLE_PATTERN.findall(text):
+        return None
+    return frozenset(code for code in text.split("(")[0] if code in DELIVERY_MODES)
+
+
+def extract_sheet_modes(sheet: Worksheet, cutoff: str="", cancel_token: CancelToken | None=None) -> dict[str, dict[str, frozenset[str]]]:
+    """
+    Extracts a map of course codes to the semesters they are offered in, and the delivery modes offered in each, from
+    the course schedule sheet. A schedule only holds a handful of distinct cell values, so each distinct value is
+    classified once and looked up afterwards.
 
     Args:
         sheet (Worksheet): openpyxl worksheet object to extract data from
         cutoff (str): optional cutoff semester value if desired
+        cancel_token (CancelToken): optional token checked between rows
 
+    Returns:
+        dict[str, dict[str, frozenset[str]]]: course codes to semester identifiers, in sheet order, to delivery modes
     """
-    col_semester_map: dict[int, str] = {}
-    results: dict[str, list[str]] = {}
+    col_semester_map: dict[str, int] = {}
+    results: dict[str, dict[str, frozenset[str]]] = {}
+    classified: dict[object, frozenset[str] | None] = {}
 
     for row in sheet.iter_rows(min_row=3):
+        check_cancelled(cancel_token)
         course: str = row[0].value
         if not course:
             continue
         if course == "Course":
             col_semester_map = populate_column_semester_map([str(cell.value) for cell in row], cutoff_input=cutoff)
             continue
-        row_vals: list[str] = [str(cell.value).replace("?", "") if cell else "" for cell in row]  # assumption is made that semesters marked ?? turn out to be offered
-        results[course] = [
-            semester_code for semester_code, index in col_semester_map.items()
-              if row_vals[index] 
-              and len(row_vals[index]) < 8 
-              and COURSE_AVAILABLE_PATTERN.findall(row_vals[index])]
+        offered: dict[str, frozenset[str]] = {}
+        for semester_code, index in col_semester_map.items():
+            value = row[index].value
+            if value not in classified:
+                classified[value] = classify_cell(str(value))
+            modes: frozenset[str] | None = classified[value]
+            if modes is not None:
+                offered[semester_code] = modes
+        results[course] = offered
     return results
 
 
-def get_class_schedule_data(file_path: str, start_semester: str="") -> dict[str, list[str]]:
+def extract_sheet_data(sheet: Worksheet, cutoff: str="", cancel_token: CancelToken | None=None) -> dict[str, list[str]]:
+    """
+    Extracts a map of course codes to semester identifiers from the course schedule sheet
+
+    Args:
+        sheet (Worksheet): openpyxl worksheet object to extract data from
+        cutoff (str): optional cutoff semester value if desired
+        cancel_token (CancelToken): optional token checked between rows
+
+    """
+    return offerings_for_modes(extract_sheet_modes(sheet, cutoff, cancel_token))
+
+
+def offerings_for_modes(schedule_modes: dict[str, dict[str, frozenset[str]]], modes: str="") -> dict[str, list[str]]:
+    """
+    Reduce the output of extract_sheet_modes to the course offerings the planner takes.
+
+    Args:
+        schedule_modes (dict[str, dict[str, frozenset[str]]]): offerings with their delivery modes
+        modes (str): optional delivery mode codes, e.g. "O" or "DN"; if given, only semesters offering the course in
+            one of them are kept
+
+    Returns:
+        dict[str, list[str]]: course codes to semester identifiers
+
+    Raises:
+        ValueError if modes holds a code that is not in DELIVERY_MODES
+    """
+    allowed: set[str] = {code for code in modes.upper() if code not in ", "}
+    unknown: set[str] = allowed - DELIVERY_MODES.keys()
+    if unknown:
+        raise ValueError(f"Unknown delivery modes {', '.join(sorted(unknown))}, expected some of {''.join(DELIVERY_MODES)}.")
+    if not allowed:
+        return {course: list(offered) for course, offered in schedule_modes.items()}
+    return {
+        course: [semester for semester, offered_modes in offered.items() if offered_modes & allowed]
+        for course, offered in schedule_modes.items()
+    }
+
+
+def get_class_schedule_data(file_path: str, start_semester: str="", cancel_token: CancelToken | None=None, modes: str="") -> dict[str, list[str]]:
     """
 
     Open an Excel workbook at the target path, parse the information, and return the schedule data by semester
@@ -96,6 +173,8 @@ def get_class_schedule_data(file_path: str, start_semester: str="") -> dict[str,
     Args:
         file_path (str): path of the Excel workbook to use
         start_semester (str): optional cutoff starting semester in 'SP24' format to ignore semesters before this one
+        cancel_token (CancelToken): optional token checked while loading and between rows
+        modes (str): optional delivery mode codes to plan with, see offerings_for_modes
 
     Returns:
         dict[str, list[str]]: Dictionary representing the course listings by semester.
@@ -103,9 +182,19 @@ def get_class_schedule_data(file_path: str, start_semester: str="") -> dict[str,
     Raises:
         FileNotFoundError if the file does not exist
         IsADirectoryError if the target path is a directory instead of a file
+        InputRejectedError if the file is not an intact .xlsx workbook, checked before it is loaded
         InvalidFileException if the file is not an Excel workbook or is not a file
         PermissionError if the file cannot be opened due to a permissions issue
+        PlanCancelledError if cancel_token is cancelled while loading
+        ValueError if modes holds an unknown delivery mode
     
+    """
+    return offerings_for_modes(get_class_schedule_modes(file_path, start_semester, cancel_token), modes)
+
+
+def get_class_schedule_modes(file_path: str, start_semester: str="", cancel_token: CancelToken | None=None) -> dict[str, dict[str, frozenset[str]]]:
+    """
+    As get_class_schedule_data, but keeping the delivery modes offered in each semester, see extract_sheet_modes.
     """
     path: Path = Path(file_path)
 
@@ -113,6 +202,10 @@ def get_class_schedule_data(file_path: str, start_semester: str="") -> dict[str,
         raise FileNotFoundError(f"The path {file_path} does not exist.")
     if path.is_dir():
         raise IsADirectoryError(f"The path {file_path} is a directory.")
+    preflight_xlsx(file_path)
 
     wb: Workbook = load_workbook(Path(file_path), data_only=True)
-    return extract_sheet_data(wb.active, cutoff=start_semester)  # it is assumed that the wb only has one sheet
+    try:
+        return extract_sheet_modes(wb.active, cutoff=start_semester, cancel_token=cancel_token)  # it is assumed that the wb only has one sheet
+    finally:
+        wb.close()
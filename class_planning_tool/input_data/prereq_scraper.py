@@ -1,26 +1,37 @@
 from urllib import request
 from urllib.error import HTTPError, URLError
 from re import Pattern, compile
+from pathlib import Path
 
 from bs4 import BeautifulSoup, ResultSet, Tag
 
+from class_planning_tool.error_handling.cancellation import CancelToken, check_cancelled
+
 
 COURSE_CODE_PATTERN: Pattern = compile(r"\b[A-Z]{4}\s*\d{4}[A-Z]?\b")
 
 class Scraper:
-    def __init__(self, url="https://catalog.columbusstate.edu/course-descriptions/cpsc/"):
+    def __init__(self, url="https://catalog.columbusstate.edu/course-descriptions/cpsc/", cancel_token: CancelToken | None=None):
         """
         Create a new Scraper, which will also initiate the request and retrieve the course content
 
         Raises:
             HTTPError or URLError (from retrieve function) if the webpage request fails
+            PlanCancelledError if cancel_token is cancelled while parsing
         """
         content: str = self.retrieve(url)
+        check_cancelled(cancel_token)
         self.title_map: dict[str, str] = {}
-        self.prerequisites = self.extract_information(BeautifulSoup(content, "html.parser"))
+        self.prerequisites = self.extract_information(BeautifulSoup(content, "html.parser"), cancel_token)
         
 
     def retrieve(self, url: str) -> str:
+        """
+        Retrieve the course description page content. A path to a saved copy of the page is also accepted, which allows
+        headless batch runs to work from a local catalog snapshot.
+        """
+        if not url.startswith(("http://", "https://")) and Path(url).is_file():
+            return Path(url).read_text(encoding="utf-8", errors="ignore").replace("\xa0", " ")
         resp = request.urlopen(request.Request(url, method="GET"), timeout=5)
         if resp.status != 200:
             raise HTTPError(url, resp.status, "Non-200 response received from request, could not retrieve prerequisites.")
@@ -51,7 +62,7 @@ class Scraper:
         return self.title_map[course_code] if course_code in self.title_map else "Unknown"
 
 
-    def extract_information(self, soup: BeautifulSoup) -> dict[str, list[list[str]]]:
+    def extract_information(self, soup: BeautifulSoup, cancel_token: CancelToken | None=None) -> dict[str, list[list[str]]]:
         """
         Locate any instances of courseblock in the soup and construct a map of course codes to prerequisite course codes
         """
@@ -59,6 +70,7 @@ class Scraper:
 
         course_blocks: ResultSet[Tag] = soup.find_all(name="div", class_="courseblock")
         for course_block in course_blocks:
+            check_cancelled(cancel_token)
             course_code: str = course_block.find("span", class_="detail-code").find("strong").get_text()
             course_title: str = course_block.find("span", class_="detail-title").find("strong").get_text()
 
@@ -0,0 +1,70 @@
+import json
+from pathlib import Path
+
+_VALID_STATUSES: tuple[str, ...] = ("complete", "current", "incomplete")
+
+
+class ProgressFileError(Exception):
+    """
+    Raised when a progress JSON file cannot be read or does not have the expected structure.
+    """
+
+
+def parse_progress_json(file_path: str) -> tuple[dict[str, dict[str, str]], int]:
+    """
+    Load a previously extracted progress map from a JSON file. This is the same data parse_pdf produces, which lets
+    batch runs re-plan students without the original DegreeWorks PDF.
+
+    Args:
+        file_path (str): path to the JSON file to open
+
+    Returns:
+        tuple[dict[str, dict[str, str]], int]: progress map and free elective count, matching parse_pdf
+
+    Raises:
+        ProgressFileError: if the file cannot be read or is malformed
+
+    The expected file structure is
+
+    {
+        "progress": {
+            "CPSC 1111": {"status": "complete", "term": "SU24"},
+            "CPSC 3333": {"status": "incomplete", "term": ""}
+        },
+        "free_electives": 1
+    }
+    """
+    try:
+        with open(Path(file_path), "r", encoding="utf-8") as f:
+            content = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ProgressFileError(f"Could not read progress file {file_path}: {e}") from e
+    return validate_progress_content(content)
+
+
+def validate_progress_content(content: object) -> tuple[dict[str, dict[str, str]], int]:
+    """
+    Check a decoded progress document and return it in the parse_pdf result shape.
+
+    Args:
+        content (object): decoded JSON document
+
+    Returns:
+        tuple[dict[str, dict[str, str]], int]: progress map and free elective count
+
+    Raises:
+        ProgressFileError: if the document does not have the expected structure
+    """
+    if not isinstance(content, dict) or not isinstance(content.get("progress"), dict):
+        raise ProgressFileError("Progress document must be an object with a 'progress' map.")
+
+    progress: dict[str, dict[str, str]] = {}
+    for course, entry in content["progress"].items():
+        if not isinstance(entry, dict) or entry.get("status") not in _VALID_STATUSES:
+            raise ProgressFileError(f"Invalid progress entry for {course}: {entry}")
+        progress[course] = {"status": entry["status"], "term": str(entry.get("term", ""))}
+
+    free_electives = content.get("free_electives", 0)
+    if not isinstance(free_electives, int) or free_electives < 0:
+        raise ProgressFileError(f"Invalid free elective count: {free_electives}")
+    return progress, free_electives
@@ -0,0 +1,127 @@
+"""
+Logging shared by every module. Modules only create loggers with logging.getLogger(__name__); the entry points call
+setup_logging once. Log calls then just put the record on a queue, and a background listener thread writes it to
+this run's own rotating log file, so file I/O never happens on the planner's or the parsers' threads and concurrent
+runs never write to the same file.
+
+The queue is a multiprocessing queue, so batch workers started by fork log through the same listener. Workers started
+by spawn (see run_batch's max_tasks_per_child) only have Python's default warning output.
+"""
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+import logging
+import multiprocessing
+import os
+
+LOG_DIR: str = os.path.join(os.path.expanduser("~"), "course_scheduler_logs")
+LOG_FORMAT: str = "%(asctime)s - %(processName)s - %(name)s - %(levelname)s - %(message)s"
+
+# each run's file rotates at MAX_LOG_BYTES keeping LOG_BACKUPS old parts, and only the newest KEEP_RUNS runs are kept
+MAX_LOG_BYTES: int = 5 * 1024 * 1024
+LOG_BACKUPS: int = 3
+KEEP_RUNS: int = 20
+
+# subsystem names accepted in level specs, and the logger each one sets
+SUBSYSTEMS: dict[str, str] = {
+    "root": "",
+    "planner": "class_planning_tool.course_planner",
+    "input": "class_planning_tool.input_data",
+    "output": "class_planning_tool.output_generation",
+    "controller": "class_planning_tool.controller",
+    "service": "class_planning_tool.service",
+    "ui": "class_planning_tool.ui",
+}
+
+# the planner logs per course and per semester, which is too much to keep for every student of a batch by default
+DEFAULT_LEVELS: dict[str, int] = {"root": logging.INFO, "planner": logging.WARNING}
+
+# environment variable read for a level spec such as "planner=DEBUG,input=WARNING"
+LEVELS_ENV: str = "CLASS_PLANNER_LOG_LEVELS"
+
+
+def parse_levels(spec: str) -> dict[str, int]:
+    """
+    Parse a comma separated list of subsystem=LEVEL pairs, e.g. "planner=DEBUG,input=WARNING".
+
+    Raises:
+        ValueError: for an unknown subsystem or level
+    """
+    levels: dict[str, int] = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, level_name = item.partition("=")
+        name = name.strip().lower()
+        level = logging.getLevelName(level_name.strip().upper())
+        if name not in SUBSYSTEMS:
+            raise ValueError(f"Unknown log subsystem {name!r}, expected one of {', '.join(SUBSYSTEMS)}")
+        if not isinstance(level, int):
+            raise ValueError(f"Unknown log level {level_name!r} for {name}")
+        levels[name] = level
+    return levels
+
+
+def prune_logs(log_dir: str, keep: int=KEEP_RUNS) -> None:
+    """Delete the files of all but the newest keep runs in log_dir."""
+    runs: dict[str, list[Path]] = {}
+    for path in Path(log_dir).glob("course_scheduler-*.log*"):
+        runs.setdefault(path.name.split(".log")[0], []).append(path)
+    for run in sorted(runs)[:-keep or None]:
+        for path in runs[run]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+class LoggingRun:
+    """
+    Logging configured by setup_logging. stop flushes the queue and restores the loggers as they were.
+    """
+
+    def __init__(self, log_path: str, levels: dict[str, int]):
+        self.log_path: str = log_path
+        self.queue = multiprocessing.get_context().Queue()
+        self.file_handler: RotatingFileHandler = RotatingFileHandler(log_path, maxBytes=MAX_LOG_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8")
+        self.file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        self.queue_handler: QueueHandler = QueueHandler(self.queue)
+        self.listener: QueueListener = QueueListener(self.queue, self.file_handler, respect_handler_level=True)
+
+        self._previous_levels: dict[str, int] = {}
+        root: logging.Logger = logging.getLogger()
+        for name, level in levels.items():
+            logger: logging.Logger = logging.getLogger(SUBSYSTEMS[name])
+            self._previous_levels[SUBSYSTEMS[name]] = logger.level
+            logger.setLevel(level)
+        root.addHandler(self.queue_handler)
+        self.listener.start()
+
+    def stop(self) -> None:
+        logging.getLogger().removeHandler(self.queue_handler)
+        self.listener.stop()
+        self.file_handler.close()
+        self.queue.close()
+        for name, level in self._previous_levels.items():
+            logging.getLogger(name).setLevel(level)
+
+
+def setup_logging(log_dir: str=LOG_DIR, levels: dict[str, int] | None=None) -> LoggingRun:
+    """
+    Send all logging through a queue to a new rotating file for this run in log_dir, pruning old runs.
+
+    Args:
+        log_dir (str): directory for the run's log file, created if missing
+        levels (dict[str, int]): level per subsystem, applied over DEFAULT_LEVELS and the LEVELS_ENV variable
+
+    Returns:
+        LoggingRun: call its stop method before exiting to flush the last records
+
+    Raises:
+        ValueError: if LEVELS_ENV holds an invalid spec
+    """
+    merged: dict[str, int] = {**DEFAULT_LEVELS, **parse_levels(os.environ.get(LEVELS_ENV, "")), **(levels or {})}
+    Path(log_dir).mkdir(parents=True, exist_ok=True)
+    prune_logs(log_dir, KEEP_RUNS - 1)
+    log_path: str = os.path.join(log_dir, f"course_scheduler-{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}.log")
+    run: LoggingRun = LoggingRun(log_path, merged)
+    logging.getLogger(__name__).info("Logging initialized. Log file at: %s", log_path)
+    return run
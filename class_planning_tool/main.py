@@ -15,36 +15,42 @@
 
 import sys
 import os
-import logging
 
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
 sys.path.insert(0, parent_dir)
 
-import ttkbootstrap as ttk
-from class_planning_tool.ui.dashboard import Dashboard
-
 # Configure logging
 def setup_logging():
-    user_home = os.path.expanduser("~")
-    log_file_path = os.path.join(user_home, "course_scheduler.log")
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format="%(asctime)s - %(levelname)s - %(message)s",
-        filename=log_file_path,
-        filemode="w",
-    )
-    logging.info(f"Logging initialized. Log file at: {log_file_path}")
+    """
+    Queue all logging to a rotating file for this run, see logging_config. Subsystem levels can be set with the
+    CLASS_PLANNER_LOG_LEVELS environment variable, e.g. "planner=DEBUG".
+    """
+    from class_planning_tool.logging_config import setup_logging as setup_queued_logging
+
+    return setup_queued_logging()
+
+
+def launch_dashboard():
+    # Tk and the dashboard are imported here rather than at module level so that logging is configured before the
+    # slow GUI imports, and so nothing else importing this module pays for them
+    import ttkbootstrap as ttk
+    from class_planning_tool.ui.dashboard import Dashboard
+
+    root = ttk.Window(themename="superhero")
+    dashboard = Dashboard(root)
+    root.mainloop()
 
 
 if __name__ == "__main__":
-    setup_logging()  
+    logging_run = setup_logging()
 
     current_dir = os.path.dirname(os.path.abspath(__file__))
     root_dir = os.path.dirname(current_dir) 
     sys.path.insert(0, root_dir)
-    root = ttk.Window(themename="superhero")
-    dashboard = Dashboard(root)
-    root.mainloop()
+    try:
+        launch_dashboard()
+    finally:
+        logging_run.stop()
 
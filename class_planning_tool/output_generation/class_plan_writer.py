@@ -1,9 +1,21 @@
-from openpyxl import Workbook
+from openpyxl import Workbook, load_workbook
 from openpyxl.worksheet.worksheet import Worksheet
 from openpyxl.cell.cell import Cell
 from openpyxl.styles import Font, Alignment
 
 from collections import OrderedDict
+from dataclasses import dataclass
+from re import compile
+import logging
+import zipfile
+
+from class_planning_tool.output_generation.plan_diff import PlanDiff, diff_plans, plan_hash
+
+logger = logging.getLogger(__name__)
+
+_SEMESTER_PATTERN = compile(r"^(SP|SU|FA)\d{2}$")
+_FOOTER_PREFIX: str = "Courses: "
+_IDENTIFIER_PATTERN = compile(r"<dc:identifier>([0-9a-f]{64})</dc:identifier>")
 
 _TITLE_FONT: Font = Font(name="Helvetica", size=24)
 _VALUE_FONT: Font = Font(name="Helvetica", size=11)
@@ -80,14 +92,15 @@ def write_semester_block(ws: Worksheet, row_start: int, column_start: int, semes
 
     ws.merge_cells(start_row=row_start+_SEMESTER_CAPACITY+1, start_column=column_start, end_row=row_start+_SEMESTER_CAPACITY+1, end_column=column_start+1)
     footer: Cell = ws.cell(row_start+_SEMESTER_CAPACITY+1, column_start)
-    footer.value = f"Courses: {len(courses)}"
+    footer.value = f"{_FOOTER_PREFIX}{len(courses)}"
     footer.font = _VALUE_FONT_BOLD
     footer.alignment = _CENTER_ALIGNMENT
 
 
 def write_plan_workbook(course_plan: OrderedDict[str, list[dict[str, str]]], book_path: str) -> None:
     """
-    Write the supplied study plan to an Excel sheet.
+    Write the supplied study plan to an Excel sheet. The plan's content hash is stored as the workbook's identifier
+    property, see export_plan.
 
     Args:
         course_plan (OrderedDict[str, list[dict[str, str]]]): course plan to export
@@ -96,8 +109,7 @@ def write_plan_workbook(course_plan: OrderedDict[str, list[dict[str, str]]], boo
     Raises:
         Exception: If the file cannot be written.
     """
-    # Debug print to verify the file path
-    print(f"Attempting to write Excel file to: {book_path}")
+    logger.debug("Attempting to write Excel file to: %s", book_path)
 
     # Validate course plan length
     if len(course_plan.keys()) % 3 != 0:
@@ -107,6 +119,7 @@ def write_plan_workbook(course_plan: OrderedDict[str, list[dict[str, str]]], boo
         )
     
     wb: Workbook = Workbook()
+    wb.properties.identifier = plan_hash(course_plan)
     ws: Worksheet = wb.active
     ws.title = "Course Plan"
     format_sheet(ws)
@@ -126,7 +139,97 @@ def write_plan_workbook(course_plan: OrderedDict[str, list[dict[str, str]]], boo
     # Save workbook to the specified path
     try:
         wb.save(book_path)
-        print(f"Excel file successfully saved at: {book_path}")
+        logger.info("Excel file successfully saved at: %s", book_path)
     except Exception as e:
-        print(f"Failed to save Excel file: {e}")
+        logger.error("Failed to save Excel file: %s", e)
         raise
+    finally:
+        # release the workbook now rather than whenever it is collected, so long batches keep a flat footprint
+        wb.close()
+
+
+def read_plan_hash(book_path: str) -> str:
+    """
+    Read the plan content hash stored by write_plan_workbook straight from the workbook's zip archive, without
+    loading the workbook.
+
+    Returns:
+        str: the hash, or "" if the file is missing or was not written by write_plan_workbook
+    """
+    try:
+        with zipfile.ZipFile(book_path) as archive:
+            match = _IDENTIFIER_PATTERN.search(archive.read("docProps/core.xml").decode("utf-8", "replace"))
+    except (OSError, KeyError, zipfile.BadZipFile):
+        return ""
+    return match.group(1) if match else ""
+
+
+@dataclass
+class ExportResult:
+    """
+    Outcome of export_plan. written is False when the workbook already held the plan. diff compares the workbook's
+    previous plan with the exported one, and is None when there was no previous plan to compare with.
+    """
+    path: str
+    written: bool
+    diff: PlanDiff | None = None
+
+
+def export_plan(course_plan: OrderedDict[str, list[dict[str, str]]], book_path: str) -> ExportResult:
+    """
+    Write the plan as write_plan_workbook does, unless the workbook at book_path already holds a plan with the same
+    content hash, in which case nothing is rendered. When an older plan is replaced, it is read back first so the
+    result reports what moved between the two versions.
+
+    Raises:
+        Exception: If the file cannot be written, as for write_plan_workbook.
+    """
+    previous_hash: str = read_plan_hash(book_path)
+    if previous_hash and previous_hash == plan_hash(course_plan):
+        logger.debug("Plan at %s is unchanged, not rewriting it", book_path)
+        return ExportResult(book_path, False, PlanDiff())
+
+    previous = None
+    if previous_hash:
+        try:
+            previous = read_plan_workbook(book_path)
+        except Exception as e:
+            logger.warning("Could not read the previous plan at %s: %s", book_path, e)
+    write_plan_workbook(course_plan, book_path)
+    return ExportResult(book_path, True, diff_plans(previous, course_plan) if previous is not None else None)
+
+
+def read_plan_workbook(book_path: str) -> OrderedDict[str, list[dict[str, str]]]:
+    """
+    Read a study plan back from a workbook written by write_plan_workbook.
+
+    Args:
+        book_path (str): path of the workbook
+
+    Returns:
+        OrderedDict[str, list[dict[str, str]]]: the plan, in the shape write_plan_workbook accepts
+
+    Raises:
+        FileNotFoundError if the workbook does not exist
+    """
+    wb: Workbook = load_workbook(book_path, read_only=True, data_only=True)
+    try:
+        rows: list[tuple] = list(wb.active.iter_rows(values_only=True))
+    finally:
+        wb.close()
+
+    course_plan: OrderedDict[str, list[dict[str, str]]] = OrderedDict()
+    for row_idx, row in enumerate(rows):
+        for col_idx, value in enumerate(row):
+            if not isinstance(value, str) or not _SEMESTER_PATTERN.match(value):
+                continue
+            courses: list[dict[str, str]] = []
+            for course_row in rows[row_idx+1:]:
+                code = course_row[col_idx] if col_idx < len(course_row) else None
+                if isinstance(code, str) and code.startswith(_FOOTER_PREFIX):
+                    break
+                if code:
+                    title = course_row[col_idx+1] if col_idx + 1 < len(course_row) else None
+                    courses.append({"code": code, "title": title or ""})
+            course_plan[value] = courses
+    return course_plan
@@ -0,0 +1,112 @@
+"""
+Per-course, per-term seat demand for a cohort, aggregated from its plans. Plans are folded into counts one at a time,
+so memory grows with the number of courses and terms, not with the number of students.
+"""
+from collections import Counter
+from pathlib import Path
+from typing import Iterable
+import csv
+
+from class_planning_tool.course_planner.validator import term_rank
+
+
+def _term_sort_key(term: str) -> tuple[int, int, str]:
+    rank: int | None = term_rank(term)
+    return (1, 0, term) if rank is None else (0, rank, term)
+
+
+class DemandForecast:
+    """
+    Running totals of planned seats per (course, term), plus the number of plans added.
+    """
+
+    def __init__(self):
+        self.seats: Counter[tuple[str, str]] = Counter()
+        self.titles: dict[str, str] = {}
+        self.plans: int = 0
+
+    @classmethod
+    def from_plans(cls, plans: Iterable[dict[str, list[dict[str, str]]]]) -> "DemandForecast":
+        """
+        Aggregate any iterable of plans, e.g. a generator reading them one at a time.
+        """
+        forecast: DemandForecast = cls()
+        for plan in plans:
+            forecast.add(plan)
+        return forecast
+
+    def add(self, plan: dict[str, list[dict[str, str]]]) -> None:
+        """Add one plan as returned by Planner.find_best_schedule or read_plan_workbook."""
+        self.add_placements((term, course["code"], course.get("title", "")) for term, courses in plan.items() for course in courses)
+
+    def add_placements(self, placements: Iterable[tuple[str, str, str]]) -> None:
+        """Add one plan given as (term, code, title) placements; placements with a blank code are skipped."""
+        for term, code, title in placements:
+            if not code:
+                continue
+            self.seats[(code, term)] += 1
+            if title and code not in self.titles:
+                self.titles[code] = title
+        self.plans += 1
+
+    def merge(self, other: "DemandForecast") -> None:
+        """Add the totals of another forecast, e.g. one built by a separate worker."""
+        self.seats.update(other.seats)
+        for code, title in other.titles.items():
+            self.titles.setdefault(code, title)
+        self.plans += other.plans
+
+    def terms(self) -> list[str]:
+        """Planned terms in chronological order."""
+        return sorted({term for _, term in self.seats}, key=_term_sort_key)
+
+    def courses(self) -> list[str]:
+        return sorted({code for code, _ in self.seats})
+
+    def demand(self, code: str, term: str) -> int:
+        return self.seats.get((code, term), 0)
+
+    def term_totals(self) -> dict[str, int]:
+        totals: Counter[str] = Counter()
+        for (_, term), seats in self.seats.items():
+            totals[term] += seats
+        return {term: totals[term] for term in self.terms()}
+
+    def rows(self) -> list[list]:
+        """
+        The demand table: a header row, one row per course with seats per term and in total, and a totals row.
+        """
+        terms: list[str] = self.terms()
+        table: list[list] = [["Course", "Title", *terms, "Total"]]
+        for code in self.courses():
+            counts: list[int] = [self.demand(code, term) for term in terms]
+            table.append([code, self.titles.get(code, ""), *counts, sum(counts)])
+        totals: dict[str, int] = self.term_totals()
+        table.append(["Total", f"{self.plans} plans", *totals.values(), sum(totals.values())])
+        return table
+
+
+def write_demand_csv(forecast: DemandForecast, path: str) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(forecast.rows())
+
+
+def write_demand_workbook(forecast: DemandForecast, path: str) -> None:
+    from openpyxl import Workbook
+
+    wb: Workbook = Workbook(write_only=True)
+    ws = wb.create_sheet("Course Demand")
+    ws.freeze_panes = "C2"
+    for row in forecast.rows():
+        ws.append(row)
+    wb.save(path)
+
+
+def write_demand(forecast: DemandForecast, path: str) -> None:
+    """
+    Write the demand table as CSV, or as a workbook when the path ends in .xlsx.
+    """
+    if Path(path).suffix.lower() == ".xlsx":
+        write_demand_workbook(forecast, path)
+    else:
+        write_demand_csv(forecast, path)
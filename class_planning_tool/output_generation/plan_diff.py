@@ -0,0 +1,76 @@
+"""
+Comparison of two versions of a student's plan, and the content hash that identifies a plan, used to skip exporting a
+plan whose workbook is already up to date, see export_plan.
+"""
+from dataclasses import dataclass, field
+import hashlib
+import json
+
+
+def plan_hash(course_plan: dict[str, list[dict[str, str]]]) -> str:
+    """
+    Hash everything a plan's workbook shows: the terms in order and each term's course codes and titles in order.
+    """
+    content: list = [
+        [term, [[course["code"], course.get("title") or ""] for course in courses]]
+        for term, courses in course_plan.items()
+    ]
+    return hashlib.sha256(json.dumps(content).encode("utf-8")).hexdigest()
+
+
+def _course_terms(course_plan: dict[str, list[dict[str, str]]]) -> dict[str, str]:
+    return {course["code"]: term for term, courses in course_plan.items() for course in courses}
+
+
+@dataclass
+class PlanDiff:
+    """
+    Differences from an old plan to a new one. Terms are added or removed when they appear in only one plan, and
+    changed when both have them with different courses. moved maps each course planned in both to its (old, new) terms
+    when those differ; added and removed map courses in only one plan to their term.
+    """
+    terms_added: list[str] = field(default_factory=list)
+    terms_removed: list[str] = field(default_factory=list)
+    terms_changed: list[str] = field(default_factory=list)
+    moved: dict[str, tuple[str, str]] = field(default_factory=dict)
+    added: dict[str, str] = field(default_factory=dict)
+    removed: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def unchanged(self) -> bool:
+        return not (self.terms_added or self.terms_removed or self.terms_changed or self.moved or self.added or self.removed)
+
+    def summary(self) -> list[str]:
+        """One line per course that moved, was added or was removed, then per term added or removed."""
+        lines: list[str] = [f"{course}: {old} -> {new}" for course, (old, new) in self.moved.items()]
+        lines.extend(f"{course}: added in {term}" for course, term in self.added.items())
+        lines.extend(f"{course}: removed from {term}" for course, term in self.removed.items())
+        lines.extend(f"term {term} added" for term in self.terms_added)
+        lines.extend(f"term {term} removed" for term in self.terms_removed)
+        return lines
+
+
+def diff_plans(old: dict[str, list[dict[str, str]]], new: dict[str, list[dict[str, str]]]) -> PlanDiff:
+    """
+    Compare two plans, e.g. a student's exported plan and the plan regenerated after a progress change.
+
+    Returns:
+        PlanDiff: the differences, in the new plan's term order where both plans have a course or term
+    """
+    diff: PlanDiff = PlanDiff(
+        terms_added=[term for term in new if term not in old],
+        terms_removed=[term for term in old if term not in new],
+        terms_changed=[
+            term for term in new
+            if term in old and [course["code"] for course in old[term]] != [course["code"] for course in new[term]]
+        ],
+    )
+    old_terms: dict[str, str] = _course_terms(old)
+    new_terms: dict[str, str] = _course_terms(new)
+    for course, term in new_terms.items():
+        if course not in old_terms:
+            diff.added[course] = term
+        elif old_terms[course] != term:
+            diff.moved[course] = (old_terms[course], term)
+    diff.removed = {course: term for course, term in old_terms.items() if course not in new_terms}
+    return diff
@@ -0,0 +1,169 @@
+"""
+Persistent local store of generated plans in SQLite, so reports can query past plans without regenerating or
+reparsing them. Each student has one current plan; saving a new plan for a student replaces the old one.
+"""
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Iterable
+import os
+import sqlite3
+
+from class_planning_tool.course_planner.validator import term_rank
+
+DEFAULT_STORE_PATH: str = os.path.join(os.path.expanduser("~"), "course_plans.db")
+
+# environment variable overriding DEFAULT_STORE_PATH for callers that are not given a store path
+STORE_PATH_ENV: str = "CLASS_PLANNER_STORE"
+
+
+def default_store_path() -> str:
+    return os.environ.get(STORE_PATH_ENV) or DEFAULT_STORE_PATH
+
+_SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS plans (
+    id INTEGER PRIMARY KEY,
+    student TEXT NOT NULL UNIQUE,
+    source TEXT NOT NULL DEFAULT '',
+    created_at TEXT NOT NULL,
+    final_term TEXT,
+    final_rank INTEGER
+);
+CREATE TABLE IF NOT EXISTS placements (
+    plan_id INTEGER NOT NULL REFERENCES plans(id) ON DELETE CASCADE,
+    term TEXT NOT NULL,
+    term_rank INTEGER,
+    position INTEGER NOT NULL,
+    course TEXT NOT NULL,
+    title TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS placements_course_term ON placements (course, term);
+CREATE INDEX IF NOT EXISTS placements_term ON placements (term);
+CREATE INDEX IF NOT EXISTS placements_plan ON placements (plan_id);
+CREATE INDEX IF NOT EXISTS plans_final_rank ON plans (final_rank);
+"""
+
+
+def plan_placements(course_plan: dict[str, list[dict[str, str]]]) -> list[tuple[str, str, str]]:
+    """
+    Flatten a plan into (term, code, title) placements, with (term, "", "") standing for a term left empty.
+    """
+    placements: list[tuple[str, str, str]] = []
+    for term, courses in course_plan.items():
+        if not courses:
+            placements.append((term, "", ""))
+        placements.extend((term, course["code"], course.get("title", "")) for course in courses)
+    return placements
+
+
+class PlanStore:
+    """
+    SQLite-backed plan store. Plans are stored as one row per (term, course) placement, with terms that were left empty
+    kept as a placement with a blank course so the plan reads back with the same terms. Use as a context manager, or
+    call close.
+    """
+
+    def __init__(self, path: str=DEFAULT_STORE_PATH):
+        self.path: str = path
+        self.connection: sqlite3.Connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(_SCHEMA)
+
+    def __enter__(self) -> "PlanStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def save_plan(self, student: str, course_plan: dict[str, list[dict[str, str]]], source: str="") -> None:
+        self.save_plans([(student, course_plan)], source)
+
+    def save_plans(self, plans: Iterable[tuple[str, dict[str, list[dict[str, str]]]]], source: str="") -> int:
+        """
+        Save many (student, plan) pairs in a single transaction.
+
+        Returns:
+            int: number of plans saved
+        """
+        return self.save_placements(((student, plan_placements(plan)) for student, plan in plans), source)
+
+    def save_placements(self, plans: Iterable[tuple[str, list[tuple[str, str, str]]]], source: str="") -> int:
+        """
+        Save many (student, placements) plans, as made by plan_placements, in a single transaction.
+
+        Returns:
+            int: number of plans saved
+        """
+        created_at: str = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        count: int = 0
+        with self.connection:
+            for student, placements in plans:
+                ranked: list[tuple[str, int | None, int, str, str]] = [
+                    (term, term_rank(term), position, code, title) for position, (term, code, title) in enumerate(placements)
+                ]
+                final: tuple | None = max((row for row in ranked if row[3] and row[1] is not None), key=lambda row: row[1], default=None)
+                self.connection.execute("DELETE FROM plans WHERE student = ?", (student,))
+                plan_id: int = self.connection.execute(
+                    "INSERT INTO plans (student, source, created_at, final_term, final_rank) VALUES (?, ?, ?, ?, ?)",
+                    (student, source, created_at, final[0] if final else None, final[1] if final else None)
+                ).lastrowid
+                self.connection.executemany(
+                    "INSERT INTO placements (plan_id, term, term_rank, position, course, title) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(plan_id, *row) for row in ranked]
+                )
+                count += 1
+        return count
+
+    def get_plan(self, student: str) -> OrderedDict[str, list[dict[str, str]]] | None:
+        """
+        Returns:
+            the student's stored plan in Planner.find_best_schedule's shape, or None if there is none
+        """
+        plan_row = self.connection.execute("SELECT id FROM plans WHERE student = ?", (student,)).fetchone()
+        if plan_row is None:
+            return None
+        rows = self.connection.execute(
+            "SELECT term, course, title FROM placements WHERE plan_id = ? ORDER BY term_rank, position", plan_row
+        )
+        course_plan: OrderedDict[str, list[dict[str, str]]] = OrderedDict()
+        for term, course, title in rows:
+            courses: list[dict[str, str]] = course_plan.setdefault(term, [])
+            if course:
+                courses.append({"code": course, "title": title})
+        return course_plan
+
+    def students(self) -> list[str]:
+        return [row[0] for row in self.connection.execute("SELECT student FROM plans ORDER BY student")]
+
+    def delete_plan(self, student: str) -> bool:
+        with self.connection:
+            return self.connection.execute("DELETE FROM plans WHERE student = ?", (student,)).rowcount > 0
+
+    def students_taking(self, course: str, term: str) -> list[str]:
+        """Students whose plan has the course in the term."""
+        return [row[0] for row in self.connection.execute(
+            "SELECT p.student FROM placements c JOIN plans p ON p.id = c.plan_id "
+            "WHERE c.course = ? AND c.term = ? ORDER BY p.student", (course, term)
+        )]
+
+    def students_graduating_by(self, term: str) -> list[str]:
+        """
+        Students whose plan's last course is in or before the term.
+
+        Raises:
+            ValueError: if the term is not in 'FA24' format
+        """
+        rank: int | None = term_rank(term)
+        if rank is None:
+            raise ValueError(f"Invalid term {term!r}, expected a code such as 'FA24'")
+        return [row[0] for row in self.connection.execute(
+            "SELECT student FROM plans WHERE final_rank <= ? ORDER BY student", (rank,)
+        )]
+
+    def course_demand(self, term: str) -> dict[str, int]:
+        """Planned seats per course in the term."""
+        return dict(self.connection.execute(
+            "SELECT course, COUNT(*) FROM placements WHERE term = ? AND course != '' GROUP BY course ORDER BY course", (term,)
+        ))
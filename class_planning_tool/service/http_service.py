@@ -0,0 +1,226 @@
+"""
+Local HTTP planning service. The schedule and catalog are loaded once at startup and handed to a bounded process pool;
+each request uploads one student's audit (DegreeWorks PDF or progress JSON) and receives the plan as JSON or xlsx.
+
+Endpoints:
+    GET  /health                 service status and current load
+    POST /plan?format=json|xlsx  body is the audit, with Content-Type application/pdf or application/json
+
+Requests beyond the pool's worker and queue capacity are rejected with 503 and a Retry-After header rather than
+piling up in memory. A broken worker pool also answers 503, and any other unexpected failure 500.
+"""
+import json
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from urllib.parse import parse_qs, urlparse
+
+from class_planning_tool.controller.batch_runner import init_worker, plan_progress
+
+MAX_UPLOAD_BYTES: int = 10 * 1024 * 1024
+RETRY_AFTER_SECONDS: int = 1
+
+_XLSX_CONTENT_TYPE: str = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+logger = logging.getLogger(__name__)
+
+
+class UploadError(Exception):
+    """
+    Raised by the worker when an uploaded audit cannot be parsed. Carries a plain message so it pickles cleanly.
+    """
+
+
+class PlanningFailedError(Exception):
+    """
+    Raised by the worker when a parsed audit cannot be planned or exported.
+    """
+
+
+def plan_upload(content: bytes, content_type: str, output_format: str) -> bytes:
+    """
+    Parse an uploaded audit, plan it against the pool's shared inputs and render the result. Runs in a pool worker.
+
+    Args:
+        content (bytes): request body
+        content_type (str): application/pdf or application/json
+        output_format (str): json or xlsx
+
+    Returns:
+        bytes: rendered plan
+
+    Raises:
+        UploadError: if the upload cannot be parsed
+        PlanningFailedError: if planning or rendering fails
+    """
+    try:
+        if content_type == "application/pdf":
+            from class_planning_tool.input_data.degreeworks_parser import parse_pdf_bytes
+
+            degree_data, free_electives = parse_pdf_bytes(content)
+        else:
+            from class_planning_tool.input_data.progress_json import validate_progress_content
+
+            degree_data, free_electives = validate_progress_content(json.loads(content))
+    except Exception as e:
+        raise UploadError(str(e)) from None
+
+    try:
+        course_plan = plan_progress(degree_data, free_electives)
+        if output_format == "xlsx":
+            from class_planning_tool.output_generation.class_plan_writer import write_plan_workbook
+
+            buffer: BytesIO = BytesIO()
+            write_plan_workbook(course_plan, buffer)
+            return buffer.getvalue()
+        return json.dumps({"plan": course_plan, "free_electives": free_electives}).encode("utf-8")
+    except Exception as e:
+        raise PlanningFailedError(repr(e)) from None
+
+
+class PlanningService:
+    """
+    Owns the worker pool and the admission limit. At most workers + max_queue plans are accepted at once; the rest are
+    refused immediately so that clients can back off.
+    """
+
+    def __init__(self, schedule_data: dict[str, list[str]], prereq_data: dict[str, list[list[str]]], title_map: dict[str, str], workers: int=2, max_queue: int=8):
+        self.capacity: int = workers + max_queue
+        self._slots: threading.BoundedSemaphore = threading.BoundedSemaphore(self.capacity)
+        self._in_flight: int = 0
+        self._lock: threading.Lock = threading.Lock()
+        self._pool: ProcessPoolExecutor = ProcessPoolExecutor(
+            max_workers=workers, initializer=init_worker, initargs=(schedule_data, prereq_data, title_map)
+        )
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def try_acquire(self) -> bool:
+        """
+        Reserve a slot for one plan without waiting. Returns False when the service is at capacity.
+        """
+        if not self._slots.acquire(blocking=False):
+            return False
+        with self._lock:
+            self._in_flight += 1
+        return True
+
+    def release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def plan(self, content: bytes, content_type: str, output_format: str) -> bytes:
+        """
+        Run plan_upload in the pool and wait for it. The caller must hold a slot from try_acquire.
+        """
+        return self._pool.submit(plan_upload, content, content_type, output_format).result()
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(cancel_futures=True)
+
+
+class PlanningRequestHandler(BaseHTTPRequestHandler):
+    server_version = "ClassPlanningService/1.0"
+
+    def do_GET(self):
+        if urlparse(self.path).path != "/health":
+            self.send_json(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+            return
+        service: PlanningService = self.server.service
+        self.send_json(HTTPStatus.OK, {"status": "ok", "in_flight": service.in_flight, "capacity": service.capacity})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/plan":
+            self.send_json(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+            return
+
+        output_format: str = parse_qs(url.query).get("format", ["json"])[0]
+        if output_format not in ("json", "xlsx"):
+            self.send_json(HTTPStatus.BAD_REQUEST, {"error": "format must be json or xlsx"})
+            return
+        content_type: str = self.headers.get("Content-Type", "").split(";")[0].strip()
+        if content_type not in ("application/pdf", "application/json"):
+            self.send_json(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, {"error": "Upload must be application/pdf or application/json"})
+            return
+        try:
+            length: int = int(self.headers.get("Content-Length") or 0)
+            if length < 0:
+                raise ValueError(length)
+        except ValueError:
+            self.send_json(HTTPStatus.BAD_REQUEST, {"error": "Invalid Content-Length"})
+            return
+        if length == 0 or length > MAX_UPLOAD_BYTES:
+            self.send_json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE if length else HTTPStatus.LENGTH_REQUIRED, {"error": "Invalid upload size"})
+            return
+        content: bytes = self.rfile.read(length)
+
+        service: PlanningService = self.server.service
+        if not service.try_acquire():
+            self.send_json(HTTPStatus.SERVICE_UNAVAILABLE, {"error": "Service busy, retry later"}, {"Retry-After": str(RETRY_AFTER_SECONDS)})
+            return
+        # the slot is released before responding so a client that immediately sends its next request is not refused
+        try:
+            body: bytes = service.plan(content, content_type, output_format)
+        except UploadError as e:
+            error: tuple[HTTPStatus, str] | None = (HTTPStatus.BAD_REQUEST, str(e))
+        except PlanningFailedError as e:
+            error = (HTTPStatus.UNPROCESSABLE_ENTITY, str(e))
+        except BrokenProcessPool as e:
+            logger.error(f"Planning pool is unavailable: {e!r}")
+            error = (HTTPStatus.SERVICE_UNAVAILABLE, "Planning workers are unavailable")
+        except Exception as e:
+            logger.exception(f"Unexpected error while planning: {e!r}")
+            error = (HTTPStatus.INTERNAL_SERVER_ERROR, "Internal error")
+        else:
+            error = None
+        finally:
+            service.release()
+
+        if error:
+            self.send_json(error[0], {"error": error[1]})
+        else:
+            self.send_body(HTTPStatus.OK, body, _XLSX_CONTENT_TYPE if output_format == "xlsx" else "application/json")
+
+    def send_json(self, status: HTTPStatus, content: dict, headers: dict[str, str] | None=None) -> None:
+        self.send_body(status, json.dumps(content).encode("utf-8"), "application/json", headers)
+
+    def send_body(self, status: HTTPStatus, body: bytes, content_type: str, headers: dict[str, str] | None=None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.info("%s - %s", self.address_string(), format % args)
+
+
+class PlanningHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], service: PlanningService):
+        super().__init__(address, PlanningRequestHandler)
+        self.service: PlanningService = service
+
+
+def create_server(host: str, port: int, schedule_file: str, catalog_url: str, workers: int=2, max_queue: int=8, start_semester: str="") -> PlanningHTTPServer:
+    """
+    Load the shared inputs and build a server ready for serve_forever. Port 0 selects a free port.
+
+    Raises:
+        BatchSetupError: if the schedule or catalog cannot be loaded
+    """
+    from class_planning_tool.controller.batch_runner import load_shared_inputs
+
+    shared, _ = load_shared_inputs(schedule_file, catalog_url, start_semester)
+    return PlanningHTTPServer((host, port), PlanningService(*shared, workers=workers, max_queue=max_queue))
@@ -2,18 +2,34 @@ import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 from tkinter import filedialog, messagebox, Toplevel
 import threading
-import time
+import queue
 import re
 from class_planning_tool.controller.class_plan_controller import ClassPlanController
+from class_planning_tool.controller.session import PlanningSession
+from class_planning_tool.controller.progress import CANCELLED, DONE, FAILED, STARTED
+from class_planning_tool.error_handling.cancellation import CancelToken
 from class_planning_tool.error_handling.type_checker import check_file_type
 import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+# how often the Tk main loop checks the worker's progress queue
+POLL_INTERVAL_MS = 100
+
+# pause after the last keystroke in the URL field before the catalog prefetch starts
+URL_PREFETCH_DELAY_MS = 600
 
 class Dashboard:
-    def __init__(self, root):
+    def __init__(self, root, session=None, store_path=None):
         self.root = root
+        # plan store every generated plan is saved to; None uses the controller's default
+        self.store_path = store_path
         self.root.title("Smart Class Planning Tool")
 
-        self.controller = ClassPlanController() 
+        # the session outlives restarts, so the next student reuses the loaded catalog and schedule
+        self.session = session or PlanningSession()
+        self.controller = ClassPlanController(session=self.session)
 
         self.root.geometry("1000x600")
 
@@ -35,6 +51,9 @@ class Dashboard:
         self.study_plan_file_path = None
         self.schedule_file_path = None
         self.course_plan = {} 
+        self.events = queue.Queue()
+        self.cancel_token = None
+        self.loading_window = None
 
         self.update_status()
 
@@ -49,6 +68,10 @@ class Dashboard:
         ttk.Label(parent, text="URL:", bootstyle="info").grid(row=3, column=0, sticky='w', padx=10, pady=10)
         self.url_entry = ttk.Entry(parent, width=40)
         self.url_entry.grid(row=3, column=1, padx=10, pady=10)
+        self.url_prefetch_job = None
+        self.url_entry.bind("<KeyRelease>", self.schedule_catalog_prefetch)
+        self.url_entry.bind("<FocusOut>", self.schedule_catalog_prefetch)
+        self.url_entry.bind("<<Paste>>", self.schedule_catalog_prefetch)
 
     def create_file_upload_row(self, parent, label_text, command, row):
         label = ttk.Label(parent, text=label_text)
@@ -110,6 +133,7 @@ class Dashboard:
             return
         if file_path and check_file_type(file_path, [".xlsx", ".xls"]):
             self.schedule_file_path = file_path
+            self.controller.prefetch_schedule(file_path)
             button.config(text="File Uploaded", bootstyle=SUCCESS)
             button.filename_label.config(text=file_path.split('/')[-1])
             messagebox.showinfo("File Selected", "4-Year Schedule File uploaded successfully!",  parent=self.root)
@@ -120,6 +144,21 @@ class Dashboard:
             button.filename_label.config(text="")
         self.update_status()
         
+    def schedule_catalog_prefetch(self, event=None):
+        """
+        Debounce edits to the URL field, then start fetching the catalog in the background so it is usually ready by
+        the time the user submits.
+        """
+        if self.url_prefetch_job is not None:
+            self.root.after_cancel(self.url_prefetch_job)
+        self.url_prefetch_job = self.root.after(URL_PREFETCH_DELAY_MS, self.prefetch_catalog)
+
+    def prefetch_catalog(self):
+        self.url_prefetch_job = None
+        url = self.url_entry.get()
+        if self.is_valid_url(url):
+            self.controller.prefetch_catalog(url)
+
     def submit_files(self):
         url = self.url_entry.get()
         if not self.is_valid_url(url):
@@ -129,78 +168,132 @@ class Dashboard:
         if not (self.degree_file_path and self.schedule_file_path and self.url_entry.get()):
             messagebox.showwarning("Missing Files", "Please upload all required files.",  parent=self.root)
         else:
-            loading_window = Toplevel(self.root)
-            loading_window.title("Processing")
-            loading_window.geometry("300x100")
-            loading_window.attributes('-topmost', 'true')
-            loading_window.update_idletasks()
-            window_width = loading_window.winfo_width()
-            window_height = loading_window.winfo_height()
-            screen_width = loading_window.winfo_screenwidth()
-            screen_height = loading_window.winfo_screenheight()
-
-            x = (screen_width // 2) - (window_width // 2)
-            y = (screen_height // 2) - (window_height // 2)
-            loading_window.geometry(f"{window_width}x{window_height}+{x}+{y}")
-
-            ttk.Label(loading_window, text="Processing files, please wait...", font=("Helvetica", 12)).pack(pady=20)
-            spinner_frame = ttk.Frame(loading_window)
-            spinner_frame.pack()
-            spinner = ttk.Progressbar(spinner_frame, mode='indeterminate', bootstyle=INFO)
-            spinner.pack(pady=10)
-            spinner.start()
-
-            threading.Thread(target=self.process_files, args=(loading_window,), daemon=True).start()
-            
-    def process_files(self, loading_window):
-        degree_data, free_electives = self.controller.process_degreeworks_file(self.degree_file_path)
-
-        schedule_data = self.controller.process_schedule_file(self.schedule_file_path)
-
-        url = self.url_entry.get()
-        prereq_data, title_map = self.controller.process_prerequisites(url)
-
-
-        time.sleep(1)
-
-        loading_window.destroy()
-        
-      
-        if isinstance(degree_data, dict): 
-
-            for widget in self.root.winfo_children():
-                widget.destroy()
+            self.show_loading_window()
+
+            self.events = queue.Queue()
+            self.cancel_token = CancelToken()
+            threading.Thread(target=self.process_files, args=(url, self.events, self.cancel_token), daemon=True).start()
+            self.root.after(POLL_INTERVAL_MS, self.poll_events)
+
+    def show_loading_window(self):
+        self.loading_window = Toplevel(self.root)
+        self.loading_window.title("Processing")
+        self.loading_window.geometry("320x150")
+        self.loading_window.attributes('-topmost', 'true')
+        self.loading_window.protocol("WM_DELETE_WINDOW", self.cancel_processing)
+        self.loading_window.update_idletasks()
+        window_width = self.loading_window.winfo_width()
+        window_height = self.loading_window.winfo_height()
+        screen_width = self.loading_window.winfo_screenwidth()
+        screen_height = self.loading_window.winfo_screenheight()
+
+        x = (screen_width // 2) - (window_width // 2)
+        y = (screen_height // 2) - (window_height // 2)
+        self.loading_window.geometry(f"{window_width}x{window_height}+{x}+{y}")
+
+        self.progress_label = ttk.Label(self.loading_window, text="Processing files, please wait...", font=("Helvetica", 12))
+        self.progress_label.pack(pady=10)
+        self.progress_bar = ttk.Progressbar(self.loading_window, mode='determinate', maximum=100, bootstyle=INFO)
+        self.progress_bar.pack(fill='x', padx=20, pady=5)
+        ttk.Button(self.loading_window, text="Cancel", command=self.cancel_processing, bootstyle=DANGER).pack(pady=5)
+
+    def close_loading_window(self):
+        if self.loading_window is not None:
+            self.loading_window.destroy()
+            self.loading_window = None
+
+    def cancel_processing(self):
+        if self.cancel_token is not None:
+            self.cancel_token.cancel()
+        if self.loading_window is not None:
+            self.progress_label.config(text="Cancelling...")
+
+    def process_files(self, url, events, cancel_token):
+        """
+        Runs on the worker thread. It must not touch any widget; the controller reports every stage, the final plan
+        and any error through the events queue, which poll_events drains on the Tk main loop.
+        """
+        try:
+            self.controller.run_pipeline(
+                self.degree_file_path, self.schedule_file_path, url,
+                events=events, cancel_token=cancel_token, export=False
+            )
+        except Exception:
+            pass  # already reported through the events queue
 
-            self.root.title("Processing Result")
-            self.root.geometry("1000x600")
+    def poll_events(self):
+        """
+        Apply queued progress events on the main loop and reschedule until the run reaches a final event.
+        """
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            self.handle_event(event)
+            if event.terminal:
+                return
+        self.root.after(POLL_INTERVAL_MS, self.poll_events)
+
+    def handle_event(self, event):
+        if event.status == STARTED and self.loading_window is not None:
+            self.progress_label.config(text=f"{event.message}...")
+        elif event.status == DONE:
+            self.close_loading_window()
+            self.course_plan = event.payload
+            self.store_plan()
+            self.show_results()
+        elif event.status == FAILED:
+            self.close_loading_window()
+            messagebox.showerror("Processing Error", f"An error occurred: {event.message}", parent=self.root)
+        elif event.status == CANCELLED:
+            self.close_loading_window()
+            messagebox.showinfo("Cancelled", "Processing was cancelled.", parent=self.root)
+        if self.loading_window is not None:
+            self.progress_bar.config(value=event.fraction * 100)
+
+    def store_plan(self):
+        # keep every generated plan in the local plan store, written off the main loop so the results show at once
+        threading.Thread(target=self.save_plan, args=(self.course_plan, self.degree_file_path), name="plan-store").start()
+
+    def save_plan(self, course_plan, degree_file_path):
+        """
+        Runs on a worker thread and must not touch any widget. The plan is keyed by the student named in the audit, so
+        audits sharing a file name do not replace each other's plans; a store failure must not hide the result.
+        """
+        try:
+            self.controller.store_plan(course_plan, self.controller.audit_student(degree_file_path), self.store_path)
+        except Exception as e:
+            logger.warning(f"Could not save the plan to the plan store: {e}")
 
-            result_text = ttk.Text(self.root, height=30, width=100)
-            result_text.pack(pady=20)
+    def show_results(self):
+        for widget in self.root.winfo_children():
+            widget.destroy()
 
-            self.course_plan = self.controller.get_plan(degree_data, free_electives, schedule_data, prereq_data, title_map)
+        self.root.title("Processing Result")
+        self.root.geometry("1000x600")
 
-            result_text.tag_configure("green_title", foreground="green", font=("Helvetica", 12, "bold"))
+        result_text = ttk.Text(self.root, height=30, width=100)
+        result_text.pack(pady=20)
 
+        result_text.tag_configure("green_title", foreground="green", font=("Helvetica", 12, "bold"))
 
-            result_text.insert('end', "\n\nYour final result:\n\n")
+        result_text.insert('end', "\n\nYour final result:\n\n")
 
-            for semester, courses in self.course_plan.items():
-                result_text.insert("end", f"{semester}\n")
-                if courses:
-                    result_text.insert("end", "\n".join([f"{course['code']} | {course['title']}" for course in courses]))
-                else:
-                    result_text.insert("end", "No courses this semester.")
-                result_text.insert("end", "\n\n")
-            
+        for semester, courses in self.course_plan.items():
+            result_text.insert("end", f"{semester}\n")
+            if courses:
+                result_text.insert("end", "\n".join([f"{course['code']} | {course['title']}" for course in courses]))
+            else:
+                result_text.insert("end", "No courses this semester.")
+            result_text.insert("end", "\n\n")
 
-            result_text.config(state='disabled')
+        result_text.config(state='disabled')
 
-            download_button = ttk.Button(self.root, text="Download Result in Excel File", command=self.download_result, bootstyle=SUCCESS)
-            download_button.pack(pady=10)
-            restart_button = ttk.Button(self.root, text="Restart", command=self.restart_app, bootstyle=DANGER)
-            restart_button.pack(pady=10)
-        else:
-            messagebox.showerror("Processing Error", f"An error occurred: {degree_data}", parent=self.root)  
+        download_button = ttk.Button(self.root, text="Download Result in Excel File", command=self.download_result, bootstyle=SUCCESS)
+        download_button.pack(pady=10)
+        restart_button = ttk.Button(self.root, text="Restart", command=self.restart_app, bootstyle=DANGER)
+        restart_button.pack(pady=10)
 
     def restart_app(self):
         # Destroy the current root window
@@ -208,7 +301,7 @@ class Dashboard:
             widget.destroy()
         
         # Reinitialize the Dashboard UI
-        self.__init__(self.root)
+        self.__init__(self.root, self.session, self.store_path)
 
     def download_result(self):
         
@@ -0,0 +1,81 @@
+import unittest
+import asyncio
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from benchmarks.synthetic import SyntheticCorpus, write_corpus
+from class_planning_tool.controller import session
+from class_planning_tool.controller.async_controller import (
+    AsyncPlanController, AuditError, CatalogError, PlanError, PlanningError, ScheduleError
+)
+from class_planning_tool.course_planner import catalog
+from class_planning_tool.input_data import excel_inputs, prereq_scraper
+
+
+class TestAsyncPlanController(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.root: Path = Path(self.tmp.name)
+        corpus: SyntheticCorpus = write_corpus(self.tmp.name)
+        self.schedule: str = corpus.schedule
+        self.url: str = corpus.catalog_page
+        self.audits: list[bytes] = [corpus.audit_path(name).read_bytes() for name in corpus.students]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    async def test_concurrent_students(self):
+        async with AsyncPlanController() as controller:
+            plans = await asyncio.gather(*(controller.run(audit, self.schedule, self.url) for audit in self.audits))
+            self.assertEqual(6, len(plans))
+            for audit, plan in zip(self.audits, plans):
+                planned = {course["code"] for courses in plan.values() for course in courses}
+                self.assertTrue(planned <= set(json.loads(audit)["progress"]))
+
+            workbook = await controller.export(plans[0])
+            self.assertTrue(workbook.startswith(b"PK"))
+            output_path: str = str(self.root / "plan.xlsx")
+            self.assertEqual(output_path, await controller.export(plans[0], output_path))
+            self.assertTrue(Path(output_path).exists())
+
+    async def test_inputs_loaded_once(self):
+        audits: list[bytes] = (self.audits * 4)[:20]
+        compiled_catalog = catalog.CompiledCatalog
+        with patch.object(excel_inputs, "get_class_schedule_data", wraps=excel_inputs.get_class_schedule_data) as parsed, \
+                patch.object(prereq_scraper, "Scraper", wraps=prereq_scraper.Scraper) as scraped, \
+                patch.object(catalog, "CompiledCatalog", wraps=compiled_catalog) as built, \
+                patch.object(session, "CompiledCatalog", wraps=compiled_catalog) as compiled:
+            async with AsyncPlanController() as controller:
+                plans = await asyncio.gather(*(controller.run(audit, self.schedule, self.url) for audit in audits))
+        self.assertEqual(20, len(plans))
+        self.assertEqual(1, parsed.call_count)
+        self.assertEqual(1, scraped.call_count)
+        self.assertEqual(1, compiled.call_count)
+        self.assertEqual(0, built.call_count)
+
+    async def test_typed_errors(self):
+        async with AsyncPlanController() as controller:
+            with self.assertRaises(AuditError):
+                await controller.load_audit(b"{not json")
+            with self.assertRaises(AuditError):
+                await controller.load_audit(str(self.root / "missing.pdf"))
+            with self.assertRaises(ScheduleError):
+                await controller.load_schedule(str(self.root / "missing.xlsx"))
+            with self.assertRaises(CatalogError):
+                await controller.load_catalog(str(self.root / "missing.html"))
+
+            schedule_data = await controller.load_schedule(self.schedule)
+            prereq_data, title_map = await controller.load_catalog(self.url)
+            with self.assertRaises(PlanError) as raised:
+                # offered but missing from the catalog, so the planner would fail to title it
+                offered: dict[str, list[str]] = dict(schedule_data, **{"ZZZZ 9999": ["FA24"]})
+                await controller.plan({"ZZZZ 9999": {"status": "incomplete", "term": ""}}, 0, offered, prereq_data, title_map)
+            self.assertIn("ZZZZ 9999", str(raised.exception))
+            self.assertIsInstance(raised.exception, PlanningError)
+
+
+if __name__ == "__main__":
+    unittest.main()
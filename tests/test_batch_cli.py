@@ -0,0 +1,133 @@
+import unittest
+import json
+import tracemalloc
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from benchmarks.synthetic import TERMS, SyntheticCatalog, write_catalog_html, write_schedule_workbook
+from class_planning_tool.cli import main
+from class_planning_tool.controller import batch_runner
+from class_planning_tool.controller.batch_runner import BatchSetupError, DuplicateAuditError, find_audits, run_batch
+from class_planning_tool.output_generation.class_plan_writer import read_plan_workbook
+
+
+class TestBatchPlanning(unittest.TestCase):
+
+    def setUp(self):
+        self.resource_path: Path = Path("./tests/resources")
+        self.catalog: str = str(self.resource_path / "course_descriptions_trimmed.html")
+        self.schedule: str = str(self.resource_path / "schedule_input_test.xlsx")
+        self.tmp = TemporaryDirectory()
+        self.audit_dir: Path = Path(self.tmp.name) / "audits"
+        self.out_dir: Path = Path(self.tmp.name) / "out"
+        self.audit_dir.mkdir()
+
+        self.write_audit("good", {"progress": {"CPSC 3333": {"status": "incomplete", "term": ""}}, "free_electives": 0})
+        # offered in the schedule but missing from the catalog, so it is rejected before planning
+        self.write_audit("no_title", {"progress": {"CPSC 2105": {"status": "incomplete", "term": ""}}})
+        (self.audit_dir / "broken.json").write_text("{not json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_audit(self, name: str, content: dict) -> None:
+        (self.audit_dir / f"{name}.json").write_text(json.dumps(content))
+
+    def test_results_and_failures(self):
+        report = run_batch(str(self.audit_dir), self.schedule, self.catalog, str(self.out_dir))
+        results = {result.student: result for result in report.results}
+
+        self.assertListEqual(["broken", "good", "no_title"], [result.student for result in report.results])
+        self.assertTrue(results["good"].ok)
+        self.assertTrue(Path(results["good"].output_path).exists())
+        self.assertTrue(results["broken"].error.startswith("audit:"))
+        self.assertTrue(results["no_title"].error.startswith("catalog: untitled"))
+        self.assertEqual(2, len(report.failures))
+        self.assertSetEqual({"schedule_parse", "scrape"}, set(report.shared_timings))
+        self.assertSetEqual({"progress_parse", "plan", "export"}, set(results["good"].timings))
+
+    def test_parallel_matches_serial(self):
+        serial = run_batch(str(self.audit_dir), self.schedule, self.catalog, str(self.out_dir), jobs=1)
+        parallel = run_batch(str(self.audit_dir), self.schedule, self.catalog, str(self.out_dir), jobs=2)
+        self.assertListEqual(
+            [(result.student, result.ok) for result in serial.results],
+            [(result.student, result.ok) for result in parallel.results]
+        )
+
+    def test_bounded_in_flight(self):
+        for index in range(6):
+            self.write_audit(f"extra{index}", {"progress": {"CPSC 3333": {"status": "incomplete", "term": ""}}, "free_electives": 0})
+        with patch("class_planning_tool.controller.batch_runner.wait", wraps=batch_runner.wait) as waited:
+            report = run_batch(str(self.audit_dir), self.schedule, self.catalog, str(self.out_dir), jobs=2, max_in_flight=2)
+        self.assertEqual(9, len(report.results))
+        self.assertEqual(7, len(report.results) - len(report.failures))
+        self.assertGreater(waited.call_count, 0)
+
+    def test_memory_accounting(self):
+        report = run_batch(str(self.audit_dir), self.schedule, self.catalog, str(self.out_dir), track_memory=True)
+        self.assertGreater(report.retained_memory, 0)
+        self.assertGreater(report.stage_summary()["plan"]["peak_memory"], 0)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_rerun_reuses_unchanged_plans(self):
+        run_batch(str(self.audit_dir), self.schedule, self.catalog, str(self.out_dir))
+        rerun = run_batch(str(self.audit_dir), self.schedule, self.catalog, str(self.out_dir))
+        good = next(result for result in rerun.results if result.student == "good")
+        self.assertTrue(good.unchanged)
+        self.assertListEqual([], good.changes)
+
+    def test_missing_schedule(self):
+        with self.assertRaises(BatchSetupError):
+            run_batch(str(self.audit_dir), "missing.xlsx", self.catalog, str(self.out_dir))
+
+    def test_duplicate_audits(self):
+        audit: Path = next(self.audit_dir.glob("*.json"))
+        (self.audit_dir / f"{audit.stem.upper()}.pdf").write_bytes(b"%PDF-")
+        with self.assertRaises(DuplicateAuditError) as context:
+            find_audits(str(self.audit_dir))
+        self.assertIn(audit.name, str(context.exception))
+        with patch("sys.stderr", new_callable=StringIO):
+            code = main(["plan", "--audits", str(self.audit_dir), "--schedule", self.schedule, "--catalog", self.catalog, "--out", str(self.out_dir)])
+        self.assertEqual(2, code)
+        self.assertListEqual([], list(self.out_dir.glob("*.xlsx")))
+
+    def test_prioritize_shortens_chains(self):
+        # CPSC 1000 -> 1100 -> 1200, with the first two only offered in the fall, beside four unrelated courses
+        chain = SyntheticCatalog(prerequisites={"CPSC 1000": [], "CPSC 1100": [["CPSC 1000"]], "CPSC 1200": [["CPSC 1100"]]})
+        chain.prerequisites.update({f"MATH 100{index}": [] for index in range(1, 5)})
+        for code in chain.prerequisites:
+            chain.titles[code] = f"Course {code}"
+            fall_only: bool = code in ("CPSC 1000", "CPSC 1100")
+            chain.cells[code] = {term: "F" if term.startswith("FA") or not fall_only else None for term in TERMS}
+        root: Path = Path(self.tmp.name) / "chain"
+        (root / "audits").mkdir(parents=True)
+        write_schedule_workbook(chain, str(root / "schedule.xlsx"))
+        write_catalog_html(chain, str(root / "catalog.html"))
+        progress = {code: {"status": "incomplete", "term": ""} for code in chain.titles}
+        for student in ("student", "student2"):
+            (root / "audits" / f"{student}.json").write_text(json.dumps({"progress": progress, "free_electives": 0}))
+
+        last_terms: list[str] = []
+        for out, options in (("default", []), ("prioritized", ["--prioritize"])):
+            with patch("sys.stdout", new_callable=StringIO):
+                code = main([
+                    "plan", "--audits", str(root / "audits"), "--schedule", str(root / "schedule.xlsx"),
+                    "--catalog", str(root / "catalog.html"), "--out", str(root / out), "--jobs", "2", *options
+                ])
+            self.assertEqual(0, code)
+            plan = read_plan_workbook(str(root / out / "student.xlsx"))
+            last_terms.append([term for term, courses in plan.items() if courses][-1])
+        self.assertListEqual(["FA25", "SP25"], last_terms)
+
+    def test_cli_exit_code_and_report(self):
+        report_path: Path = Path(self.tmp.name) / "report.json"
+        with patch("sys.stdout", new_callable=StringIO) as stdout:
+            code = main([
+                "plan", "--audits", str(self.audit_dir), "--schedule", self.schedule, "--catalog", self.catalog,
+                "--out", str(self.out_dir), "--jobs", "1", "--report", str(report_path)
+            ])
+        self.assertEqual(1, code)
+        self.assertIn("1 planned, 2 failed", stdout.getvalue())
+        self.assertEqual(3, len(json.loads(report_path.read_text())["students"]))
@@ -0,0 +1,85 @@
+import unittest
+
+from class_planning_tool.controller.class_plan_controller import ClassPlanController
+from class_planning_tool.course_planner.diagnostics import CatalogProblemError, analyze_catalog, diagnose
+
+
+def incomplete(*courses: str) -> dict[str, dict[str, str]]:
+    return {course: {"status": "incomplete", "term": ""} for course in courses}
+
+
+class TestCatalogDiagnostics(unittest.TestCase):
+
+    def setUp(self):
+        self.titles = {code: code for code in ("CPSC 1000", "CPSC 2000", "CPSC 3000", "CPSC 4000", "CPSC 5000")}
+        self.prerequisites = {
+            "CPSC 2000": [["CPSC 1000"]],
+            # CPSC 3000 and CPSC 4000 require each other; CPSC 5000 depends on the cycle
+            "CPSC 3000": [["CPSC 4000"], ["CPSC 2000"]],
+            "CPSC 4000": [["CPSC 3000"]],
+            "CPSC 5000": [["CPSC 4000", "MATH 9999"]],
+        }
+
+    def test_cycles_and_unreachable(self):
+        diagnostics = analyze_catalog(self.prerequisites, self.titles)
+        self.assertFalse(diagnostics.ok)
+        self.assertListEqual([["CPSC 3000", "CPSC 4000"]], diagnostics.cycles)
+        self.assertSetEqual({"CPSC 3000", "CPSC 4000", "CPSC 5000"}, set(diagnostics.unreachable))
+        self.assertDictEqual({"CPSC 5000": ["MATH 9999"]}, diagnostics.dangling)
+
+    def test_self_loop(self):
+        diagnostics = analyze_catalog({"CPSC 1000": [["CPSC 1000"]]}, {"CPSC 1000": "Loop"})
+        self.assertListEqual([["CPSC 1000"]], diagnostics.cycles)
+
+    def test_student_problems(self):
+        diagnostics = analyze_catalog(self.prerequisites, self.titles)
+        progress = incomplete("CPSC 2000", "CPSC 5000", "CPSC 7000")
+        progress["CPSC 3000"] = {"status": "complete", "term": "FA23"}
+        self.assertListEqual(
+            ["unreachable: CPSC 5000 is on or after a prerequisite cycle", "untitled: CPSC 7000 is not in the course catalog"],
+            diagnostics.student_problems(progress, {"CPSC 7000": ["FA24"]})
+        )
+        self.assertListEqual([], diagnostics.student_problems(incomplete("CPSC 1000", "CPSC 2000"), {}))
+
+    def test_unoffered_untitled_courses_warned(self):
+        diagnostics = analyze_catalog(self.prerequisites, self.titles)
+        progress = incomplete("CPSC 1000", "MATH 1111", "CPSC 6000", "6200")
+        self.assertListEqual(
+            ["untitled: 6200 is not in the course catalog", "untitled: CPSC 6000 is not in the course catalog"],
+            diagnostics.student_problems(progress, {"CPSC 1000": ["FA24"]})
+        )
+        progress = incomplete("CPSC 1000", "MATH 1111")
+        self.assertListEqual([], diagnostics.student_problems(progress, {"CPSC 1000": ["FA24"]}))
+        self.assertListEqual(
+            ["untitled: MATH 1111 is not in the course catalog or the schedule"],
+            diagnostics.student_warnings(progress, {"CPSC 1000": ["FA24"]})
+        )
+
+        controller: ClassPlanController = ClassPlanController()
+        with self.assertLogs("class_planning_tool.course_planner.diagnostics", "WARNING"):
+            plan = controller.get_plan(progress, 0, {"CPSC 1000": ["SP25"]}, self.prerequisites, self.titles)
+        self.assertListEqual([{"code": "CPSC 1000", "title": "CPSC 1000"}], plan["SP25"])
+
+    def test_deep_chain(self):
+        count: int = 20000
+        titles = {f"C{index}": "" for index in range(count)}
+        prerequisites = {f"C{index}": [[f"C{index - 1}"]] for index in range(1, count)}
+        prerequisites["C0"] = [[f"C{count - 1}"]]
+        diagnostics = analyze_catalog(prerequisites, titles)
+        self.assertEqual(1, len(diagnostics.cycles))
+        self.assertEqual(count, len(diagnostics.unreachable))
+
+    def test_cached(self):
+        first = diagnose(self.prerequisites, self.titles)
+        self.assertIs(first, diagnose(self.prerequisites, self.titles))
+        self.assertIs(first, diagnose(dict(self.prerequisites), dict(self.titles)))
+        self.assertIsNot(first, diagnose({}, self.titles))
+
+    def test_controller_fails_fast(self):
+        controller: ClassPlanController = ClassPlanController()
+        with self.assertRaises(CatalogProblemError):
+            controller.get_plan(incomplete("CPSC 5000"), 0, {"CPSC 5000": ["FA24"]}, self.prerequisites, self.titles)
+
+
+if __name__ == "__main__":
+    unittest.main()
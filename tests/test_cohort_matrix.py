@@ -0,0 +1,70 @@
+import unittest
+from unittest.mock import patch
+
+from benchmarks.synthetic import generate_catalog, generate_progress_maps
+from class_planning_tool.course_planner import cohort_matrix
+from class_planning_tool.course_planner.cohort_matrix import CohortMatrix, OfferingMatrix
+
+
+@unittest.skipIf(cohort_matrix.np is None, "NumPy is not installed")
+class TestCohortMatrix(unittest.TestCase):
+
+    def setUp(self):
+        self.schedule = {
+            "CPSC 1000": ["FA24", "SP25"],
+            "CPSC 2000": ["SP25"],
+            "CPSC 3000": ["SU25", "FA24"],
+        }
+        self.cohort = CohortMatrix.from_progress([
+            ("ann", {"CPSC 1000": {"status": "incomplete", "term": ""}, "CPSC 2000": {"status": "incomplete", "term": ""}}),
+            ("bob", {"CPSC 1000": {"status": "complete", "term": "SP24"}, "CPSC 9000": {"status": "incomplete", "term": ""}}),
+            ("cy", {"CPSC 1000": {"status": "current", "term": "FA24"}, "CPSC 3000": {"status": "incomplete", "term": ""}}),
+        ], self.schedule)
+
+    def test_offering_matrix(self):
+        offerings: OfferingMatrix = self.cohort.offerings
+        self.assertListEqual(["FA24", "SP25", "SU25"], offerings.terms)
+        self.assertTrue(offerings.is_offered("CPSC 3000", "FA24"))
+        self.assertFalse(offerings.is_offered("CPSC 2000", "FA24"))
+        self.assertFalse(offerings.is_offered("CPSC 9000", "FA24"))
+        self.assertListEqual(["CPSC 1000", "CPSC 2000"], offerings.courses_in("SP25"))
+        self.assertListEqual(["FA24", "SU25"], offerings.terms_for("CPSC 3000"))
+
+    def test_demand_queries(self):
+        self.assertDictEqual({"CPSC 1000": 1, "CPSC 2000": 1, "CPSC 3000": 1, "CPSC 9000": 1}, self.cohort.demand())
+        self.assertEqual(1, self.cohort.can_take("CPSC 1000", "SP25"))
+        self.assertEqual(0, self.cohort.can_take("CPSC 2000", "FA24"))
+        self.assertListEqual(["ann"], self.cohort.students_needing("CPSC 2000"))
+        self.assertDictEqual({"bob": ["CPSC 9000"]}, self.cohort.unofferable())
+
+        with_current = CohortMatrix.from_progress([("cy", {"CPSC 1000": {"status": "current", "term": "FA24"}})], self.schedule, include_current=True)
+        self.assertEqual(1, with_current.can_take("CPSC 1000", "FA24"))
+
+    def test_matches_loops(self):
+        catalog = generate_catalog(course_count=80, depth=5, offering_sparsity=0.6, seed=11)
+        students = generate_progress_maps(catalog, student_count=50, seed=11)
+        cohort = CohortMatrix.from_progress(((str(index), progress) for index, (progress, _) in enumerate(students)), catalog.offerings)
+
+        term_demand = cohort.term_demand()
+        available = cohort.available_counts()
+        for term, column in cohort.offerings.term_index.items():
+            for course, row in cohort.offerings.course_index.items():
+                expected = sum(
+                    1 for progress, _ in students
+                    if progress.get(course, {}).get("status") == "incomplete" and term in catalog.offerings.get(course, [])
+                )
+                self.assertEqual(expected, term_demand[row, column])
+            for index, (progress, _) in enumerate(students):
+                expected = sum(
+                    1 for course, entry in progress.items()
+                    if entry["status"] == "incomplete" and term in catalog.offerings.get(course, [])
+                )
+                self.assertEqual(expected, available[index, column])
+
+
+class TestWithoutNumpy(unittest.TestCase):
+
+    def test_clear_error(self):
+        with patch.object(cohort_matrix, "np", None):
+            with self.assertRaises(ImportError):
+                OfferingMatrix.from_schedule({"CPSC 1000": ["FA24"]})
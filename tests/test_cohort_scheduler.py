@@ -0,0 +1,101 @@
+import unittest
+import time
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from benchmarks.synthetic import generate_catalog, generate_progress_maps, write_corpus
+from class_planning_tool.cli import main
+from class_planning_tool.course_planner.cohort_scheduler import CohortScheduler, SeatLimitError, SeatLimits, load_seat_limits
+from class_planning_tool.course_planner.validator import PREREQUISITE, UNSCHEDULED, PlanValidator
+
+
+def incomplete(*courses: str) -> dict[str, dict[str, str]]:
+    return {course: {"status": "incomplete", "term": ""} for course in courses}
+
+
+class TestCohortScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.schedule = {"CPSC 1000": ["FA24", "SP25"], "CPSC 2000": ["SP25", "FA25"], "CPSC 6000": ["FA24", "SP25", "FA25"]}
+        self.prerequisites = {"CPSC 2000": [["CPSC 1000"]]}
+        self.titles = {"CPSC 1000": "Intro", "CPSC 2000": "Next", "CPSC 6000": "Capstone"}
+        self.tmp = TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def scheduler(self, limits: SeatLimits) -> CohortScheduler:
+        return CohortScheduler(self.schedule, self.prerequisites, self.titles, limits)
+
+    def test_seats_and_priority(self):
+        limits: SeatLimits = SeatLimits()
+        limits.set("CPSC 1000", 1)
+        cohort = self.scheduler(limits).schedule({
+            "long": incomplete("CPSC 1000", "CPSC 2000"),
+            "short": incomplete("CPSC 1000"),
+        })
+        # the student closer to graduation gets the only FA24 seat
+        self.assertEqual(["CPSC 1000"], [course["code"] for course in cohort.plans["short"]["FA24"]])
+        self.assertEqual([], cohort.plans["long"]["FA24"])
+        self.assertEqual(["CPSC 1000"], [course["code"] for course in cohort.plans["long"]["SP25"]])
+        self.assertEqual(["CPSC 2000"], [course["code"] for course in cohort.plans["long"]["FA25"]])
+        self.assertEqual(1, cohort.seats_used[("CPSC 1000", "FA24")])
+        self.assertDictEqual({}, cohort.unplaced)
+
+    def test_unplaced_and_final_course(self):
+        limits: SeatLimits = SeatLimits(default=0)
+        limits.set("CPSC 1000", 1, "FA24")
+        limits.set("CPSC 6000", 5)
+        cohort = self.scheduler(limits).schedule({
+            "a": incomplete("CPSC 1000", "CPSC 6000"),
+            "b": incomplete("CPSC 1000"),
+        })
+        self.assertEqual({"b": ["CPSC 1000"]}, cohort.unplaced)
+        self.assertListEqual(["CPSC 1000", "CPSC 6000"], [course["code"] for course in cohort.plans["a"]["FA24"]])
+        self.assertEqual(0, len(cohort.plans["b"]) % 3)
+
+    def test_load_seat_limits(self):
+        path: Path = Path(self.tmp.name) / "seats.csv"
+        path.write_text("course,term,seats\nCPSC 1000,,30\nCPSC 1000,SP25,10\n")
+        limits: SeatLimits = load_seat_limits(str(path), default=20)
+        self.assertEqual(30, limits.seats("CPSC 1000", "FA24"))
+        self.assertEqual(10, limits.seats("CPSC 1000", "SP25"))
+        self.assertEqual(20, limits.seats("CPSC 2000", "SP25"))
+
+        path.write_text("course,term,seats\nCPSC 1000,,many\n")
+        with self.assertRaises(SeatLimitError):
+            load_seat_limits(str(path))
+        with self.assertRaises(SeatLimitError):
+            load_seat_limits(str(Path(self.tmp.name) / "missing.csv"))
+
+    def test_scale_and_validity(self):
+        catalog = generate_catalog(course_count=300, depth=6, seed=4)
+        students = {str(index): progress for index, (progress, _) in enumerate(generate_progress_maps(catalog, student_count=3000, seed=4))}
+        limits: SeatLimits = SeatLimits(default=40)
+
+        start: float = time.perf_counter()
+        cohort = CohortScheduler(catalog.offerings, catalog.prerequisites, catalog.titles, limits).schedule(students)
+        self.assertLess(time.perf_counter() - start, 30)
+
+        self.assertLessEqual(max(cohort.seats_used.values()), 40)
+        validator: PlanValidator = PlanValidator(catalog.prerequisites, catalog.offerings)
+        for name, plan in cohort.plans.items():
+            kinds = {violation.kind for violation in validator.validate(plan, students[name])}
+            self.assertNotIn(PREREQUISITE, kinds)
+            self.assertEqual(UNSCHEDULED in kinds, name in cohort.unplaced)
+
+    def test_cli(self):
+        tmp: Path = Path(self.tmp.name)
+        write_corpus(self.tmp.name, seed=2)
+        (tmp / "seats.csv").write_text("course,term,seats\n")
+
+        with patch("sys.stdout", new_callable=StringIO) as stdout:
+            code = main([
+                "plan", "--audits", str(tmp / "audits"), "--schedule", str(tmp / "schedule.xlsx"), "--catalog",
+                str(tmp / "catalog.html"), "--out", str(tmp / "out"), "--seats", str(tmp / "seats.csv"), "--default-seats", "2"
+            ])
+        self.assertEqual(0, code)
+        self.assertIn("6 planned, 0 failed", stdout.getvalue())
+        self.assertEqual(6, len(list((tmp / "out").glob("*.xlsx"))))
@@ -0,0 +1,56 @@
+import unittest
+
+from benchmarks.memory_benchmark import measure_profile, sequential_plan
+from benchmarks.synthetic import generate_catalog, generate_progress_maps
+from class_planning_tool.course_planner.cohort_scheduler import CohortScheduler, SeatLimits
+from class_planning_tool.course_planner.course_table import CourseRecord, CourseTable, PlanMaps, ProgressMaps
+
+
+class TestCourseTable(unittest.TestCase):
+
+    def setUp(self):
+        self.catalog = generate_catalog(course_count=40, depth=4, or_density=0.5, seed=5)
+        self.table: CourseTable = CourseTable.from_catalog(self.catalog.prerequisites, self.catalog.titles, self.catalog.offerings)
+
+    def test_catalog_round_trip(self):
+        self.assertDictEqual({code: groups for code, groups in self.catalog.prerequisites.items() if groups}, self.table.prerequisites())
+        self.assertDictEqual(self.catalog.titles, self.table.title_map())
+        self.assertDictEqual({code: terms for code, terms in self.catalog.offerings.items() if terms}, self.table.offerings())
+
+    def test_progress_and_plan_round_trip(self):
+        for progress, electives in generate_progress_maps(self.catalog, student_count=5, seed=5):
+            self.assertEqual((progress, electives), self.table.decode_progress(self.table.encode_progress(progress, electives)))
+            plan = sequential_plan(progress, self.catalog)
+            plan["SU29"] = []
+            self.assertDictEqual(plan, self.table.decode_plan(self.table.encode_plan(plan)))
+
+    def test_cohort_held_as_records(self):
+        students = {f"student{index}": progress for index, (progress, _) in enumerate(generate_progress_maps(self.catalog, student_count=8, seed=5))}
+        progress_maps: ProgressMaps = ProgressMaps(self.table)
+        progress_maps.update(students)
+        self.assertDictEqual(students, dict(progress_maps))
+
+        limits: SeatLimits = SeatLimits(default=3)
+        args = (self.catalog.offerings, self.catalog.prerequisites, self.catalog.titles, limits)
+        expected = CohortScheduler(*args).schedule(students)
+        cohort = CohortScheduler(*args, table=self.table).schedule(progress_maps)
+        self.assertIsInstance(cohort.plans, PlanMaps)
+        self.assertDictEqual({name: dict(plan) for name, plan in expected.plans.items()}, dict(cohort.plans))
+        self.assertEqual(expected.seats_used, cohort.seats_used)
+
+    def test_interning(self):
+        code: str = next(iter(self.catalog.titles))
+        self.assertEqual(self.table.course_id(code), self.table.intern("".join(code)))
+        new_id: int = self.table.intern("NEW 1000")
+        self.assertEqual(new_id, self.table.intern("NEW 1000", "New Course"))
+        self.assertEqual("New Course", self.table.course("NEW 1000").title)
+        self.assertFalse(hasattr(self.table.courses[0], "__dict__"))
+        self.assertIsInstance(self.table.courses[new_id], CourseRecord)
+
+    def test_invalid_status(self):
+        with self.assertRaises(KeyError):
+            self.table.encode_progress({"CPSC 1000": {"status": "unknown", "term": ""}})
+
+    def test_records_smaller_than_dicts(self):
+        sizes = measure_profile({"course_count": 50, "depth": 4, "or_density": 0.3, "offering_sparsity": 0.5, "students": 50})
+        self.assertLess(sizes["record_bytes"] + sizes["table_bytes"], sizes["dict_bytes"])
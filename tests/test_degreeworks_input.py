@@ -1,5 +1,7 @@
 import unittest
 from pathlib import Path
+from re import compile
+from unittest.mock import patch
 from class_planning_tool.input_data import degreeworks_parser
 from pymupdf import Document
 
@@ -21,6 +23,22 @@ class TestDegreeWorksInput(unittest.TestCase):
     def test_empty_content_error(self):
         self.assertRaises(degreeworks_parser.DegreeWorksParsingError, lambda: degreeworks_parser.extract_text(Document()))
 
+    def test_document_closed(self):
+        doc: Document = Document()
+        doc.new_page().insert_text((50, 72), "Degree progress")
+        opened: Document = Document(stream=doc.tobytes(), filetype="pdf")
+        with patch.object(degreeworks_parser, "open_stream", return_value=opened):
+            degreeworks_parser.parse_pdf_bytes(b"")
+        self.assertTrue(opened.is_closed)
+
+    def test_student_identity(self):
+        with open(self.resource_path / "test_pdf_content1.txt", "r") as f:
+            text: str = f.read()
+        # the sample's ID is redacted, so only the name identifies the student
+        self.assertEqual("Smith, John", degreeworks_parser.student_identity(text))
+        self.assertEqual("Smith, John (900123456)", degreeworks_parser.student_identity(text.replace("XXXXXXXXX", "900123456")))
+        self.assertEqual("", degreeworks_parser.student_identity("Degree progress\nCPSC 6000"))
+
     def test_num_results(self):
         self.assertEqual(11, len(self.results))
     
@@ -70,3 +88,41 @@ class TestDegreeWorksInput(unittest.TestCase):
             }
         }
         self.assertDictEqual(expected_result, {key: self.results[key] for key in expected_result.keys()})
+
+
+class TestAuditLayouts(unittest.TestCase):
+
+    def setUp(self):
+        # a one-line-per-course variant, recognised by its report title
+        self.layout = degreeworks_parser.register_layout(degreeworks_parser.AuditLayout(
+            name="single_line",
+            fingerprint=compile(r"^Academic Audit Report"),
+            completed=compile(r"([A-Z]{4} \d{4}) .{0,100}? [ABCDF] \d (Summer|Fall|Spring) (20\d{2})"),
+            current=compile(r"([A-Z]{4} \d{4}) .{0,100}? IP \d (Summer|Fall|Spring) (20\d{2})"),
+            incomplete=compile(r"Needed: ([A-Z]{4} \d{4})"),
+            electives=compile(r"Electives needed: (\d+) Credits"),
+        ), first=True)
+
+    def tearDown(self):
+        degreeworks_parser.LAYOUTS.remove(self.layout)
+
+    def test_detect_layout(self):
+        with open(Path("./tests/resources") / "test_pdf_content1.txt", "r") as f:
+            self.assertIs(degreeworks_parser.CLASSIC_LAYOUT, degreeworks_parser.detect_layout(f.read()))
+        self.assertIs(self.layout, degreeworks_parser.detect_layout("Academic Audit Report\nCPSC 1000"))
+        self.assertIs(degreeworks_parser.CLASSIC_LAYOUT, degreeworks_parser.detect_layout("Unknown layout"))
+
+    def test_parse_variant(self):
+        doc: Document = Document()
+        doc.new_page().insert_text((50, 72), (
+            "Academic Audit Report\nCPSC 1000 Intro A 3 Fall 2023\nCPSC 2000 Next IP 3 Fall 2024\n"
+            "Needed: CPSC 3000\nElectives needed: 6 Credits\n"
+        ))
+        results, free_electives = degreeworks_parser.parse_pdf_bytes(doc.tobytes())
+        self.assertDictEqual({
+            "CPSC 1000": {"status": "complete", "term": "FA23"},
+            "CPSC 2000": {"status": "current", "term": "FA24"},
+            "CPSC 3000": {"status": "incomplete", "term": ""},
+        }, results)
+        self.assertEqual(2, free_electives)
+
@@ -0,0 +1,77 @@
+import unittest
+import csv
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from openpyxl import load_workbook
+
+from benchmarks.synthetic import write_corpus
+from class_planning_tool.cli import main
+from class_planning_tool.output_generation.class_plan_writer import read_plan_workbook, write_plan_workbook
+from class_planning_tool.output_generation.demand_forecast import DemandForecast, write_demand
+
+
+def plan_of(**terms: list[str]) -> dict[str, list[dict[str, str]]]:
+    return {term: [{"code": code, "title": f"Title {code}"} for code in codes] for term, codes in terms.items()}
+
+
+class TestDemandForecast(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.plans = [
+            plan_of(FA24=["CPSC 1000", "CPSC 2000"], SP25=["CPSC 3000"], SU25=[]),
+            plan_of(SP25=["CPSC 1000"], FA24=["CPSC 2000"], SU25=[]),
+        ]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_aggregation(self):
+        forecast: DemandForecast = DemandForecast.from_plans(plan for plan in self.plans)
+        self.assertEqual(2, forecast.plans)
+        self.assertListEqual(["FA24", "SP25"], forecast.terms())
+        self.assertEqual(2, forecast.demand("CPSC 2000", "FA24"))
+        self.assertEqual(0, forecast.demand("CPSC 3000", "FA24"))
+        self.assertDictEqual({"FA24": 3, "SP25": 2}, forecast.term_totals())
+
+        halves: DemandForecast = DemandForecast.from_plans(self.plans[:1])
+        halves.merge(DemandForecast.from_plans(self.plans[1:]))
+        self.assertEqual(forecast.rows(), halves.rows())
+
+    def test_export(self):
+        forecast: DemandForecast = DemandForecast.from_plans(self.plans)
+        csv_path: Path = Path(self.tmp.name) / "demand.csv"
+        xlsx_path: Path = Path(self.tmp.name) / "demand.xlsx"
+        write_demand(forecast, str(csv_path))
+        write_demand(forecast, str(xlsx_path))
+
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        self.assertListEqual(["Course", "Title", "FA24", "SP25", "Total"], rows[0])
+        self.assertListEqual(["CPSC 1000", "Title CPSC 1000", "1", "1", "2"], rows[1])
+        self.assertListEqual(forecast.rows(), [list(row) for row in load_workbook(xlsx_path).active.values])
+
+    def test_workbook_round_trip(self):
+        path: Path = Path(self.tmp.name) / "plan.xlsx"
+        write_plan_workbook(self.plans[0], str(path))
+        self.assertEqual(self.plans[0], dict(read_plan_workbook(str(path))))
+
+    def test_cli(self):
+        tmp: Path = Path(self.tmp.name)
+        audit_dir: Path = Path(write_corpus(self.tmp.name, student_count=8, seed=2).audit_dir)
+
+        with patch("sys.stdout", new_callable=StringIO):
+            main([
+                "plan", "--audits", str(audit_dir), "--schedule", str(tmp / "schedule.xlsx"), "--catalog",
+                str(tmp / "catalog.html"), "--out", str(tmp / "out"), "--jobs", "1", "--demand", str(tmp / "batch.csv")
+            ])
+            self.assertEqual(0, main(["forecast", "--plans", str(tmp / "out"), "--out", str(tmp / "workbooks.csv")]))
+            self.assertEqual(2, main(["forecast", "--plans", str(tmp / "missing"), "--out", str(tmp / "workbooks.csv")]))
+
+        # only plans that were exported are counted, so both routes see the same plans
+        batch_rows = (tmp / "batch.csv").read_text().splitlines()
+        self.assertGreater(len(batch_rows), 2)
+        self.assertListEqual(batch_rows, (tmp / "workbooks.csv").read_text().splitlines())
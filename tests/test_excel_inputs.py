@@ -1,6 +1,8 @@
 import unittest
 from pathlib import Path
-from class_planning_tool.input_data.excel_inputs import get_cutoff_format, populate_column_semester_map, get_class_schedule_data
+from unittest.mock import patch
+from class_planning_tool.input_data import excel_inputs
+from class_planning_tool.input_data.excel_inputs import get_cutoff_format, populate_column_semester_map, get_class_schedule_data, get_class_schedule_modes, classify_cell, offerings_for_modes
 
 
 class TestClassScheduleParsing(unittest.TestCase):
@@ -70,3 +72,28 @@ class TestClassScheduleParsing(unittest.TestCase):
         self.assertListEqual(output["CPSC 3137"], ["FA28"])
         self.assertListEqual(output["CPSC 3165"], ["SU27", "FA27", "SP28", "SU28", "FA28", "SP29"])
         self.assertEqual(7, len(output.keys()))
+
+    def test_classify_cell(self):
+        self.assertEqual(frozenset("DNO"), classify_cell("D,N,O"))
+        self.assertEqual(frozenset("D"), classify_cell("D(May)"))
+        self.assertEqual(frozenset("O"), classify_cell("O??"))
+        self.assertIsNone(classify_cell("??"))
+        self.assertIsNone(classify_cell("."))
+        self.assertIsNone(classify_cell("None"))
+        self.assertIsNone(classify_cell("elective - every other year"))
+
+    def test_extract_modes(self):
+        with patch.object(excel_inputs, "classify_cell", wraps=classify_cell) as classify:
+            output = get_class_schedule_modes(self.resource_path / "schedule_input_test.xlsx")
+        self.assertLess(classify.call_count, 15)  # once per distinct cell value, not once per cell
+        self.assertEqual({"SP25": frozenset("O"), "SP26": frozenset("N")}, {term: output["CYBR 3108"][term] for term in ("SP25", "SP26")})
+        self.assertEqual(frozenset("D"), output["CPSC 3165"]["SU25"])
+        self.assertDictEqual(get_class_schedule_data(self.resource_path / "schedule_input_test.xlsx"), offerings_for_modes(output))
+
+    def test_offerings_for_modes(self):
+        output: dict[str, list[str]] = get_class_schedule_data(self.resource_path / "schedule_input_test.xlsx", modes="O")
+        self.assertListEqual(output["CYBR 3108"], ["SP25"])
+        self.assertListEqual(output["CPSC 2108"], [])
+        self.assertListEqual(output["CPSC 3165"], ["SP25", "FA25", "SP26", "FA26", "SP27", "FA27", "SP28", "FA28", "SP29"])
+        with self.assertRaises(ValueError):
+            get_class_schedule_data(self.resource_path / "schedule_input_test.xlsx", modes="X")
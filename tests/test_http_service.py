@@ -0,0 +1,107 @@
+import unittest
+import json
+import threading
+from concurrent.futures.process import BrokenProcessPool
+from http.client import HTTPConnection
+from pathlib import Path
+from unittest.mock import patch
+from urllib import request
+from urllib.error import HTTPError
+
+from class_planning_tool.service.http_service import create_server
+
+
+class TestPlanningService(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        resource_path: Path = Path("./tests/resources")
+        cls.server = create_server(
+            "127.0.0.1", 0,
+            str(resource_path / "schedule_input_test.xlsx"),
+            str(resource_path / "course_descriptions_trimmed.html"),
+            workers=1, max_queue=0
+        )
+        cls.base_url: str = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.server.service.shutdown()
+
+    def post(self, body: bytes, content_type: str="application/json", output_format: str="json"):
+        req = request.Request(f"{self.base_url}/plan?format={output_format}", data=body, method="POST", headers={"Content-Type": content_type})
+        return request.urlopen(req, timeout=30)
+
+    def progress_body(self, course: str) -> bytes:
+        return json.dumps({"progress": {course: {"status": "incomplete", "term": ""}}, "free_electives": 0}).encode("utf-8")
+
+    def test_health(self):
+        with request.urlopen(f"{self.base_url}/health", timeout=5) as resp:
+            self.assertDictEqual({"status": "ok", "in_flight": 0, "capacity": 1}, json.loads(resp.read()))
+
+    def test_plan_json(self):
+        with self.post(self.progress_body("CPSC 3333")) as resp:
+            self.assertEqual(200, resp.status)
+            self.assertIn("plan", json.loads(resp.read()))
+
+    def test_plan_xlsx(self):
+        with self.post(self.progress_body("CPSC 3333"), output_format="xlsx") as resp:
+            self.assertEqual(200, resp.status)
+            self.assertEqual(b"PK", resp.read()[:2])  # xlsx files are zip archives
+
+    def test_bad_upload(self):
+        with self.assertRaises(HTTPError) as context:
+            self.post(b"{not json")
+        self.assertEqual(400, context.exception.code)
+        with self.assertRaises(HTTPError) as context:
+            self.post(b"%PDF-garbage", content_type="application/pdf")
+        self.assertEqual(400, context.exception.code)
+
+    def test_unsupported_content_type(self):
+        with self.assertRaises(HTTPError) as context:
+            self.post(b"hello", content_type="text/plain")
+        self.assertEqual(415, context.exception.code)
+
+    def test_planning_failure(self):
+        # offered in the schedule but missing from the catalog, so the planner cannot find its title
+        with self.assertRaises(HTTPError) as context:
+            self.post(self.progress_body("CPSC 2105"))
+        self.assertEqual(422, context.exception.code)
+
+    def test_back_pressure(self):
+        service = self.server.service
+        self.assertTrue(service.try_acquire())
+        try:
+            with self.assertRaises(HTTPError) as context:
+                self.post(self.progress_body("CPSC 3333"))
+            self.assertEqual(503, context.exception.code)
+            self.assertEqual("1", context.exception.headers["Retry-After"])
+        finally:
+            service.release()
+
+    def test_bad_content_length(self):
+        for length in ("abc", "-5"):
+            connection: HTTPConnection = HTTPConnection("127.0.0.1", self.server.server_address[1], timeout=5)
+            try:
+                connection.putrequest("POST", "/plan")
+                connection.putheader("Content-Type", "application/json")
+                connection.putheader("Content-Length", length)
+                connection.endheaders()
+                response = connection.getresponse()
+                self.assertEqual(400, response.status)
+                self.assertIn("Content-Length", json.loads(response.read())["error"])
+            finally:
+                connection.close()
+
+    def test_unexpected_errors(self):
+        service = self.server.service
+        for error, status in ((BrokenProcessPool("worker died"), 503), (RuntimeError("boom"), 500)):
+            with self.subTest(status), patch.object(service, "plan", side_effect=error):
+                with self.assertRaises(HTTPError) as context:
+                    self.post(self.progress_body("CPSC 3333"))
+                self.assertEqual(status, context.exception.code)
+                self.assertEqual(0, service.in_flight)
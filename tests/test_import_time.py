@@ -0,0 +1,48 @@
+import unittest
+import subprocess
+import sys
+
+# heavy third party packages that must only be imported once the subsystem needing them is used
+_HEAVY_MODULES: tuple[str, ...] = ("fitz", "pymupdf", "openpyxl", "bs4", "tkinter", "ttkbootstrap")
+
+# cumulative import time allowed for each entry module, in microseconds. Generous compared to the ~10ms typically
+# measured so that slow CI machines do not fail, but far below the cost of any of the heavy modules above
+_IMPORT_BUDGET_US: int = 150_000
+
+
+def measure_import(module: str) -> dict[str, int]:
+    """
+    Import a module in a fresh interpreter with -X importtime and return the cumulative time of every imported module.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True
+    )
+    timings: dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+
+class TestImportTime(unittest.TestCase):
+
+    def assert_cold_start(self, module: str):
+        timings = measure_import(module)
+        loaded_heavy = [name for name in timings if name.split(".")[0] in _HEAVY_MODULES]
+        self.assertListEqual([], loaded_heavy)
+        self.assertLess(timings[module], _IMPORT_BUDGET_US)
+
+    def test_controller_import(self):
+        self.assert_cold_start("class_planning_tool.controller.class_plan_controller")
+
+    def test_cli_import(self):
+        self.assert_cold_start("class_planning_tool.cli")
+
+    def test_batch_runner_import(self):
+        self.assert_cold_start("class_planning_tool.controller.batch_runner")
+
+    def test_main_import(self):
+        self.assert_cold_start("class_planning_tool.main")
@@ -0,0 +1,62 @@
+import unittest
+import logging
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from class_planning_tool.logging_config import LEVELS_ENV, SUBSYSTEMS, parse_levels, prune_logs, setup_logging
+
+
+class TestLoggingConfig(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_parse_levels(self):
+        self.assertEqual(parse_levels(""), {})
+        self.assertEqual(parse_levels("planner=debug, input=WARNING"), {"planner": logging.DEBUG, "input": logging.WARNING})
+        with self.assertRaises(ValueError):
+            parse_levels("parser=DEBUG")
+        with self.assertRaises(ValueError):
+            parse_levels("planner=LOUD")
+
+    def test_records_reach_run_file(self):
+        run = setup_logging(self.tmp.name)
+        try:
+            logging.getLogger("class_planning_tool.output_generation.test").info("exported %s", "plan.xlsx")
+        finally:
+            run.stop()
+        self.assertEqual(Path(run.log_path).parent, Path(self.tmp.name))
+        content: str = Path(run.log_path).read_text(encoding="utf-8")
+        self.assertIn("Logging initialized", content)
+        self.assertIn("exported plan.xlsx", content)
+
+    def test_levels_applied_and_restored(self):
+        planner: logging.Logger = logging.getLogger(SUBSYSTEMS["planner"])
+        before: int = planner.level
+        with patch.dict(os.environ, {LEVELS_ENV: "planner=ERROR"}):
+            run = setup_logging(self.tmp.name, {"input": logging.DEBUG})
+        try:
+            self.assertEqual(planner.level, logging.ERROR)
+            self.assertEqual(logging.getLogger(SUBSYSTEMS["input"]).level, logging.DEBUG)
+            logging.getLogger(SUBSYSTEMS["planner"] + ".planner").warning("per course detail")
+        finally:
+            run.stop()
+        self.assertEqual(planner.level, before)
+        self.assertNotIn("per course detail", Path(run.log_path).read_text(encoding="utf-8"))
+
+    def test_prune_keeps_newest_runs(self):
+        for stamp in ("20240101-000000-1", "20240102-000000-1", "20240103-000000-1"):
+            Path(self.tmp.name, f"course_scheduler-{stamp}.log").touch()
+            Path(self.tmp.name, f"course_scheduler-{stamp}.log.1").touch()
+        prune_logs(self.tmp.name, keep=1)
+        self.assertEqual(
+            sorted(path.name for path in Path(self.tmp.name).iterdir()),
+            ["course_scheduler-20240103-000000-1.log", "course_scheduler-20240103-000000-1.log.1"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
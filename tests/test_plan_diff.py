@@ -0,0 +1,83 @@
+import unittest
+from collections import OrderedDict
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from openpyxl import Workbook
+
+from class_planning_tool.output_generation import class_plan_writer
+from class_planning_tool.output_generation.class_plan_writer import export_plan, read_plan_hash, read_plan_workbook
+from class_planning_tool.output_generation.plan_diff import diff_plans, plan_hash
+
+
+def course(code: str) -> dict[str, str]:
+    return {"code": code, "title": f"Title of {code}"}
+
+
+class TestPlanDiff(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.path: str = str(Path(self.tmp.name) / "plan.xlsx")
+        self.plan: OrderedDict = OrderedDict([
+            ("FA24", [course("CPSC 6105"), course("CPSC 6106")]),
+            ("SP25", [course("CPSC 6109")]),
+            ("SU25", []),
+        ])
+        self.replanned: OrderedDict = OrderedDict([
+            ("FA24", [course("CPSC 6105")]),
+            ("SP25", [course("CPSC 6109"), course("CPSC 6106")]),
+            ("FA25", [course("CPSC 6000")]),
+        ])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_plan_hash(self):
+        self.assertEqual(plan_hash(self.plan), plan_hash(OrderedDict((term, list(courses)) for term, courses in self.plan.items())))
+        self.assertNotEqual(plan_hash(self.plan), plan_hash(self.replanned))
+        retitled: OrderedDict = OrderedDict(self.plan)
+        retitled["SP25"] = [{"code": "CPSC 6109", "title": "Renamed"}]
+        self.assertNotEqual(plan_hash(self.plan), plan_hash(retitled))
+
+    def test_diff(self):
+        self.assertTrue(diff_plans(self.plan, self.plan).unchanged)
+        diff = diff_plans(self.plan, self.replanned)
+        self.assertListEqual(["FA25"], diff.terms_added)
+        self.assertListEqual(["SU25"], diff.terms_removed)
+        self.assertListEqual(["FA24", "SP25"], diff.terms_changed)
+        self.assertDictEqual({"CPSC 6106": ("FA24", "SP25")}, diff.moved)
+        self.assertDictEqual({"CPSC 6000": "FA25"}, diff.added)
+        self.assertDictEqual({}, diff.removed)
+        self.assertIn("CPSC 6106: FA24 -> SP25", diff.summary())
+        self.assertDictEqual({"CPSC 6000": "FA25"}, diff_plans(self.replanned, self.plan).removed)
+
+    def test_export_cache(self):
+        first = export_plan(self.plan, self.path)
+        self.assertTrue(first.written)
+        self.assertIsNone(first.diff)
+        self.assertEqual(plan_hash(self.plan), read_plan_hash(self.path))
+
+        with patch.object(class_plan_writer, "write_plan_workbook", side_effect=AssertionError):
+            again = export_plan(self.plan, self.path)
+        self.assertFalse(again.written)
+        self.assertTrue(again.diff.unchanged)
+
+        changed = export_plan(self.replanned, self.path)
+        self.assertTrue(changed.written)
+        self.assertDictEqual({"CPSC 6106": ("FA24", "SP25")}, changed.diff.moved)
+        self.assertListEqual(["CPSC 6105"], [entry["code"] for entry in read_plan_workbook(self.path)["FA24"]])
+
+    def test_foreign_workbook_rewritten(self):
+        self.assertEqual("", read_plan_hash(self.path))
+        wb = Workbook()
+        wb.save(self.path)
+        self.assertEqual("", read_plan_hash(self.path))
+        result = export_plan(self.plan, self.path)
+        self.assertTrue(result.written)
+        self.assertIsNone(result.diff)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import json
+import tracemalloc
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from class_planning_tool.controller.class_plan_controller import ClassPlanController
+from class_planning_tool.controller.metrics import PlanMetrics
+
+
+class TestPlanMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.resource_path: Path = Path("./tests/resources")
+        self.tmp = TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_stage_recorded_on_error(self):
+        metrics: PlanMetrics = PlanMetrics()
+        with self.assertRaises(ValueError):
+            with metrics.measure("parse", input_size=10):
+                raise ValueError("bad input")
+        self.assertEqual(10, metrics.stages["parse"].input_size)
+        self.assertGreaterEqual(metrics.stages["parse"].seconds, 0)
+
+    def test_memory_peak(self):
+        metrics: PlanMetrics = PlanMetrics(track_memory=True)
+        with metrics.measure("allocate"):
+            data = [0] * 100_000
+        self.assertGreater(metrics.stages["allocate"].peak_memory, 100_000 * 8 - 1)
+        self.assertFalse(tracemalloc.is_tracing())
+        del data
+
+    def test_nested_memory_peak(self):
+        outer: PlanMetrics = PlanMetrics(track_memory=True)
+        inner: PlanMetrics = PlanMetrics(track_memory=True)
+        with outer.measure("outer"):
+            data = [0] * 100_000
+            del data
+            with inner.measure("inner"):
+                small = [0] * 10
+            del small
+        self.assertGreater(outer.stages["outer"].peak_memory, 100_000 * 8 - 1)
+        self.assertLess(inner.stages["inner"].peak_memory, 100_000 * 8)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_pipeline_metrics(self):
+        audit: Path = Path(self.tmp.name) / "student.json"
+        audit.write_text(json.dumps({"progress": {"CPSC 3333": {"status": "incomplete", "term": ""}}}))
+        metrics_path: Path = Path(self.tmp.name) / "metrics.json"
+
+        plan, metrics = ClassPlanController().run_pipeline(
+            str(audit),
+            self.resource_path / "schedule_input_test.xlsx",
+            str(self.resource_path / "course_descriptions_trimmed.html"),
+            output_path=str(Path(self.tmp.name) / "plan.xlsx"),
+            metrics_path=str(metrics_path)
+        )
+
+        self.assertListEqual(["progress_parse", "schedule_parse", "scrape", "plan", "export"], list(metrics.stages))
+        self.assertEqual(7, metrics.stages["schedule_parse"].output_size)
+        self.assertEqual(5, metrics.stages["scrape"].output_size)
+        self.assertEqual(1, metrics.stages["plan"].input_size)
+        self.assertGreater(metrics.stages["export"].output_size, 0)
+        self.assertListEqual(list(metrics.stages), list(json.loads(metrics_path.read_text())["stages"]))
+
+    def test_pipeline_bad_audit(self):
+        with self.assertRaises(ValueError):
+            ClassPlanController().run_pipeline(
+                str(self.resource_path / "abc.pdf"),
+                self.resource_path / "schedule_input_test.xlsx",
+                str(self.resource_path / "course_descriptions_trimmed.html")
+            )
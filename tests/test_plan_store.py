@@ -0,0 +1,108 @@
+import unittest
+import json
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from pymupdf import Document
+
+from class_planning_tool.cli import main
+from class_planning_tool.controller.batch_runner import run_batch
+from class_planning_tool.controller.class_plan_controller import ClassPlanController
+from class_planning_tool.output_generation.plan_store import DEFAULT_STORE_PATH, STORE_PATH_ENV, PlanStore, default_store_path
+
+
+def plan_of(**terms: list[str]) -> dict[str, list[dict[str, str]]]:
+    return {term: [{"code": code, "title": f"Title {code}"} for code in codes] for term, codes in terms.items()}
+
+
+class TestPlanStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.path: str = str(Path(self.tmp.name) / "plans.db")
+        self.store: PlanStore = PlanStore(self.path)
+        self.store.save_plans([
+            ("ann", plan_of(FA24=["CPSC 1000", "CPSC 2000"], SP25=["CPSC 3000"], SU25=[])),
+            ("bob", plan_of(FA24=["CPSC 2000"], SP25=[], SU25=[], FA25=["CPSC 3000"], SP26=[], SU26=[])),
+        ])
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        self.assertListEqual(["ann", "bob"], self.store.students())
+        self.assertEqual(plan_of(FA24=["CPSC 1000", "CPSC 2000"], SP25=["CPSC 3000"], SU25=[]), dict(self.store.get_plan("ann")))
+        self.assertListEqual(["FA24", "SP25", "SU25", "FA25", "SP26", "SU26"], list(self.store.get_plan("bob")))
+        self.assertIsNone(self.store.get_plan("cy"))
+
+    def test_queries(self):
+        self.assertListEqual(["ann", "bob"], self.store.students_taking("CPSC 2000", "FA24"))
+        self.assertListEqual(["ann"], self.store.students_taking("CPSC 3000", "SP25"))
+        self.assertListEqual(["ann"], self.store.students_graduating_by("SU25"))
+        self.assertListEqual(["ann", "bob"], self.store.students_graduating_by("FA25"))
+        self.assertDictEqual({"CPSC 1000": 1, "CPSC 2000": 2}, self.store.course_demand("FA24"))
+        with self.assertRaises(ValueError):
+            self.store.students_graduating_by("Fall")
+
+    def test_replace_and_persist(self):
+        self.store.save_plan("ann", plan_of(SP25=["CPSC 4000"]))
+        self.store.close()
+        self.store = PlanStore(self.path)
+        self.assertEqual(plan_of(SP25=["CPSC 4000"]), dict(self.store.get_plan("ann")))
+        self.assertListEqual([], self.store.students_taking("CPSC 1000", "FA24"))
+        self.assertTrue(self.store.delete_plan("ann"))
+        self.assertListEqual(["bob"], self.store.students())
+
+    def test_controller_store_plan(self):
+        ClassPlanController().store_plan(plan_of(FA24=["CPSC 1000"]), "cy", self.path)
+        self.assertListEqual(["ann", "cy"], self.store.students_taking("CPSC 1000", "FA24"))
+
+    def test_default_store_path(self):
+        with patch.dict("os.environ", {STORE_PATH_ENV: self.path}):
+            self.assertEqual(self.path, default_store_path())
+            ClassPlanController().store_plan(plan_of(FA24=["CPSC 1000"]), "cy")
+        with patch.dict("os.environ", {STORE_PATH_ENV: ""}):
+            self.assertEqual(DEFAULT_STORE_PATH, default_store_path())
+        self.assertListEqual(["ann", "cy"], self.store.students_taking("CPSC 1000", "FA24"))
+
+    def test_audit_student(self):
+        controller: ClassPlanController = ClassPlanController()
+        document = Document()
+        document.new_page().insert_text((50, 72), "Student name\nDoe, Jane\nStudent ID\n900123456\nDegree progress\n")
+        audit: Path = Path(self.tmp.name) / "audit.pdf"
+        document.save(audit)
+        self.assertEqual("Doe, Jane (900123456)", controller.audit_student(str(audit)))
+        self.assertEqual("one", controller.audit_student(str(Path(self.tmp.name) / "one.json")))
+        self.assertEqual("test", controller.audit_student("./tests/resources/test.pdf"))
+
+
+class TestBatchStore(unittest.TestCase):
+
+    def setUp(self):
+        self.resource_path: Path = Path("./tests/resources")
+        self.tmp = TemporaryDirectory()
+        self.audit_dir: Path = Path(self.tmp.name) / "audits"
+        self.audit_dir.mkdir()
+        for name in ("one", "two"):
+            (self.audit_dir / f"{name}.json").write_text(json.dumps({"progress": {"CPSC 3333": {"status": "incomplete", "term": ""}}}))
+        self.store_path: str = str(Path(self.tmp.name) / "plans.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_batch_and_query_cli(self):
+        with PlanStore(self.store_path) as store:
+            report = run_batch(
+                str(self.audit_dir), str(self.resource_path / "schedule_input_test.xlsx"),
+                str(self.resource_path / "course_descriptions_trimmed.html"), str(Path(self.tmp.name) / "out"), store=store
+            )
+            self.assertEqual(len(report.results) - len(report.failures), len(store.students()))
+            self.assertListEqual(["one", "two"], store.students())
+
+        with patch("sys.stdout", new_callable=StringIO) as stdout:
+            self.assertEqual(0, main(["query", "--store", self.store_path, "--graduating-by", "FA29"]))
+            self.assertEqual(1, main(["query", "--store", self.store_path, "--student", "nobody"]))
+        self.assertEqual(2, main(["query", "--store", str(Path(self.tmp.name) / "missing.db"), "--demand", "FA24"]))
@@ -0,0 +1,101 @@
+import unittest
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from class_planning_tool.controller.batch_runner import run_batch
+from class_planning_tool.course_planner.validator import (
+    CAPACITY, COMPLETED, DUPLICATE, OFFERING, PREREQUISITE, TERM, UNSCHEDULED, PlanValidator, term_rank
+)
+
+
+def plan_of(**terms: list[str]) -> dict[str, list[dict[str, str]]]:
+    return {term: [{"code": code, "title": code} for code in codes] for term, codes in terms.items()}
+
+
+class TestPlanValidator(unittest.TestCase):
+
+    def setUp(self):
+        self.prerequisites = {
+            "CPSC 2000": [["CPSC 1000"]],
+            "CPSC 3000": [["CPSC 2000", "CPSC 2500"], ["MATH 1000"]],
+        }
+        self.offerings = {
+            "CPSC 1000": ["FA24", "SP25"],
+            "CPSC 2000": ["SP25", "FA25"],
+            "CPSC 2500": ["SP25"],
+            "CPSC 3000": ["FA25"],
+            "MATH 1000": ["FA24"],
+        }
+        self.validator: PlanValidator = PlanValidator(self.prerequisites, self.offerings, max_courses_per_semester=2)
+
+    def kinds(self, plan, progress=None) -> list[tuple[str, str]]:
+        return [(violation.kind, violation.course) for violation in self.validator.validate(plan, progress)]
+
+    def test_valid_plan(self):
+        plan = plan_of(FA24=["CPSC 1000", "MATH 1000"], SP25=["CPSC 2000"], FA25=["CPSC 3000"])
+        self.assertListEqual([], self.kinds(plan))
+
+    def test_term_rank(self):
+        self.assertLess(term_rank("FA24"), term_rank("SP25"))
+        self.assertLess(term_rank("SP25"), term_rank("SU25"))
+        self.assertIsNone(term_rank("Fall 2024"))
+
+    def test_prerequisite_same_term(self):
+        plan = plan_of(FA24=["MATH 1000"], SP25=["CPSC 1000", "CPSC 2000"])
+        self.assertListEqual([(PREREQUISITE, "CPSC 2000")], self.kinds(plan))
+
+    def test_or_group_and_progress(self):
+        progress = {
+            "CPSC 2500": {"status": "complete", "term": "SP24"},
+            "MATH 1000": {"status": "current", "term": "FA24"},
+            "CPSC 3000": {"status": "incomplete", "term": ""},
+        }
+        self.assertListEqual([], self.kinds(plan_of(FA25=["CPSC 3000"]), progress))
+
+        strict: PlanValidator = PlanValidator(self.prerequisites, self.offerings, assume_untracked_met=False)
+        self.assertEqual([PREREQUISITE, PREREQUISITE], [v.kind for v in strict.validate(plan_of(FA25=["CPSC 3000"]))])
+
+    def test_offering_capacity_duplicate_term(self):
+        plan = plan_of(FA24=["CPSC 1000", "MATH 1000", "CPSC 2500"], SP25=["CPSC 1000"], Later=["CPSC 3000"])
+        self.assertListEqual(
+            [(CAPACITY, ""), (DUPLICATE, "CPSC 1000"), (TERM, ""), (OFFERING, "CPSC 2500")],
+            self.kinds(plan)
+        )
+
+    def test_progress_checks(self):
+        progress = {"CPSC 1000": {"status": "complete", "term": "SP24"}, "MATH 1000": {"status": "incomplete", "term": ""}}
+        self.assertListEqual(
+            [(COMPLETED, "CPSC 1000"), (UNSCHEDULED, "MATH 1000")],
+            self.kinds(plan_of(FA24=["CPSC 1000"]), progress)
+        )
+
+    def test_validate_many(self):
+        plans = ((f"student{index}", plan_of(SP25=["CPSC 1000", "CPSC 2000"]), None) for index in range(2000))
+        results = list(self.validator.validate_many(plans))
+        self.assertEqual(2000, len(results))
+        self.assertTrue(all(len(violations) == 1 for _, violations in results))
+
+
+class TestBatchValidation(unittest.TestCase):
+
+    def setUp(self):
+        self.resource_path: Path = Path("./tests/resources")
+        self.tmp = TemporaryDirectory()
+        self.audit_dir: Path = Path(self.tmp.name) / "audits"
+        self.audit_dir.mkdir()
+        (self.audit_dir / "good.json").write_text(json.dumps({"progress": {"CPSC 3333": {"status": "incomplete", "term": ""}}}))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_violations_recorded(self):
+        args = (
+            str(self.audit_dir), str(self.resource_path / "schedule_input_test.xlsx"),
+            str(self.resource_path / "course_descriptions_trimmed.html"), str(Path(self.tmp.name) / "out")
+        )
+        self.assertListEqual([], run_batch(*args).results[0].violations)
+        report = run_batch(*args, validate=True)
+        self.assertTrue(report.results[0].ok)
+        self.assertEqual(report.invalid, [result for result in report.results if result.violations])
+        self.assertIn("violations", report.to_dict()["students"][0])
@@ -0,0 +1,107 @@
+import unittest
+import json
+import os
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from benchmarks.synthetic import SyntheticCorpus, write_corpus, write_schedule_workbook
+from class_planning_tool.cli import main
+from class_planning_tool.controller.watcher import PlanWatcher
+
+
+class TestPlanWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.root: Path = Path(self.tmp.name)
+        corpus: SyntheticCorpus = write_corpus(self.tmp.name)
+        self.catalog = corpus.catalog
+        self.progress: dict[str, dict] = {name: progress for name, (progress, _) in corpus.students.items()}
+        self.watcher: PlanWatcher = PlanWatcher(
+            str(self.root / "audits"), str(self.root / "schedule.xlsx"), str(self.root / "catalog.html"), str(self.root / "out")
+        )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_audit(self, name: str, content: dict) -> None:
+        (self.root / "audits" / f"{name}.json").write_text(json.dumps(content))
+
+    def planned(self) -> list[str]:
+        return [result.student for result in self.watcher.poll().planned]
+
+    def test_replans_only_changes(self):
+        self.assertListEqual(sorted(self.progress), self.planned())
+        self.assertEqual(6, len(list((self.root / "out").glob("*.xlsx"))))
+        self.assertListEqual([], self.planned())
+
+        # touched but unchanged
+        audit: Path = self.root / "audits" / "student0.json"
+        os.utime(audit, ns=(audit.stat().st_atime_ns, audit.stat().st_mtime_ns + 10**9))
+        self.assertListEqual([], self.planned())
+
+        self.write_audit("student1", {"progress": self.progress["student1"], "free_electives": 1})
+        self.assertListEqual(["student1"], self.planned())
+
+        (self.root / "audits" / "student2.json").unlink()
+        cycle = self.watcher.poll()
+        self.assertListEqual(["student2"], cycle.removed)
+        self.assertListEqual([], cycle.planned)
+        self.assertFalse((self.root / "out" / "student2.xlsx").exists())
+
+        # a failed replan leaves no workbook from the previous audit behind
+        (self.root / "audits" / "student3.json").write_text("{not json")
+        cycle = self.watcher.poll()
+        self.assertListEqual(["student3"], [result.student for result in cycle.planned])
+        self.assertFalse(cycle.planned[0].ok)
+        self.assertFalse((self.root / "out" / "student3.xlsx").exists())
+        self.assertEqual(4, len(list((self.root / "out").glob("*.xlsx"))))
+
+    def test_schedule_change_replans_affected_students(self):
+        self.watcher.poll()
+        remaining: dict[str, set[str]] = {
+            name: {course for course, entry in progress.items() if entry["status"] != "complete"}
+            for name, progress in self.progress.items() if name != "student2"
+        }
+        course: str = next(
+            course for course in sorted(self.catalog.offerings)
+            if len(self.catalog.offerings[course]) > 1 and 0 < sum(course in courses for courses in remaining.values()) < 5
+        )
+        row: dict[str, str] = self.catalog.cells[course]
+        first: str = next(term for term, cell in row.items() if cell.strip())
+        self.catalog.cells[course] = {term: cell if term == first else "" for term, cell in row.items()}
+        (self.root / "audits" / "student2.json").unlink()
+        write_schedule_workbook(self.catalog, str(self.root / "schedule.xlsx"))
+
+        cycle = self.watcher.poll()
+        self.assertTrue(cycle.schedule_changed)
+        self.assertListEqual(sorted(name for name, courses in remaining.items() if course in courses), [result.student for result in cycle.planned])
+        # replanned workbooks report what moved, or that the plan came out the same
+        for result in cycle.planned:
+            self.assertTrue(result.unchanged or result.changes)
+
+    def test_duplicate_audit_keeps_previous(self):
+        self.planned()
+        (self.root / "audits" / "student0.pdf").write_bytes(b"%PDF-")
+        self.write_audit("student1", {"progress": self.progress["student1"], "free_electives": 1})
+        self.assertListEqual(["student1"], self.planned())
+        self.assertEqual(6, len(list((self.root / "out").glob("*.xlsx"))))
+
+        (self.root / "audits" / "student0.pdf").unlink()
+        self.assertListEqual([], self.planned())
+
+    def test_cli_once(self):
+        with patch("sys.stdout", new_callable=StringIO) as stdout:
+            code = main([
+                "watch", "--once", "--audits", str(self.root / "audits"), "--schedule", str(self.root / "schedule.xlsx"),
+                "--catalog", str(self.root / "catalog.html"), "--out", str(self.root / "out")
+            ])
+        self.assertEqual(0, code)
+        self.assertEqual(6, stdout.getvalue().count(": ok"))
+        self.assertEqual(2, main(["watch", "--once", "--audits", str(self.root / "missing"), "--schedule", str(self.root / "schedule.xlsx"), "--catalog", str(self.root / "catalog.html"), "--out", str(self.root / "out")]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import unittest
+import os
+import shutil
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from benchmarks.synthetic import generate_catalog, generate_progress_maps
+from class_planning_tool.controller.class_plan_controller import ClassPlanController
+from class_planning_tool.controller.session import PlanningSession
+from class_planning_tool.course_planner.catalog import CompiledCatalog
+from class_planning_tool.course_planner.planner import Planner
+
+
+class TestPlanningSession(unittest.TestCase):
+
+    def setUp(self):
+        self.resource_path: Path = Path("./tests/resources")
+        self.catalog: str = str(self.resource_path / "course_descriptions_trimmed.html")
+        self.tmp = TemporaryDirectory()
+        self.schedule: Path = Path(self.tmp.name) / "schedule.xlsx"
+        shutil.copy(self.resource_path / "schedule_input_test.xlsx", self.schedule)
+        self.session: PlanningSession = PlanningSession()
+
+    def tearDown(self):
+        self.session.close()
+        self.tmp.cleanup()
+
+    def test_inputs_reused_across_controllers(self):
+        first: ClassPlanController = ClassPlanController(session=self.session)
+        schedule_data = first.process_schedule_file(self.schedule)
+        prereq_data, title_map = first.process_prerequisites(self.catalog)
+
+        second: ClassPlanController = ClassPlanController(session=self.session)
+        with patch("class_planning_tool.input_data.excel_inputs.get_class_schedule_data", side_effect=AssertionError), \
+                patch("class_planning_tool.input_data.prereq_scraper.Scraper", side_effect=AssertionError):
+            self.assertIs(schedule_data, second.process_schedule_file(self.schedule))
+            self.assertIs(title_map, second.process_prerequisites(self.catalog)[1])
+
+        compiled = self.session.compiled_for(schedule_data, prereq_data, title_map)
+        self.assertIsInstance(compiled, CompiledCatalog)
+        self.assertIs(compiled, self.session.compiled_for(schedule_data, prereq_data, title_map))
+        self.assertIsNone(self.session.compiled_for(dict(schedule_data), prereq_data, title_map))
+
+    def test_prioritized_session(self):
+        session: PlanningSession = PlanningSession(prioritize=True)
+        try:
+            schedule_data = session.schedule(self.schedule)
+            prereq_data, title_map = session.catalog(self.catalog)
+            self.assertTrue(session.compiled_for(schedule_data, prereq_data, title_map).prioritize)
+        finally:
+            session.close()
+        self.assertFalse(self.session.prioritize)
+
+    def test_changed_schedule_reloaded(self):
+        first = self.session.schedule(self.schedule)
+        stat = os.stat(self.schedule)
+        os.utime(self.schedule, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        second = self.session.schedule(self.schedule)
+        self.assertIsNot(first, second)
+        self.assertDictEqual(first, second)
+
+    def test_invalidate(self):
+        schedule_data = self.session.schedule(self.schedule)
+        prereq_data, title_map = self.session.catalog(self.catalog)
+        self.session.compiled_for(schedule_data, prereq_data, title_map)
+
+        self.session.invalidate_catalog()
+        self.assertFalse(self.session.has_catalog(self.catalog))
+        self.assertTrue(self.session.has_schedule(self.schedule))
+        self.assertIsNone(self.session.compiled_for(schedule_data, prereq_data, title_map))
+
+        self.session.invalidate()
+        self.assertFalse(self.session.has_schedule(self.schedule))
+
+
+class TestCompiledCatalog(unittest.TestCase):
+
+    def setUp(self):
+        self.catalog = generate_catalog(course_count=60, depth=5, seed=3)
+        self.compiled: CompiledCatalog = CompiledCatalog(self.catalog.prerequisites, self.catalog.titles, self.catalog.offerings)
+
+    def test_order_respects_prerequisites(self):
+        prioritized: CompiledCatalog = CompiledCatalog(
+            self.catalog.prerequisites, self.catalog.titles, self.catalog.offerings, prioritize=True
+        )
+        self.assertCountEqual(self.compiled.topological_order, self.compiled.priority_order)
+        required: set[str] = set(self.catalog.titles)
+        for order in (self.compiled.order_for(required), prioritized.order_for(required), self.compiled.priority_order):
+            position: dict[str, int] = {course: index for index, course in enumerate(order)}
+            for course, groups in self.catalog.prerequisites.items():
+                for group in groups:
+                    for prereq in group:
+                        self.assertLess(position[prereq], position[course])
+
+    def test_same_courses_planned(self):
+        # without prioritize the compiled catalog keeps each student's own order, so sharing one never changes a plan
+        for seed in range(20):
+            catalog = generate_catalog(course_count=120, depth=6, seed=seed)
+            compiled: CompiledCatalog = CompiledCatalog(catalog.prerequisites, catalog.titles, catalog.offerings)
+            for progress, free_electives in generate_progress_maps(catalog, student_count=20, seed=seed):
+                with self.subTest(seed=seed):
+                    args = (progress, free_electives, catalog.offerings, catalog.prerequisites, catalog.titles)
+                    self.assertListEqual(Planner(*args).topological_sort(), Planner(*args, compiled=compiled).topological_sort())
+                    self.assertEqual(Planner(*args).find_best_schedule(), Planner(*args, compiled=compiled).find_best_schedule())
+
+    def test_closures(self):
+        for course in self.compiled.topological_order:
+            expected: set[str] = set()
+            frontier: list[str] = [course]
+            while frontier:
+                for dependent in self.compiled.graph[frontier.pop()]:
+                    if dependent not in expected:
+                        expected.add(dependent)
+                        frontier.append(dependent)
+            self.assertSetEqual(expected, set(self.compiled.unlocks(course)))
+            for dependent in expected:
+                self.assertTrue(self.compiled.is_prerequisite(course, dependent))
+                self.assertIn(course, self.compiled.requires(dependent))
+                self.assertGreater(self.compiled.chain_length[course], self.compiled.chain_length[dependent])
+
+    def test_critical_path_first(self):
+        prerequisites = {"CPSC 1000": [], "CPSC 3000": [["CPSC 2000"]]}
+        titles = {"CPSC 1000": "Leaf", "CPSC 2000": "Gate", "CPSC 3000": "Next"}
+        offerings = {"CPSC 1000": ["FA24", "SP25", "SU25"], "CPSC 2000": ["FA24", "FA25"], "CPSC 3000": ["FA24", "SP25", "SU25"]}
+        compiled: CompiledCatalog = CompiledCatalog(prerequisites, titles, offerings, prioritize=True)
+        self.assertListEqual(["CPSC 2000", "CPSC 1000", "CPSC 3000"], compiled.priority_order)
+        self.assertListEqual(["CPSC 3000"], compiled.unlocks("CPSC 2000"))
+
+        progress = {course: {"status": "incomplete", "term": ""} for course in titles}
+        plan = Planner(progress, 0, offerings, prerequisites, titles, compiled=compiled).find_best_schedule(max_courses_per_semester=1)
+        self.assertDictEqual(
+            {"FA24": ["CPSC 2000"], "SP25": ["CPSC 1000"], "SU25": ["CPSC 3000"]},
+            {term: [course["code"] for course in courses] for term, courses in plan.items()}
+        )
+
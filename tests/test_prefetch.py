@@ -0,0 +1,61 @@
+import unittest
+import os
+import shutil
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from class_planning_tool.controller.class_plan_controller import ClassPlanController
+from class_planning_tool.controller.prefetch import Prefetcher
+
+
+class TestPrefetch(unittest.TestCase):
+
+    def setUp(self):
+        self.resource_path: Path = Path("./tests/resources")
+        self.catalog: str = str(self.resource_path / "course_descriptions_trimmed.html")
+        self.tmp = TemporaryDirectory()
+        self.schedule: Path = Path(self.tmp.name) / "schedule.xlsx"
+        shutil.copy(self.resource_path / "schedule_input_test.xlsx", self.schedule)
+        self.prefetcher: Prefetcher = Prefetcher()
+
+    def tearDown(self):
+        self.prefetcher.shutdown()
+        self.tmp.cleanup()
+
+    def test_schedule_reused(self):
+        self.prefetcher.prefetch_schedule(self.schedule).result()
+        first = self.prefetcher.take_schedule(self.schedule)
+        self.assertEqual(7, len(first))
+        self.assertIs(first, self.prefetcher.take_schedule(self.schedule))
+
+    def test_schedule_invalidated_by_change(self):
+        self.prefetcher.prefetch_schedule(self.schedule).result()
+        self.assertIsNone(self.prefetcher.take_schedule(self.schedule, start_semester="SU27"))
+
+        stat = os.stat(self.schedule)
+        os.utime(self.schedule, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertIsNone(self.prefetcher.take_schedule(self.schedule))
+
+    def test_catalog_replaced_by_new_url(self):
+        self.prefetcher.prefetch_catalog(self.catalog).result()
+        prerequisites, titles = self.prefetcher.take_catalog(self.catalog)
+        self.assertEqual(5, len(titles))
+
+        self.prefetcher.prefetch_catalog("missing.html")
+        self.assertIsNone(self.prefetcher.take_catalog(self.catalog))
+        # failed prefetches are discarded so the caller reloads and sees the error itself
+        self.assertIsNone(self.prefetcher.take_catalog("missing.html"))
+
+    def test_controller_uses_prefetched_inputs(self):
+        controller: ClassPlanController = ClassPlanController()
+        controller.prefetch_schedule(self.schedule)
+        controller.prefetch_catalog(self.catalog)
+        controller.session.prefetcher.take_schedule(self.schedule)
+        controller.session.prefetcher.take_catalog(self.catalog)
+
+        with patch("class_planning_tool.input_data.excel_inputs.get_class_schedule_data", side_effect=AssertionError), \
+                patch("class_planning_tool.input_data.prereq_scraper.Scraper", side_effect=AssertionError):
+            self.assertEqual(7, len(controller.process_schedule_file(self.schedule)))
+            self.assertEqual(5, len(controller.process_prerequisites(self.catalog)[1]))
+        controller.session.close()
@@ -0,0 +1,74 @@
+import unittest
+import zipfile
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from class_planning_tool.error_handling.preflight import InputRejectedError, preflight_pdf, preflight_pdf_bytes, preflight_xlsx
+from class_planning_tool.input_data import degreeworks_parser, excel_inputs
+
+
+class TestPreflight(unittest.TestCase):
+
+    def setUp(self):
+        self.resource_path: Path = Path("./tests/resources")
+        self.tmp = TemporaryDirectory()
+        self.root: Path = Path(self.tmp.name)
+        self.pdf: bytes = (self.resource_path / "test.pdf").read_bytes()
+        self.xlsx: bytes = (self.resource_path / "schedule_input_test.xlsx").read_bytes()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name: str, content: bytes) -> str:
+        path: Path = self.root / name
+        path.write_bytes(content)
+        return str(path)
+
+    def test_valid_inputs_pass(self):
+        preflight_pdf(str(self.resource_path / "test.pdf"))
+        preflight_pdf_bytes(self.pdf)
+        preflight_xlsx(str(self.resource_path / "schedule_input_test.xlsx"))
+        preflight_xlsx(str(self.resource_path / "4-year schedule.xlsx"))
+
+    def test_bad_pdfs_rejected(self):
+        for name, content in (
+            ("empty.pdf", b""),
+            ("text.pdf", b"Degree progress\n" * 100),
+            ("truncated.pdf", self.pdf[:len(self.pdf) // 2]),
+            ("workbook.pdf", self.xlsx),
+        ):
+            with self.subTest(name), self.assertRaises(InputRejectedError):
+                preflight_pdf(self.write(name, content))
+        with self.assertRaises(InputRejectedError):
+            preflight_pdf_bytes(b"%PDF-1.7\n")
+
+    def test_bad_workbooks_rejected(self):
+        archive: Path = self.root / "archive.xlsx"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("notes.txt", "not a workbook")
+        for name, content in (
+            ("empty.xlsx", b""),
+            ("text.xlsx", b"Course,SP25\n"),
+            ("truncated.xlsx", self.xlsx[:len(self.xlsx) - 200]),
+            ("legacy.xlsx", b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1" + bytes(512)),
+            ("document.xlsx", self.pdf),
+            ("archive.xlsx", archive.read_bytes()),
+        ):
+            with self.subTest(name), self.assertRaises(InputRejectedError):
+                preflight_xlsx(self.write(name, content))
+
+    def test_heavy_parsers_not_called(self):
+        with patch.object(degreeworks_parser.fitz, "Document", side_effect=AssertionError):
+            with self.assertRaises(degreeworks_parser.DegreeWorksParsingError) as context:
+                degreeworks_parser.parse_pdf(self.write("schedule.pdf", self.xlsx))
+            self.assertIsInstance(context.exception.exception, InputRejectedError)
+            with self.assertRaises(degreeworks_parser.DegreeWorksParsingError):
+                degreeworks_parser.parse_pdf_bytes(b"<html></html>")
+        with patch.object(excel_inputs, "load_workbook", side_effect=AssertionError):
+            with self.assertRaises(InputRejectedError):
+                excel_inputs.get_class_schedule_data(self.write("audit.xlsx", self.pdf))
+
+
+if __name__ == "__main__":
+    unittest.main()
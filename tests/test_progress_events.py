@@ -0,0 +1,94 @@
+import unittest
+import json
+import queue
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from class_planning_tool.controller.class_plan_controller import ClassPlanController
+from class_planning_tool.controller.progress import CANCELLED, DONE, FAILED, FINISHED, STARTED
+from class_planning_tool.course_planner.planner import Planner
+from class_planning_tool.error_handling.cancellation import CancelToken, PlanCancelledError
+from class_planning_tool.input_data.excel_inputs import get_class_schedule_data
+
+
+def drain(events: queue.Queue) -> list:
+    results = []
+    while not events.empty():
+        results.append(events.get_nowait())
+    return results
+
+
+class TestProgressEvents(unittest.TestCase):
+
+    def setUp(self):
+        self.resource_path: Path = Path("./tests/resources")
+        self.tmp = TemporaryDirectory()
+        self.audit: Path = Path(self.tmp.name) / "student.json"
+        self.audit.write_text(json.dumps({"progress": {"CPSC 3333": {"status": "incomplete", "term": ""}}}))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_pipeline(self, events: queue.Queue, cancel_token: CancelToken | None=None, audit: str="", export: bool=False):
+        return ClassPlanController().run_pipeline(
+            audit or str(self.audit),
+            self.resource_path / "schedule_input_test.xlsx",
+            str(self.resource_path / "course_descriptions_trimmed.html"),
+            events=events, cancel_token=cancel_token, export=export
+        )
+
+    def test_stage_events(self):
+        events: queue.Queue = queue.Queue()
+        plan, _ = self.run_pipeline(events)
+        received = drain(events)
+
+        self.assertListEqual(
+            [("progress_parse", STARTED), ("progress_parse", FINISHED), ("schedule_parse", STARTED), ("schedule_parse", FINISHED),
+             ("scrape", STARTED), ("scrape", FINISHED), ("plan", STARTED), ("plan", FINISHED), ("plan", DONE)],
+            [(event.stage, event.status) for event in received]
+        )
+        self.assertEqual(1.0, received[-1].fraction)
+        self.assertIs(plan, received[-1].payload)
+
+    def test_failed_event(self):
+        events: queue.Queue = queue.Queue()
+        with self.assertRaises(ValueError):
+            self.run_pipeline(events, audit=str(self.resource_path / "abc.pdf"))
+        last = drain(events)[-1]
+        self.assertEqual((FAILED, "pdf_parse"), (last.status, last.stage))
+        self.assertTrue(last.terminal)
+
+    def test_cancelled_event(self):
+        events: queue.Queue = queue.Queue()
+        cancel_token: CancelToken = CancelToken()
+        cancel_token.cancel()
+        with self.assertRaises(PlanCancelledError):
+            self.run_pipeline(events, cancel_token)
+        self.assertListEqual([CANCELLED], [event.status for event in drain(events)])
+
+    def test_cancelled_while_parsing_json(self):
+        cancel_token: CancelToken = CancelToken()
+
+        class CancellingQueue(queue.Queue):
+            # cancels as the first stage starts, after the pipeline's own check
+            def put(self, item, block=True, timeout=None):
+                super().put(item, block, timeout)
+                cancel_token.cancel()
+
+        events: queue.Queue = CancellingQueue()
+        with self.assertRaises(PlanCancelledError):
+            self.run_pipeline(events, cancel_token)
+        self.assertListEqual(
+            [("progress_parse", STARTED), ("progress_parse", CANCELLED)], [(event.stage, event.status) for event in drain(events)]
+        )
+        with self.assertRaises(PlanCancelledError):
+            ClassPlanController().process_progress_file(str(self.audit), cancel_token)
+
+    def test_loaders_and_planner_check_token(self):
+        cancel_token: CancelToken = CancelToken()
+        cancel_token.cancel()
+        with self.assertRaises(PlanCancelledError):
+            get_class_schedule_data(self.resource_path / "schedule_input_test.xlsx", cancel_token=cancel_token)
+        planner: Planner = Planner({"CPSC 1111": {"status": "incomplete", "term": ""}}, 0, {}, {}, {}, cancel_token)
+        with self.assertRaises(PlanCancelledError):
+            planner.find_best_schedule()
@@ -0,0 +1,147 @@
+import unittest
+import json
+from concurrent.futures import ProcessPoolExecutor
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from benchmarks.synthetic import SyntheticCorpus, write_corpus
+from class_planning_tool.cli import main
+from class_planning_tool.controller.batch_runner import run_batch
+from class_planning_tool.controller.shards import (
+    MANIFEST_NAME, ShardError, create_job, load_manifest, merge_shards, run_shard, shard_of, shard_report_name
+)
+from class_planning_tool.output_generation.demand_forecast import DemandForecast
+from class_planning_tool.output_generation.plan_store import PlanStore
+
+SHARDS: int = 3
+
+
+class TestShardJobs(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.root: Path = Path(self.tmp.name)
+        corpus: SyntheticCorpus = write_corpus(self.tmp.name)
+        self.schedule: str = corpus.schedule
+        self.catalog: str = corpus.catalog_page
+        self.audit_dir: Path = Path(corpus.audit_dir)
+        (self.audit_dir / "broken.json").write_text("{not json")
+        self.manifest_path: str = str(self.root / "job" / MANIFEST_NAME)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_sharding_is_deterministic_and_complete(self):
+        manifest = create_job(str(self.audit_dir), self.schedule, self.catalog, str(self.root / "job"))
+        shards = [manifest.shard(index, SHARDS) for index in range(SHARDS)]
+        self.assertCountEqual(manifest.students, [entry for shard in shards for entry in shard])
+        self.assertEqual(shards, [load_manifest(self.manifest_path).shard(index, SHARDS) for index in range(SHARDS)])
+        self.assertEqual(shard_of("student0", SHARDS), shard_of("student0", SHARDS))
+        with self.assertRaises(ShardError):
+            manifest.shard(SHARDS, SHARDS)
+
+    def test_shards_in_processes_match_batch(self):
+        create_job(str(self.audit_dir), self.schedule, self.catalog, str(self.root / "job"))
+        with ProcessPoolExecutor(max_workers=SHARDS) as pool:
+            futures = [
+                pool.submit(run_shard, self.manifest_path, index, SHARDS, str(self.root / f"node{index}"))
+                for index in range(SHARDS)
+            ]
+            for future in futures:
+                future.result()
+
+        forecast: DemandForecast = DemandForecast()
+        with PlanStore(str(self.root / "plans.db")) as store:
+            merged = merge_shards(
+                self.manifest_path, [str(self.root / f"node{index}") for index in range(SHARDS)], str(self.root / "merged"),
+                forecast=forecast, store=store
+            )
+            merged_students: list[str] = store.students()
+        batch_forecast: DemandForecast = DemandForecast()
+        batch = run_batch(str(self.audit_dir), self.schedule, self.catalog, str(self.root / "batch"), forecast=batch_forecast)
+        self.assertEqual(
+            [(result.student, result.ok) for result in batch.results],
+            [(result.student, result.ok) for result in merged.results]
+        )
+        self.assertIn("artifact_load", merged.shared_metrics)
+        self.assertIn("scrape", merged.shared_metrics)
+        for result in merged.results:
+            if result.ok:
+                self.assertEqual(self.root / "merged", Path(result.output_path).parent)
+                self.assertTrue(Path(result.output_path).exists())
+        self.assertListEqual(
+            sorted(path.name for path in (self.root / "batch").glob("*.xlsx")),
+            sorted(path.name for path in (self.root / "merged").glob("*.xlsx"))
+        )
+        self.assertListEqual([result.student for result in merged.results if result.ok], merged_students)
+        self.assertEqual(batch_forecast.seats, forecast.seats)
+
+    def test_merge_refuses_incomplete_or_foreign_reports(self):
+        create_job(str(self.audit_dir), self.schedule, self.catalog, str(self.root / "job"))
+        out: Path = self.root / "out"
+        for index in range(SHARDS - 1):
+            run_shard(self.manifest_path, index, SHARDS, str(out))
+        with self.assertRaises(ShardError):
+            merge_shards(self.manifest_path, [str(out)])
+
+        run_shard(self.manifest_path, SHARDS - 1, SHARDS, str(out))
+        self.assertEqual(7, len(merge_shards(self.manifest_path, [str(out)]).results))
+
+        report_path: Path = out / shard_report_name(0, SHARDS)
+        original: str = report_path.read_text()
+        content = json.loads(original)
+        del content["shard"]
+        report_path.write_text(json.dumps(content))
+        with self.assertRaises(ShardError):
+            merge_shards(self.manifest_path, [str(out)])
+
+        content = json.loads(original)
+        content["job_id"] = "another job"
+        report_path.write_text(json.dumps(content))
+        with self.assertRaises(ShardError):
+            merge_shards(self.manifest_path, [str(out)])
+
+    def test_merge_refuses_missing_workbooks(self):
+        create_job(str(self.audit_dir), self.schedule, self.catalog, str(self.root / "job"))
+        out: Path = self.root / "out"
+        for index in range(SHARDS):
+            run_shard(self.manifest_path, index, SHARDS, str(out))
+        next(out.glob("*.xlsx")).unlink()
+        with self.assertRaises(ShardError):
+            merge_shards(self.manifest_path, [str(out)])
+        with self.assertRaises(ShardError):
+            merge_shards(self.manifest_path, [str(out)], str(self.root / "merged"))
+
+    def test_changed_artifact_refused(self):
+        create_job(str(self.audit_dir), self.schedule, self.catalog, str(self.root / "job"))
+        artifact: Path = self.root / "job" / "catalog.json"
+        content = json.loads(artifact.read_text())
+        content["titles"] = {}
+        artifact.write_text(json.dumps(content))
+        with self.assertRaises(ShardError):
+            run_shard(self.manifest_path, 0, SHARDS, str(self.root / "out"))
+
+    def test_cli(self):
+        with patch("sys.stdout", new_callable=StringIO):
+            self.assertEqual(0, main(["job", "--audits", str(self.audit_dir), "--schedule", self.schedule, "--catalog", self.catalog, "--out", str(self.root / "job")]))
+            for index in range(2):
+                main(["shard", "--manifest", self.manifest_path, "--index", str(index), "--count", "2", "--out", str(self.root / "out"), "--jobs", "1"])
+            with patch("sys.stderr", new_callable=StringIO):
+                self.assertEqual(2, main(["shard", "--manifest", self.manifest_path, "--index", "2", "--count", "2", "--out", str(self.root / "out")]))
+            code = main([
+                "merge", "--manifest", self.manifest_path, "--shards", str(self.root / "out"), "--report", str(self.root / "report.json"),
+                "--out", str(self.root / "merged"), "--demand", str(self.root / "demand.csv"), "--store", str(self.root / "plans.db")
+            ])
+        self.assertEqual(1, code)  # broken.json fails
+        report = json.loads((self.root / "report.json").read_text())
+        self.assertEqual(7, len(report["students"]))
+        self.assertEqual(6, len(list((self.root / "merged").glob("*.xlsx"))))
+        self.assertGreater(len((self.root / "demand.csv").read_text().splitlines()), 1)
+        with PlanStore(str(self.root / "plans.db")) as store:
+            self.assertEqual(6, len(store.students()))
+
+
+if __name__ == "__main__":
+    unittest.main()
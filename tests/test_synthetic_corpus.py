@@ -0,0 +1,59 @@
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from benchmarks.run_benchmarks import compare, run_profile
+from benchmarks.synthetic import generate_catalog, generate_progress_maps, write_catalog_html, write_schedule_workbook
+from class_planning_tool.input_data.excel_inputs import get_class_schedule_data
+from class_planning_tool.input_data.prereq_scraper import Scraper
+
+
+class TestSyntheticCorpus(unittest.TestCase):
+
+    def setUp(self):
+        self.catalog = generate_catalog(course_count=40, depth=4, or_density=0.5, offering_sparsity=0.5, seed=7)
+        self.tmp = TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_deterministic(self):
+        again = generate_catalog(course_count=40, depth=4, or_density=0.5, offering_sparsity=0.5, seed=7)
+        self.assertDictEqual(self.catalog.prerequisites, again.prerequisites)
+        self.assertDictEqual(self.catalog.offerings, again.offerings)
+
+    def test_prerequisites_form_levelled_dag(self):
+        for course, groups in self.catalog.prerequisites.items():
+            for group in groups:
+                for prereq in group:
+                    self.assertLess(self.catalog.levels[prereq], self.catalog.levels[course])
+
+    def test_every_course_offered(self):
+        self.assertTrue(all(self.catalog.offerings.values()))
+
+    def test_schedule_round_trip(self):
+        path: Path = Path(self.tmp.name) / "schedule.xlsx"
+        write_schedule_workbook(self.catalog, str(path))
+        self.assertDictEqual(self.catalog.offerings, get_class_schedule_data(path))
+
+    def test_catalog_round_trip(self):
+        path: Path = Path(self.tmp.name) / "catalog.html"
+        write_catalog_html(self.catalog, str(path))
+        scraper: Scraper = Scraper(str(path))
+        self.assertDictEqual(self.catalog.prerequisites, scraper.get_prerequisites())
+        self.assertDictEqual(self.catalog.titles, scraper.title_map)
+
+    def test_progress_maps(self):
+        students = generate_progress_maps(self.catalog, student_count=5, program_size=8, seed=1)
+        self.assertEqual(5, len(students))
+        for progress, electives in students:
+            self.assertEqual(8, len(progress))
+            self.assertTrue(set(progress) <= set(self.catalog.titles))
+
+    def test_run_profile_and_compare(self):
+        profile = {"course_count": 12, "depth": 3, "or_density": 0.3, "offering_sparsity": 0.3, "students": 3}
+        results = run_profile(profile, repeat=1)
+        self.assertSetEqual({"schedule_parse", "catalog_parse", "plan", "export"}, set(results))
+        baselines = {"tiny": {stage: seconds / 10 for stage, seconds in results.items()}}
+        self.assertEqual(4, len(compare({"tiny": results}, baselines, tolerance=2.0)))
+        self.assertListEqual([], compare({"tiny": results}, {}, tolerance=2.0))
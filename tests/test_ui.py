@@ -7,6 +7,7 @@ from unittest.mock import patch, MagicMock
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from class_planning_tool.ui.dashboard import Dashboard
+from class_planning_tool.error_handling.cancellation import CancelToken
 import tkinter as tk
 
 class TestDashboard(unittest.TestCase):
@@ -63,10 +64,24 @@ class TestDashboard(unittest.TestCase):
         self.dashboard.controller.process_schedule_file = MagicMock(return_value={})
         self.dashboard.controller.process_prerequisites = MagicMock(return_value=({}, {}))
         
-        loading_window = tk.Toplevel(self.root)
-        self.dashboard.process_files(loading_window)
+        self.dashboard.show_loading_window()
+        self.dashboard.process_files("https://example.com", self.dashboard.events, CancelToken())
+        self.dashboard.poll_events()
 
         self.assertIsInstance(self.dashboard.course_plan, dict)
+        self.assertIsNone(self.dashboard.loading_window)
+
+    def test_process_files_cancelled(self):
+        self.dashboard.controller.process_degreeworks_file = MagicMock(return_value=({}, 5))
+        cancel_token = CancelToken()
+        cancel_token.cancel()
+
+        self.dashboard.show_loading_window()
+        self.dashboard.process_files("https://example.com", self.dashboard.events, cancel_token)
+        with patch('tkinter.messagebox.showinfo') as mock_info:
+            self.dashboard.poll_events()
+            mock_info.assert_called_once_with("Cancelled", "Processing was cancelled.", parent=self.dashboard.root)
+        self.assertDictEqual({}, self.dashboard.course_plan)
 
     def test_download_result(self):
         self.dashboard.course_plan = {"Fall 2024": [{"code": "CS101", "title": "Intro to Computer Science"}]}